@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark db_loader's per-row path (process_records) against the bulk path
+(bulk_process_records) on a warehouse backend: a fresh SQLite file in a temp
+directory (default), or a live SQL Server database with the Baseball schema.
+
+A synthetic FanGraphs type=8 batting payload is generated with values that fit
+each FactSeasonStatsBatting column's declared type (read from
+sql/CREATE_Baseball.sql). Its players, teams and season are isolated from real
+data (FanGraphs ids from 900000000, team abbreviations ZZ00.., SeasonYear
+--season), and everything they add is deleted before and after each run, so
+both paths insert the same new players, teams, season and facts. Reruns of the
+bulk upsert are then timed on the loaded data: once unchanged, and once with
+--changed of the stat lines modified (a daily in-season refresh). Results are
+printed and written as JSON.
+
+Usage:
+    python benchmarks/bench_db_loader.py [--records 1500] [--repeat 3] [--batch-size 1000] [--changed 0.1]
+        [--season 2999] [--backend sqlite|sqlserver] [--database PATH_OR_ODBC_STRING]
+        [--out bench_db_loader.json]
+"""
+import argparse
+import datetime
+import json
+import platform
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+import db_loader  # type: ignore  # noqa: E402
+import warehouse  # type: ignore  # noqa: E402
+
+FIRST_PLAYER_ID = 900_000_000
+TABLE = "FactSeasonStatsBatting"
+
+
+def column_types(table: str) -> dict:
+    """Column -> (type, args) for `table`, parsed from the schema script."""
+    sql = (ROOT / "sql" / "CREATE_Baseball.sql").read_text(encoding="utf-16")
+    body = sql.split(f"CREATE TABLE [dbo].[{table}](", 1)[1].split(") ON [PRIMARY]", 1)[0]
+    return {name: (kind, args) for name, kind, args in re.findall(r"^\t\[(\w+)\] \[(\w+)\](?:\(([\d, ]+)\))?", body, re.M)}
+
+
+def synthetic_value(rng: random.Random, kind: str, args: str):
+    if kind == "decimal":
+        precision, scale = (int(x) for x in args.split(","))
+        return round(rng.random() * min(10 ** (precision - scale) - 1, 1000), scale)
+    if kind == "int":
+        return rng.randint(0, 1000)
+    if kind in ("nvarchar", "char"):
+        return "x" * min(int(args or 1), 8)
+    return None
+
+
+def synthetic_payload(n_records: int, season: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    types = column_types(TABLE)
+    rows = []
+    for i in range(n_records):
+        row = {
+            db_loader.BATTING_STAT_MAPPING[column]: synthetic_value(rng, *types.get(column, ("", "")))
+            for column in db_loader.BATTING_STAT_MAPPING
+        }
+        team = f"ZZ{i % 30:02d}"
+        row.update({
+            "playerid": FIRST_PLAYER_ID + i,
+            "Name": f'<a href="statss.aspx?playerid={FIRST_PLAYER_ID + i}">Player {i}</a>',
+            "Team": f'<a href="leaders.aspx?team={team}">{team}</a>',
+            "Bats": rng.choice("LRS"),
+            "Season": season,
+        })
+        rows.append(row)
+    return {"data": rows}
+
+
+def with_changes(payload: dict, share: float, seed: int) -> dict:
+    """Copy of `payload` with `share` of its records' WAR changed."""
+    rng = random.Random(seed)
+    rows = [dict(row) for row in payload["data"]]
+    for row in rng.sample(rows, int(len(rows) * share)):
+        row["WAR"] = round(rng.random() * 10, 1)
+    return {"data": rows}
+
+
+def summarize(seconds: list, records: int) -> dict:
+    return {
+        "median_s": round(statistics.median(seconds), 3),
+        "min_s": round(min(seconds), 3),
+        "max_s": round(max(seconds), 3),
+        "rows_per_s": round(records / statistics.median(seconds), 1),
+    }
+
+
+def cleanup(db, season: int) -> None:
+    db.cursor.execute(f"DELETE FROM {TABLE} WHERE SeasonID IN (SELECT SeasonID FROM DimSeason WHERE SeasonYear = ?)",
+                      (season,))
+    db.cursor.execute("DELETE FROM DimSeason WHERE SeasonYear = ?", (season,))
+    db.cursor.execute("DELETE FROM DimPlayer WHERE FangraphsPlayerID >= ?", (FIRST_PLAYER_ID,))
+    db.cursor.execute("DELETE FROM DimTeam WHERE TeamNameAbb LIKE 'ZZ__'")
+    db.commit()
+
+
+def count_loaded(db, season: int) -> int:
+    db.cursor.execute(f"SELECT COUNT(*) FROM {TABLE} f JOIN DimSeason s ON s.SeasonID = f.SeasonID "
+                      "WHERE s.SeasonYear = ?", (season,))
+    return db.cursor.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1500, help="records in the synthetic payload")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=db_loader.BATCH_SIZE)
+    parser.add_argument("--changed", type=float, default=0.1, help="share of stat lines changed in the rerun")
+    parser.add_argument("--season", type=int, default=2999, help="SeasonYear reserved for benchmark rows")
+    parser.add_argument("--backend", choices=sorted(warehouse.BACKENDS), default="sqlite")
+    parser.add_argument("--database", default=None,
+                        help="SQLite file (default: a temporary one) or SQL Server ODBC connection string")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_db_loader.json", help="JSON results path")
+    args = parser.parse_args()
+
+    payload = synthetic_payload(args.records, args.season, args.seed)
+    tmp = tempfile.TemporaryDirectory()
+    database = args.database
+    if database is None and args.backend == "sqlite":
+        database = str(Path(tmp.name) / "baseball.db")
+    db = warehouse.connect(args.backend, database)
+
+    paths = {
+        "per_row": lambda: db_loader.process_records(payload, db_loader.BATTING_STAT_MAPPING, TABLE, db),
+        "bulk": lambda: db_loader.bulk_process_records(payload, db_loader.BATTING_STAT_MAPPING, TABLE, db,
+                                                       batch_size=args.batch_size),
+    }
+    timings = {}
+    try:
+        for name, load in paths.items():
+            seconds = []
+            for _ in range(args.repeat):
+                cleanup(db, args.season)
+                start = time.perf_counter()
+                load()
+                seconds.append(time.perf_counter() - start)
+                loaded = count_loaded(db, args.season)
+                if loaded != args.records:
+                    print(f"warning: {name} loaded {loaded} of {args.records} rows")
+            timings[name] = summarize(seconds, args.records)
+
+        # The last bulk run left the payload loaded; rerun it as an upsert.
+        changed = with_changes(payload, args.changed, args.seed)
+        reruns = {"rerun_unchanged": payload, "rerun_changed": changed}
+        for name, data in reruns.items():
+            seconds = []
+            for _ in range(args.repeat):
+                db_loader.bulk_process_records(payload, db_loader.BATTING_STAT_MAPPING, TABLE, db)
+                start = time.perf_counter()
+                db_loader.bulk_process_records(data, db_loader.BATTING_STAT_MAPPING, TABLE, db,
+                                               batch_size=args.batch_size)
+                seconds.append(time.perf_counter() - start)
+            timings[name] = summarize(seconds, args.records)
+        if count_loaded(db, args.season) != args.records:
+            print("warning: reruns changed the number of stored rows")
+    finally:
+        cleanup(db, args.season)
+        db.close()
+        tmp.cleanup()
+
+    print(f"\n{args.records} records into {TABLE} on {args.backend} (median of {args.repeat})")
+    for name, t in timings.items():
+        print(f"  {name:<16} {t['median_s']:9.3f} s  {t['rows_per_s']:10.1f} rows/s")
+    print(f"  bulk speedup     {timings['per_row']['median_s'] / timings['bulk']['median_s']:9.1f}x")
+
+    result = {
+        "benchmark": "db_loader",
+        "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "backend": args.backend,
+        "sqlite": sqlite3.sqlite_version,
+        "records": args.records,
+        "batch_size": args.batch_size,
+        "changed": args.changed,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "timings": timings,
+    }
+    Path(args.out).write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"\nwrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
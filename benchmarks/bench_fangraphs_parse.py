@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark FanGraphs payload parsing in fangraphs_api.
+
+Compares the old path (read the whole body, json.loads, build a DataFrame with
+every column) against the streaming, column-projected parser used by
+fetch_json_df, on a synthetic payload shaped like the projections API
+(~300 fields per player). Reports wall time and tracemalloc peak for each.
+
+Usage:
+    python benchmarks/bench_fangraphs_parse.py [--players 6000] [--fields 300]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from fangraphs_api import FANGRAPHS_FIELDS, _CHUNK_SIZE, _iter_json_array, _project_records  # type: ignore
+
+
+def synthetic_payload(n_players: int, n_fields: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    extra = [f"stat{k}" for k in range(max(0, n_fields - len(FANGRAPHS_FIELDS)))]
+    rows = []
+    for i in range(n_players):
+        row = {"playerid": str(10000 + i), "PlayerName": f"Player {i}", "Team": "NYY", "minpos": "SS"}
+        for f in FANGRAPHS_FIELDS[7:] + tuple(extra):
+            row[f] = rng.random() * 100
+        rows.append(row)
+    return json.dumps(rows).encode()
+
+
+def chunked(payload: bytes, size: int = _CHUNK_SIZE):
+    for i in range(0, len(payload), size):
+        yield payload[i:i + size]
+
+
+def full_parse(payload: bytes) -> pd.DataFrame:
+    # Mirrors resp.json() + pd.DataFrame(): the body is joined in memory first.
+    body = b"".join(chunked(payload))
+    return pd.DataFrame(json.loads(body))
+
+
+def streaming_parse(payload: bytes) -> pd.DataFrame:
+    return _project_records(_iter_json_array(chunked(payload)), FANGRAPHS_FIELDS)
+
+
+def measure(fn, payload: bytes):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fn(payload)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=6000)
+    parser.add_argument("--fields", type=int, default=300)
+    args = parser.parse_args()
+
+    payload = synthetic_payload(args.players, args.fields)
+    full, t_full, peak_full = measure(full_parse, payload)
+    stream, t_stream, peak_stream = measure(streaming_parse, payload)
+
+    for col in stream.columns:
+        if stream[col].dtype == object:
+            assert stream[col].tolist() == full[col].tolist(), col
+        else:
+            np.testing.assert_allclose(stream[col].to_numpy(), full[col].to_numpy(float), err_msg=col)
+
+    mb = 1024 * 1024
+    print(f"payload: {len(payload) / mb:.1f} MB, {args.players} players x {args.fields} fields")
+    print(f"json.loads + DataFrame : {t_full * 1000:8.1f} ms  peak {peak_full / mb:7.1f} MB  ({full.shape[1]} cols)")
+    print(f"streaming + projection : {t_stream * 1000:8.1f} ms  peak {peak_stream / mb:7.1f} MB  ({stream.shape[1]} cols)")
+    print(f"peak memory reduction  : {peak_full / peak_stream:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start cost of the app entry points.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+Reports the median wall time to import each target, the slowest modules from
+`python -X importtime` for the first target, and the time from importing
+server.main to its first HTTP response (through Starlette's TestClient).
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5] [--top 15] [--targets server.main pipeline]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+FIRST_RESPONSE = """
+import time
+t0 = time.perf_counter()
+import server.main as m
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(m.app) as client:
+    t2 = time.perf_counter()
+    client.get("/api/players/search", params={"q": "a"})
+    t3 = time.perf_counter()
+print(t1 - t0, t3 - t2)
+"""
+
+
+def run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(SRC), "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code], cwd=SRC, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def time_import(target: str, runs: int) -> float:
+    code = f"import time; t = time.perf_counter(); import {target}; print(time.perf_counter() - t)"
+    return statistics.median(float(run(code).stdout.split()[-1]) for _ in range(runs))
+
+
+def top_imports(target: str, top: int):
+    """Slowest modules by cumulative import time (microseconds) from -X importtime."""
+    rows = []
+    for line in run(f"import {target}", "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--targets", nargs="+", default=["server.main", "pipeline"])
+    args = parser.parse_args()
+
+    for target in args.targets:
+        print(f"import {target:<20}: {time_import(target, args.runs) * 1000:8.1f} ms (median of {args.runs})")
+
+    print(f"\nslowest imports under {args.targets[0]} (cumulative):")
+    for micros, name in top_imports(args.targets[0], args.top):
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    if "server.main" in args.targets:
+        samples = [tuple(map(float, run(FIRST_RESPONSE).stdout.split()[-2:])) for _ in range(args.runs)]
+        print(f"\nserver.main import     : {statistics.median(s[0] for s in samples) * 1000:8.1f} ms")
+        print(f"first response         : {statistics.median(s[1] for s in samples) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
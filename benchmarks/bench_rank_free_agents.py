@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark composite scoring in analysis.rank_free_agents.
+
+Compares the row-wise composite_score apply against the vectorized
+composite_scores on a synthetic full player pool, checks that both produce
+the same numbers, and times a complete rank_free_agents call.
+
+Usage:
+    python benchmarks/bench_rank_free_agents.py [--hitters 3500] [--pitchers 2500] [--repeat 5]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from analysis import composite_score, composite_scores, rank_free_agents  # type: ignore
+
+HITTER_STATS = {"wOBA": (0.320, 0.030), "ISO": (0.160, 0.050), "wBsR": (0.0, 2.0), "AB": (450, 100), "wRC+": (100, 20)}
+PITCHER_STATS = {"K-BB%": (0.12, 0.05), "IP": (100, 50), "WHIP": (1.25, 0.15), "FIP": (4.0, 0.6), "SV": (3, 8)}
+HITTER_WEIGHTS = {"wOBA": 0.26, "ISO": 0.22, "wBsR": 0.04, "AB": 0.30, "wRC+": 0.17}
+TEAMS = ["NYY", "BOS", "LAD", "SF", "SEA", "TEX", "HOU", "ATL", "CHC", "MIL"]
+
+
+def synthetic_pool(n_hitters: int, n_pitchers: int, seed: int = 0) -> pd.DataFrame:
+    """Merged ESPN + FanGraphs pool shaped like analysis.merge_data output (~5% missing stats)."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for n, stats, role, offset in ((n_hitters, HITTER_STATS, "Hitter", 0), (n_pitchers, PITCHER_STATS, "Pitcher", n_hitters)):
+        df = pd.DataFrame({
+            "player_id": np.arange(offset + 1, offset + n + 1),
+            "name_fa": [f"{role} {i}" for i in range(n)],
+            "team_fa": [TEAMS[i % len(TEAMS)] for i in range(n)],
+            "position": "Pitcher" if role == "Pitcher" else rng.choice(["C", "1B", "2B, SS", "3B", "OF"], n),
+            "proj_ADP": rng.uniform(1, 600, n),
+        })
+        df["name_fg"] = df["name_fa"]
+        df["team_fg"] = df["team_fa"]
+        for pfx in ("proj_", "curr_"):
+            for stat, (mean, std) in stats.items():
+                vals = rng.normal(mean, std, n)
+                vals[rng.random(n) < 0.05] = np.nan
+                df[pfx + stat] = vals
+        if role == "Pitcher":
+            df["IP"], df["SV"] = 120.0, 0.0
+        else:
+            df["AB"] = 400.0
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hitters", type=int, default=3500)
+    parser.add_argument("--pitchers", type=int, default=2500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pool = synthetic_pool(args.hitters, args.pitchers)
+    hitters = pool[pool["position"] != "Pitcher"]
+
+    rowwise = hitters.apply(lambda r: composite_score(r, HITTER_WEIGHTS, "proj_"), axis=1)
+    scores, used = composite_scores(hitters, HITTER_WEIGHTS, "proj_")
+    np.testing.assert_allclose(scores.to_numpy(), [r[0] for r in rowwise], rtol=1e-12)
+    np.testing.assert_array_equal(used.to_numpy(), [r[1] for r in rowwise])
+
+    t_row = best_of(lambda: hitters.apply(lambda r: composite_score(r, HITTER_WEIGHTS, "proj_"), axis=1), args.repeat)
+    t_vec = best_of(lambda: composite_scores(hitters, HITTER_WEIGHTS, "proj_"), args.repeat)
+    t_rank = best_of(lambda: rank_free_agents(pool.copy()), args.repeat)
+
+    print(f"players: {len(pool)} ({args.hitters} hitters, {args.pitchers} pitchers)")
+    print(f"composite_score row-wise apply : {t_row * 1000:9.2f} ms")
+    print(f"composite_scores vectorized    : {t_vec * 1000:9.2f} ms  ({t_row / t_vec:.0f}x)")
+    print(f"rank_free_agents end-to-end    : {t_rank * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
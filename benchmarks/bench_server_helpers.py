@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark the FastAPI view helpers in server.main across league sizes.
+
+For each league size (teams x roster size x free agents) a synthetic league is
+generated with synthetic_league.write_league (real ranking, real draft
+workbook) into a temporary output directory, loaded the way the server loads
+it, and every helper is timed over `--repeat` runs. Results are printed as a
+table and written as JSON (one entry per size, median/min/max ms per helper).
+
+Usage:
+    python benchmarks/bench_server_helpers.py [--sizes 8x23x2000 10x25x3000 12x26x4500 16x28x6000]
+        [--repeat 5] [--out bench_server_helpers.json]
+"""
+import argparse
+import datetime
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from synthetic_league import write_league  # noqa: E402
+
+
+def parse_size(spec: str) -> tuple[int, int, int]:
+    teams, roster_size, free_agents = (int(x) for x in spec.lower().split("x"))
+    return teams, roster_size, free_agents
+
+
+def helper_calls(m, df: pd.DataFrame, draft_df: pd.DataFrame, teams: int, roster_size: int) -> dict:
+    """Helper name -> zero-argument call, with the arguments the page routes pass."""
+    team = "Team 1"
+    free_agents = df[df["fantasy_team"].isin(["Free Agent", "FA"]) & df["has_valid_position"]]
+    star = str(df.sort_values("proj_CompositeScore", ascending=False)["Name"].iloc[0])
+    return {
+        "_compute_upgrades": lambda: m._compute_upgrades(df, team, True, -1.0),
+        "_attach_pos_ranks": lambda: m._attach_pos_ranks(free_agents, df),
+        "_dashboard_data": lambda: m._dashboard_data(df, team, True),
+        "_players_filtered": lambda: m._players_filtered(df, "", "", "", True, -1.0, 1, 50, "proj"),
+        "_player_detail": lambda: m._player_detail(df, star),
+        "_draft_advisor": lambda: m._draft_advisor(draft_df),
+        "_ideal_draft": lambda: m._ideal_draft(draft_df, pick_position=max(1, teams // 2), total_teams=teams,
+                                               total_rounds=roster_size),
+    }
+
+
+def time_calls(calls: dict, repeat: int) -> dict:
+    results = {}
+    for name, call in calls.items():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = {"median_ms": round(statistics.median(samples), 3),
+                         "min_ms": round(min(samples), 3), "max_ms": round(max(samples), 3)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["8x23x2000", "10x25x3000", "12x26x4500", "16x28x6000"],
+                        help="league sizes as TEAMSxROSTERxFREE_AGENTS")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_server_helpers.json", help="JSON results path")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    import server.main as m  # type: ignore
+
+    runs = []
+    for spec in args.sizes:
+        teams, roster_size, free_agents = parse_size(spec)
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_league(Path(tmp) / "output", teams, roster_size, free_agents, seed=args.seed)
+            m.ROOT_DIR = Path(tmp)
+            m._roster_slots_cache.clear()
+            df = m._prepare_dataframe(paths["csv"])
+            draft_df = m._load_draft_df()
+            timings = time_calls(helper_calls(m, df, draft_df, teams, roster_size), args.repeat)
+        runs.append({
+            "teams": teams, "roster_size": roster_size, "free_agents": free_agents,
+            "players": len(df), "draft_players": len(draft_df), "helpers": timings,
+        })
+        print(f"\n{spec}: {len(df)} ranked players, {len(draft_df)} in draft pool (median of {args.repeat})")
+        for name, t in timings.items():
+            print(f"  {name:<20} {t['median_ms']:10.2f} ms")
+
+    result = {
+        "benchmark": "server_helpers",
+        "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "runs": runs,
+    }
+    Path(args.out).write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"\nwrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
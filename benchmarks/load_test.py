@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+HTTP load test for the FastAPI app, run entirely on this machine.
+
+Boots `uvicorn server.main:app` on 127.0.0.1 with OUTPUT_DIR pointed at a
+copy of a fixed fixture: a synthetic league from synthetic_league.write_league
+(same seed, same snapshot and draft workbook every run) or `--fixture DIR`, an
+existing output directory. The copy keeps draft picks from touching the
+fixture.
+
+Each virtual user keeps one keep-alive connection and replays a weighted mix:
+- dashboard
+- add/drop for a random team
+- /players pagination
+- search keystrokes (one request per typed character after the second)
+- a draft pick followed by its unpick
+
+Concurrency steps up through `--concurrency`, `--duration` seconds each. Per
+step and route the report gives request count, errors, throughput and
+p50/p95/p99 latency. It prints a table and writes the results as JSON.
+
+Usage:
+    python benchmarks/load_test.py [--concurrency 1 2 4 8 16 32] [--duration 15]
+        [--fixture output/] [--teams 10] [--free-agents 3000] [--workers 1] [--out bench_load_test.json]
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote_plus, urlencode
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+from synthetic_league import write_league  # noqa: E402
+
+MIX = {"dashboard": 25, "add_drop": 20, "players": 20, "search": 25, "draft_pick": 10}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def prepare_fixture(args, workdir: Path) -> Path:
+    output = workdir / "output"
+    if args.fixture:
+        shutil.copytree(args.fixture, output)
+    else:
+        write_league(output, args.teams, args.roster_size, args.free_agents, seed=args.seed)
+    return output
+
+
+def start_server(output: Path, port: int, workers: int) -> subprocess.Popen:
+    env = {**os.environ, "OUTPUT_DIR": str(output), "PYTHONPATH": str(SRC), "REFRESH_SCHEDULE": "false"}
+    cmd = [sys.executable, "-m", "uvicorn", "server.main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+    proc = subprocess.Popen(cmd, cwd=SRC, env=env)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"uvicorn exited with {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/api/players/search?q=ab")
+            conn.getresponse().read()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("uvicorn did not start within 60s")
+
+
+class Workload:
+    """Request sequences for each route, drawn from the fixture's teams and players."""
+
+    def __init__(self, output: Path):
+        snapshot = pd.read_csv(sorted(output.glob("free_agents_ranked_*.csv"))[-1], low_memory=False)
+        self.teams = sorted(t for t in snapshot["fantasy_team"].dropna().unique() if t not in ("Free Agent", "FA"))
+        self.names = snapshot["Name"].dropna().astype(str).tolist()
+        self.draft_names = []
+        workbooks = sorted(output.glob("draft_strategy_*.xlsx"))
+        if workbooks:
+            draft = pd.read_excel(workbooks[-1], sheet_name="All players")
+            self.draft_names = draft["Name"].dropna().astype(str).tolist()
+        self.pages = max(1, len(snapshot) // 50)
+
+    def requests(self, route: str, rng: random.Random) -> list[tuple[str, str, str | None]]:
+        """(method, path, form body) requests for one action on `route`."""
+        team = quote_plus(rng.choice(self.teams)) if self.teams else ""
+        if route == "dashboard":
+            return [("GET", f"/?team={team}", None)]
+        if route == "add_drop":
+            return [("GET", f"/add-drop?team={team}", None)]
+        if route == "players":
+            return [("GET", f"/players?page={rng.randint(1, self.pages)}&per=50&sort={rng.choice(['proj', 'curr'])}", None)]
+        if route == "search":
+            name = rng.choice(self.names)[:rng.randint(3, 8)]
+            return [("GET", f"/api/players/search?q={quote_plus(name[:i])}", None) for i in range(2, len(name) + 1)]
+        if route == "draft_pick" and self.draft_names:
+            form = urlencode({"name": rng.choice(self.draft_names), "drafted_by": "Load Test"})
+            return [("POST", "/draft/pick", form), ("POST", "/draft/unpick", form)]
+        return []
+
+
+def label(method: str, path: str) -> str:
+    route = path.split("?")[0]
+    return route if method == "GET" else f"POST {route}"
+
+
+def virtual_user(port: int, workload: Workload, rng: random.Random, stop: threading.Event, samples: list):
+    routes, weights = list(MIX), list(MIX.values())
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    while not stop.is_set():
+        for method, path, body in workload.requests(rng.choices(routes, weights)[0], rng):
+            headers = {"Content-Type": "application/x-www-form-urlencoded"} if body else {}
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                ok = resp.status < 400
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                ok = False
+            samples.append((label(method, path), time.perf_counter() - start, ok))
+    conn.close()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))]
+
+
+def summarize(samples: list, seconds: float) -> dict:
+    routes = {}
+    for route in sorted({s[0] for s in samples}):
+        times = sorted(s[1] * 1000 for s in samples if s[0] == route)
+        errors = sum(1 for s in samples if s[0] == route and not s[2])
+        routes[route] = {
+            "requests": len(times),
+            "errors": errors,
+            "throughput_rps": round(len(times) / seconds, 2),
+            "p50_ms": round(percentile(times, 50), 2),
+            "p95_ms": round(percentile(times, 95), 2),
+            "p99_ms": round(percentile(times, 99), 2),
+        }
+    return routes
+
+
+def run_step(port: int, workload: Workload, users: int, duration: float, seed: int) -> dict:
+    stop, samples = threading.Event(), []
+    threads = [threading.Thread(target=virtual_user, args=(port, workload, random.Random(seed * 1000 + i), stop, samples),
+                                daemon=True) for i in range(users)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join(120)
+    elapsed = time.perf_counter() - start
+    total = len(samples)
+    return {
+        "concurrency": users,
+        "seconds": round(elapsed, 2),
+        "requests": total,
+        "errors": sum(1 for s in samples if not s[2]),
+        "throughput_rps": round(total / elapsed, 2),
+        "routes": summarize(samples, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per concurrency step")
+    parser.add_argument("--fixture", help="existing output directory to serve (default: generate a synthetic league)")
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--roster-size", type=int, default=25)
+    parser.add_argument("--free-agents", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--out", default="bench_load_test.json", help="JSON results path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = prepare_fixture(args, Path(tmp))
+        workload = Workload(output)
+        port = free_port()
+        server = start_server(output, port, args.workers)
+        try:
+            # One pass over every route first so lazy loads and caches are not timed; a route that
+            # errors here would only measure its error page, so stop instead.
+            warm = random.Random(args.seed)
+            for route in MIX:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+                for method, path, body in workload.requests(route, warm):
+                    conn.request(method, path, body=body,
+                                 headers={"Content-Type": "application/x-www-form-urlencoded"} if body else {})
+                    resp = conn.getresponse()
+                    resp.read()
+                    if resp.status >= 400:
+                        raise SystemExit(f"warm-up: {method} {path} returned {resp.status}")
+                conn.close()
+            steps = []
+            for users in args.concurrency:
+                step = run_step(port, workload, users, args.duration, args.seed)
+                steps.append(step)
+                print(f"\nconcurrency {users}: {step['requests']} requests, {step['throughput_rps']:.1f} req/s, "
+                      f"{step['errors']} errors")
+                print(f"  {'route':<24}{'req':>7}{'err':>5}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+                for route, r in step["routes"].items():
+                    print(f"  {route:<24}{r['requests']:>7}{r['errors']:>5}{r['throughput_rps']:>9.1f}"
+                          f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+        finally:
+            server.terminate()
+            server.wait(10)
+
+    result = {
+        "benchmark": "load_test",
+        "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "fixture": args.fixture or f"synthetic {args.teams}x{args.roster_size}x{args.free_agents} seed {args.seed}",
+        "workers": args.workers,
+        "duration_per_step": args.duration,
+        "mix": MIX,
+        "steps": steps,
+    }
+    Path(args.out).write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"\nwrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
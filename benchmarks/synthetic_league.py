@@ -0,0 +1,122 @@
+"""
+Synthetic league data for benchmarks.
+
+Builds a merged ESPN + FanGraphs pool shaped like analysis.merge_data output
+(multi-position hitters, closers and starters, ~8% injured, some missing
+stats), ranks it with the real analysis.rank_free_agents and formats it with
+pipeline.prepare_output_dataframe, so the snapshot has exactly the
+free_agents_ranked schema. The best players by ADP fill `teams` rosters of
+`roster_size`; `free_agents` more go unrostered.
+
+`write_league` lays the snapshot out like a refreshed output/ directory,
+including roster_settings.json, scoring_settings.json and, optionally, the
+draft workbook.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+MLB_TEAMS = ["ARI", "ATL", "BAL", "BOS", "CHC", "CHW", "CIN", "CLE", "COL", "DET", "HOU", "KCR", "LAA", "LAD", "MIA",
+             "MIL", "MIN", "NYM", "NYY", "OAK", "PHI", "PIT", "SDP", "SEA", "SFG", "STL", "TBR", "TEX", "TOR", "WSN"]
+HITTER_STATS = {"wOBA": (0.315, 0.030), "ISO": (0.155, 0.050), "wBsR": (0.0, 2.0), "AB": (420, 120), "wRC+": (100, 22),
+                "HR": (15, 9), "R": (58, 22), "RBI": (56, 22), "SB": (7, 7), "AVG": (0.248, 0.022)}
+PITCHER_STATS = {"K-BB%": (0.13, 0.05), "IP": (95, 55), "WHIP": (1.26, 0.15), "FIP": (4.1, 0.6), "SV": (2, 7),
+                 "ERA": (4.1, 0.7), "W": (6, 4), "QS": (8, 6)}
+HITTER_POSITIONS = ["C", "1B", "2B", "3B", "SS", "OF", "OF", "OF", "DH"]
+# ESPN-style lineup slots; the bench takes whatever is left of the roster size.
+STARTING_SLOTS = {"C": 1, "1B": 1, "2B": 1, "3B": 1, "SS": 1, "2B/SS": 1, "1B/3B": 1, "OF": 3, "UTIL": 1, "P": 9}
+INJURIES = ["DAY_TO_DAY", "TEN_DAY_DL", "FIFTEEN_DAY_DL", "SIXTY_DAY_DL"]
+# Points per stat, as espn_data.get_scoring_settings saves them (only stats the pool projects).
+SCORING = {"HR": 4, "R": 1, "RBI": 1, "SB": 2, "W": 5, "SV": 5, "QS": 3, "OUTS": 1}
+
+
+def roster_slots(roster_size: int) -> dict:
+    return {**STARTING_SLOTS, "BE": max(0, roster_size - sum(STARTING_SLOTS.values())), "IL": 2}
+
+
+def _positions(rng, n: int) -> list[str]:
+    """Hitter eligibility in classify_player format ("1B, OF"); about a third are multi-position."""
+    out = []
+    for _ in range(n):
+        k = 1 + (rng.random() < 0.3) + (rng.random() < 0.08)
+        out.append(", ".join(sorted(set(rng.choice(HITTER_POSITIONS, k)))))
+    return out
+
+
+def synthetic_pool(teams: int = 10, roster_size: int = 25, free_agents: int = 3000, seed: int = 0) -> pd.DataFrame:
+    """Merged pool of teams * roster_size rostered players plus `free_agents` more."""
+    rng = np.random.default_rng(seed)
+    total = teams * roster_size + free_agents
+    n_pit = int(total * 0.45)
+    frames = []
+    for n, stats, role, offset in ((total - n_pit, HITTER_STATS, "Hitter", 0), (n_pit, PITCHER_STATS, "Pitcher", total - n_pit)):
+        df = pd.DataFrame({
+            "player_id": np.arange(30000 + offset, 30000 + offset + n),
+            "name_fa": [f"{role} {i:05d}" for i in range(n)],
+            "team_fa": rng.choice(MLB_TEAMS, n),
+            "position": "Pitcher" if role == "Pitcher" else _positions(rng, n),
+            "fantasy_points": rng.normal(180, 90, n).round(1),
+        })
+        df["name_fg"], df["team_fg"] = df["name_fa"], df["team_fa"]
+        skill = rng.normal(0, 1, n)
+        for stat, (mean, std) in stats.items():
+            proj = mean + std * (0.7 * skill + 0.3 * rng.normal(0, 1, n))
+            curr = proj * rng.uniform(0.2, 1.1, n) if stat in ("AB", "IP", "HR", "R", "RBI", "SB", "SV", "W", "QS") \
+                else proj + std * rng.normal(0, 0.6, n)
+            if stat in ("FIP", "WHIP", "ERA"):
+                proj, curr = 2 * mean - proj, 2 * mean - curr
+            proj, curr = np.maximum(proj, 0), np.maximum(curr, 0)
+            curr[rng.random(n) < 0.08] = np.nan
+            df[f"proj_{stat}"], df[f"curr_{stat}"] = proj.round(3), curr.round(3)
+        if role == "Pitcher":
+            closers = rng.random(n) < 0.12
+            df.loc[closers, "proj_SV"] = rng.uniform(15, 40, closers.sum()).round()
+            df.loc[closers, "proj_IP"] = rng.uniform(50, 70, closers.sum()).round()
+            df["IP"], df["SV"] = df["proj_IP"], df["proj_SV"]
+        else:
+            df["AB"] = df["proj_AB"]
+        df["_skill"] = skill
+        frames.append(df)
+
+    pool = pd.concat(frames, ignore_index=True)
+    adp = pd.Series(pool["_skill"].to_numpy() + rng.normal(0, 0.5, total)).rank(ascending=False)
+    pool["proj_ADP"] = adp.where(adp <= 750).round(1).to_numpy()
+    pool["injury_status"] = np.where(rng.random(total) < 0.08, rng.choice(INJURIES, total), "ACTIVE")
+    pool["fantasy_team"] = "Free Agent"
+    rostered = adp.nsmallest(teams * roster_size).index
+    pool.loc[rostered, "fantasy_team"] = [f"Team {i % teams + 1}" for i in range(len(rostered))]
+    return pool.drop(columns="_skill")
+
+
+def synthetic_snapshot(teams: int = 10, roster_size: int = 25, free_agents: int = 3000, seed: int = 0) -> pd.DataFrame:
+    """A ranked snapshot exactly as pipeline.run_refresh writes it."""
+    from analysis import rank_free_agents  # type: ignore
+    from pipeline import prepare_output_dataframe  # type: ignore
+
+    ranked = rank_free_agents(synthetic_pool(teams, roster_size, free_agents, seed))
+    return prepare_output_dataframe(ranked, all_columns=True)
+
+
+def write_league(output_dir, teams: int = 10, roster_size: int = 25, free_agents: int = 3000, seed: int = 0,
+                 draft: bool = True) -> dict:
+    """Write a snapshot (plus league settings and draft workbook) into `output_dir`; returns the paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    csv_path = os.path.join(output_dir, "free_agents_ranked_20260401_080000.csv")
+    synthetic_snapshot(teams, roster_size, free_agents, seed).to_csv(csv_path, index=False)
+    with open(os.path.join(output_dir, "roster_settings.json"), "w") as f:
+        json.dump(roster_slots(roster_size), f)
+    with open(os.path.join(output_dir, "scoring_settings.json"), "w") as f:
+        json.dump(SCORING, f)
+    paths = {"csv": csv_path, "draft": None}
+    if draft:
+        from draft_strategy_generator import analyze_and_adjust_rankings  # type: ignore
+        analyze_and_adjust_rankings(csv_path, output_directory=str(output_dir))
+        workbooks = sorted(Path(output_dir).glob("draft_strategy_*.xlsx"))
+        paths["draft"] = str(workbooks[-1]) if workbooks else None
+    return paths
@@ -0,0 +1,35 @@
+-- Add upsert support to a database created by CREATE_Baseball.sql (after ALTER_FactSeasonStatsPitching.sql):
+-- a RowHash column on the stats fact tables and a unique (PlayerID, TeamID, SeasonID) key. Rows duplicated by
+-- earlier insert-only loads are removed first, keeping the newest of each key. Run once.
+USE [Baseball]
+GO
+ALTER TABLE [dbo].[FactSeasonStatsBatting] ADD [RowHash] [char](32) NULL
+GO
+ALTER TABLE [dbo].[FactSeasonStatsPitching] ADD [RowHash] [char](32) NULL
+GO
+WITH ranked AS (
+	SELECT ROW_NUMBER() OVER (PARTITION BY [PlayerID], [TeamID], [SeasonID] ORDER BY [FactSeasonStatsID] DESC) AS rn
+	FROM [dbo].[FactSeasonStatsBatting]
+)
+DELETE FROM ranked WHERE rn > 1
+GO
+WITH ranked AS (
+	SELECT ROW_NUMBER() OVER (PARTITION BY [PlayerID], [TeamID], [SeasonID] ORDER BY [FactSeasonStatsID] DESC) AS rn
+	FROM [dbo].[FactSeasonStatsPitching]
+)
+DELETE FROM ranked WHERE rn > 1
+GO
+CREATE UNIQUE NONCLUSTERED INDEX [UX_FactSeasonStatsBatting_Key] ON [dbo].[FactSeasonStatsBatting]
+(
+	[PlayerID] ASC,
+	[TeamID] ASC,
+	[SeasonID] ASC
+)
+GO
+CREATE UNIQUE NONCLUSTERED INDEX [UX_FactSeasonStatsPitching_Key] ON [dbo].[FactSeasonStatsPitching]
+(
+	[PlayerID] ASC,
+	[TeamID] ASC,
+	[SeasonID] ASC
+)
+GO
@@ -0,0 +1,29 @@
+-- Bring FactSeasonStatsPitching in line with PITCHING_STAT_MAPPING in src/db_loader.py and with
+-- FactSeasonStatsBatting: add the Dim* foreign keys the loader writes, rename the FanGraphs ids out of
+-- the way of PlayerID/TeamID (column names are case-insensitive), and add the missing stat columns.
+-- Run once against a database created by CREATE_Baseball.sql.
+USE [Baseball]
+GO
+EXEC sp_rename 'dbo.FactSeasonStatsPitching.playerid', 'SourcePlayerID', 'COLUMN'
+GO
+EXEC sp_rename 'dbo.FactSeasonStatsPitching.teamid', 'SourceTeamID', 'COLUMN'
+GO
+ALTER TABLE [dbo].[FactSeasonStatsPitching] ADD
+	[PlayerID] [int] NULL,
+	[TeamID] [int] NULL,
+	[SeasonID] [int] NULL,
+	[AgeRange] [nvarchar](20) NULL,
+	[xwOBA] [decimal](10, 6) NULL,
+	[xAVG] [decimal](10, 6) NULL,
+	[xSLG] [decimal](10, 6) NULL,
+	[XBR] [decimal](10, 6) NULL
+GO
+ALTER TABLE [dbo].[FactSeasonStatsPitching]  WITH CHECK ADD  CONSTRAINT [FK_FactSeasonStatsPitching_Player] FOREIGN KEY([PlayerID])
+REFERENCES [dbo].[DimPlayer] ([PlayerID])
+GO
+ALTER TABLE [dbo].[FactSeasonStatsPitching]  WITH CHECK ADD  CONSTRAINT [FK_FactSeasonStatsPitching_Season] FOREIGN KEY([SeasonID])
+REFERENCES [dbo].[DimSeason] ([SeasonID])
+GO
+ALTER TABLE [dbo].[FactSeasonStatsPitching]  WITH CHECK ADD  CONSTRAINT [FK_FactSeasonStatsPitching_Team] FOREIGN KEY([TeamID])
+REFERENCES [dbo].[DimTeam] ([TeamID])
+GO
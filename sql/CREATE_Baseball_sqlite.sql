@@ -0,0 +1,938 @@
+-- SQLite version of the Baseball star schema (sql/CREATE_Baseball.sql is the SQL Server original).
+-- Applied by warehouse.SqliteBackend on connect; every statement is idempotent.
+--
+-- Differences from the SQL Server script:
+--   * IDENTITY keys are INTEGER PRIMARY KEY (rowid aliases); decimal -> REAL, nvarchar/char -> TEXT.
+--   * Natural keys of the dimensions are unique, and every fact foreign key is indexed.
+--   * The stats fact tables hold one row per (PlayerID, TeamID, SeasonID), with a RowHash of the stat line
+--     that db_loader compares to skip unchanged rows.
+--   * FactSeasonStatsPitching has the PlayerID/TeamID/SeasonID foreign keys the loader writes, its FanGraphs
+--     playerid/teamid columns are named SourcePlayerID/SourceTeamID (as in FactSeasonStatsBatting), and it has
+--     the AgeRange, xwOBA, xAVG, xSLG and XBR columns of PITCHING_STAT_MAPPING.
+
+CREATE TABLE IF NOT EXISTS DimPlayer (
+    PlayerID INTEGER PRIMARY KEY,
+    FangraphsPlayerID INTEGER NOT NULL,
+    PlayerName TEXT NOT NULL,
+    Bats TEXT
+);
+
+CREATE TABLE IF NOT EXISTS DimSeason (
+    SeasonID INTEGER PRIMARY KEY,
+    SeasonYear INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS DimTeam (
+    TeamID INTEGER PRIMARY KEY,
+    TeamName TEXT NOT NULL,
+    TeamNameAbb TEXT
+);
+
+CREATE TABLE IF NOT EXISTS FactSeasonProjections (
+    ProjectionID INTEGER PRIMARY KEY,
+    PlayerID INTEGER NOT NULL REFERENCES DimPlayer (PlayerID),
+    TeamID INTEGER NOT NULL REFERENCES DimTeam (TeamID),
+    SeasonID INTEGER NOT NULL REFERENCES DimSeason (SeasonID),
+    ProjectionCycle TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    Games REAL,
+    AtBats REAL,
+    PlateAppearances REAL,
+    Hits REAL,
+    Singles REAL,
+    Doubles REAL,
+    Triples REAL,
+    HomeRuns REAL,
+    Runs REAL,
+    RBI REAL,
+    BaseOnBalls REAL,
+    IntentionalWalks REAL,
+    StrikeOuts REAL,
+    HitByPitch REAL,
+    SacrificeFlies REAL,
+    SacrificeHits REAL,
+    GroundedIntoDoublePlay REAL,
+    StolenBases REAL,
+    CaughtStealing REAL,
+    BattingAverage REAL,
+    OnBasePercentage REAL,
+    SluggingPercentage REAL,
+    OPS REAL,
+    wOBA REAL,
+    BBPercent REAL,
+    KPercent REAL,
+    BBPerK REAL,
+    ISO REAL,
+    Spd REAL,
+    BABIP REAL,
+    UBR REAL,
+    GDPRuns REAL,
+    wRC REAL,
+    wRAA REAL,
+    UZR REAL,
+    wBsR REAL,
+    BaseRunning REAL,
+    WAR REAL,
+    Off REAL,
+    Def REAL,
+    wRCPlus REAL,
+    FPTS REAL,
+    FPTS_G REAL,
+    SPTS REAL,
+    SPTS_G REAL,
+    woba_sd REAL,
+    truetalent_sd REAL,
+    woba_sd_book REAL,
+    woba_se REAL,
+    total_se REAL,
+    q10 REAL,
+    q20 REAL,
+    q30 REAL,
+    q40 REAL,
+    q50 REAL,
+    q60 REAL,
+    q70 REAL,
+    q80 REAL,
+    q90 REAL,
+    tt_q10 REAL,
+    tt_q20 REAL,
+    tt_q30 REAL,
+    tt_q40 REAL,
+    tt_q50 REAL,
+    tt_q60 REAL,
+    tt_q70 REAL,
+    tt_q80 REAL,
+    tt_q90 REAL,
+    ADP REAL,
+    Pos REAL,
+    minpos TEXT,
+    UPURL TEXT,
+    SourceTeam TEXT,
+    SourceShortName TEXT,
+    League TEXT,
+    SourcePlayerName TEXT,
+    Source_xMLBAMID INTEGER,
+    SourcePlayerIDs TEXT,
+    SourcePlayerID TEXT
+);
+
+CREATE TABLE IF NOT EXISTS FactSeasonStatsBatting (
+    FactSeasonStatsID INTEGER PRIMARY KEY,
+    PlayerID INTEGER NOT NULL REFERENCES DimPlayer (PlayerID),
+    TeamID INTEGER NOT NULL REFERENCES DimTeam (TeamID),
+    SeasonID INTEGER NOT NULL REFERENCES DimSeason (SeasonID),
+    Age REAL,
+    AgeRange TEXT,
+    SeasonMin INTEGER,
+    SeasonMax INTEGER,
+    Games REAL,
+    AtBats REAL,
+    PlateAppearances REAL,
+    Hits REAL,
+    Singles REAL,
+    Doubles REAL,
+    Triples REAL,
+    HomeRuns REAL,
+    Runs REAL,
+    RBI REAL,
+    BaseOnBalls REAL,
+    IntentionalWalks REAL,
+    StrikeOuts REAL,
+    HitByPitch REAL,
+    SacrificeFlies REAL,
+    SacrificeHits REAL,
+    GroundedIntoDoublePlay REAL,
+    StolenBases REAL,
+    CaughtStealing REAL,
+    BattingAverage REAL,
+    GroundBalls REAL,
+    FlyBalls REAL,
+    LineDrives REAL,
+    InfieldFlyBalls REAL,
+    Pitches REAL,
+    Balls REAL,
+    Strikes REAL,
+    IFH REAL,
+    BU REAL,
+    BUH REAL,
+    BBPercent REAL,
+    KPercent REAL,
+    BBPerK REAL,
+    OnBasePercentage REAL,
+    SluggingPercentage REAL,
+    OPS REAL,
+    ISO REAL,
+    BABIP REAL,
+    GB_FB_Ratio REAL,
+    LDPercent REAL,
+    GBPercent REAL,
+    FBPercent REAL,
+    IFFBPercent REAL,
+    HR_FB_Ratio REAL,
+    IFHPercent REAL,
+    BUHPercent REAL,
+    TTOPercent REAL,
+    wOBA REAL,
+    wRAA REAL,
+    wRC REAL,
+    BattingValue REAL,
+    Fielding REAL,
+    Replacement REAL,
+    Positional REAL,
+    wLeague REAL,
+    CFraming REAL,
+    Defense REAL,
+    Offense REAL,
+    RAR REAL,
+    WAR REAL,
+    WAROld REAL,
+    Dollars REAL,
+    BaseRunning REAL,
+    Spd REAL,
+    wRCPlus REAL,
+    wBsR REAL,
+    WPA REAL,
+    WPA_Negative REAL,
+    WPA_Positive REAL,
+    RE24 REAL,
+    REW REAL,
+    pLI REAL,
+    phLI REAL,
+    PH REAL,
+    WPA_per_LI REAL,
+    Clutch REAL,
+    FBPercent1 REAL,
+    FBv REAL,
+    SLPercent REAL,
+    SLv REAL,
+    CTPercent REAL,
+    CTv REAL,
+    CBPercent REAL,
+    CBv REAL,
+    CHPercent REAL,
+    CHv REAL,
+    SFPercent REAL,
+    SFv REAL,
+    KNPercent REAL,
+    KNv REAL,
+    XXPercent REAL,
+    POPercent REAL,
+    wFB REAL,
+    wSL REAL,
+    wCT REAL,
+    wCB REAL,
+    wCH REAL,
+    wSF REAL,
+    wKN REAL,
+    wFB_PerC REAL,
+    wSL_PerC REAL,
+    wCT_PerC REAL,
+    wCB_PerC REAL,
+    wCH_PerC REAL,
+    wSF_PerC REAL,
+    wKN_PerC REAL,
+    OSwingPercent REAL,
+    ZSwingPercent REAL,
+    SwingPercent REAL,
+    OContactPercent REAL,
+    ZContactPercent REAL,
+    ContactPercent REAL,
+    ZonePercent REAL,
+    FStrikePercent REAL,
+    SwStrPercent REAL,
+    CStrPercent REAL,
+    CPlusSwStrPercent REAL,
+    Pull REAL,
+    Cent REAL,
+    Oppo REAL,
+    Soft REAL,
+    Med REAL,
+    Hard REAL,
+    bipCount REAL,
+    PullPercent REAL,
+    CentPercent REAL,
+    OppoPercent REAL,
+    SoftPercent REAL,
+    MedPercent REAL,
+    HardPercent REAL,
+    UBR REAL,
+    GDPRuns REAL,
+    AVGPlus REAL,
+    BBPlus REAL,
+    KPlus REAL,
+    OBPPlus REAL,
+    SLGPlus REAL,
+    ISOPlus REAL,
+    BABIPPlus REAL,
+    LDPlus REAL,
+    GBPlus REAL,
+    FBPlus REAL,
+    HRFBPlus REAL,
+    PullPlus REAL,
+    CentPlus REAL,
+    OppoPlus REAL,
+    SoftPlus REAL,
+    MedPlus REAL,
+    HardPlus REAL,
+    xwOBA REAL,
+    xAVG REAL,
+    xSLG REAL,
+    XBR REAL,
+    PPTV REAL,
+    CPTV REAL,
+    BPTV REAL,
+    DSV REAL,
+    DGV REAL,
+    BTV REAL,
+    rPPTV REAL,
+    rCPTV REAL,
+    rBPTV REAL,
+    rDSV REAL,
+    rDGV REAL,
+    rBTV REAL,
+    EBV REAL,
+    ESV REAL,
+    rFTeamV REAL,
+    rBTeamV REAL,
+    rTV REAL,
+    pfxFA_Percent REAL,
+    pfxFT_Percent REAL,
+    pfxFC_Percent REAL,
+    pfxFS_Percent REAL,
+    pfxFO_Percent REAL,
+    pfxSI_Percent REAL,
+    pfxSL_Percent REAL,
+    pfxCU_Percent REAL,
+    pfxKC_Percent REAL,
+    pfxEP_Percent REAL,
+    pfxCH_Percent REAL,
+    pfxSC_Percent REAL,
+    pfxKN_Percent REAL,
+    pfxUN_Percent REAL,
+    pfxvFA REAL,
+    pfxvFT REAL,
+    pfxvFC REAL,
+    pfxvFS REAL,
+    pfxvFO REAL,
+    pfxvSI REAL,
+    pfxvSL REAL,
+    pfxvCU REAL,
+    pfxvKC REAL,
+    pfxvEP REAL,
+    pfxvCH REAL,
+    pfxvSC REAL,
+    pfxvKN REAL,
+    pfxFA_X REAL,
+    pfxFT_X REAL,
+    pfxFC_X REAL,
+    pfxFS_X REAL,
+    pfxFO_X REAL,
+    pfxSI_X REAL,
+    pfxSL_X REAL,
+    pfxCU_X REAL,
+    pfxKC_X REAL,
+    pfxEP_X REAL,
+    pfxCH_X REAL,
+    pfxSC_X REAL,
+    pfxKN_X REAL,
+    pfxFA_Z REAL,
+    pfxFT_Z REAL,
+    pfxFC_Z REAL,
+    pfxFS_Z REAL,
+    pfxFO_Z REAL,
+    pfxSI_Z REAL,
+    pfxSL_Z REAL,
+    pfxCU_Z REAL,
+    pfxKC_Z REAL,
+    pfxEP_Z REAL,
+    pfxCH_Z REAL,
+    pfxSC_Z REAL,
+    pfxKN_Z REAL,
+    pfxwFA REAL,
+    pfxwFT REAL,
+    pfxwFC REAL,
+    pfxwFS REAL,
+    pfxwFO REAL,
+    pfxwSI REAL,
+    pfxwSL REAL,
+    pfxwCU REAL,
+    pfxwKC REAL,
+    pfxwEP REAL,
+    pfxwCH REAL,
+    pfxwSC REAL,
+    pfxwKN REAL,
+    pfxwFA_PerC REAL,
+    pfxwFT_PerC REAL,
+    pfxwFC_PerC REAL,
+    pfxwFS_PerC REAL,
+    pfxwFO_PerC REAL,
+    pfxwSI_PerC REAL,
+    pfxwSL_PerC REAL,
+    pfxwCU_PerC REAL,
+    pfxwKC_PerC REAL,
+    pfxwEP_PerC REAL,
+    pfxwCH_PerC REAL,
+    pfxwSC_PerC REAL,
+    pfxwKN_PerC REAL,
+    pfxO_Swing_Percent REAL,
+    pfxZ_Swing_Percent REAL,
+    pfxSwing_Percent REAL,
+    pfxO_Contact_Percent REAL,
+    pfxZ_Contact_Percent REAL,
+    pfxContact_Percent REAL,
+    pfxZone_Percent REAL,
+    pfxPace REAL,
+    piCH_Percent REAL,
+    piCS_Percent REAL,
+    piCU_Percent REAL,
+    piFA_Percent REAL,
+    piFC_Percent REAL,
+    piFS_Percent REAL,
+    piKN_Percent REAL,
+    piSB_Percent REAL,
+    piSI_Percent REAL,
+    piSL_Percent REAL,
+    piXX_Percent REAL,
+    pivCH REAL,
+    pivCS REAL,
+    pivCU REAL,
+    pivFA REAL,
+    pivFC REAL,
+    pivFS REAL,
+    pivKN REAL,
+    pivSB REAL,
+    pivSI REAL,
+    pivSL REAL,
+    pivXX REAL,
+    piCH_X REAL,
+    piCS_X REAL,
+    piCU_X REAL,
+    piFA_X REAL,
+    piFC_X REAL,
+    piFS_X REAL,
+    piKN_X REAL,
+    piSB_X REAL,
+    piSI_X REAL,
+    piSL_X REAL,
+    piXX_X REAL,
+    piCH_Z REAL,
+    piCS_Z REAL,
+    piCU_Z REAL,
+    piFA_Z REAL,
+    piFC_Z REAL,
+    piFS_Z REAL,
+    piKN_Z REAL,
+    piSB_Z REAL,
+    piSI_Z REAL,
+    piSL_Z REAL,
+    piXX_Z REAL,
+    piwCH REAL,
+    piwCS REAL,
+    piwCU REAL,
+    piwFA REAL,
+    piwFC REAL,
+    piwFS REAL,
+    piwKN REAL,
+    piwSB REAL,
+    piwSI REAL,
+    piwSL REAL,
+    piwXX REAL,
+    piwCH_PerC REAL,
+    piwCS_PerC REAL,
+    piwCU_PerC REAL,
+    piwFA_PerC REAL,
+    piwFC_PerC REAL,
+    piwFS_PerC REAL,
+    piwKN_PerC REAL,
+    piwSB_PerC REAL,
+    piwSI_PerC REAL,
+    piwSL_PerC REAL,
+    piwXX_PerC REAL,
+    piO_Swing_Percent REAL,
+    piZ_Swing_Percent REAL,
+    piSwing_Percent REAL,
+    piO_Contact_Percent REAL,
+    piZ_Contact_Percent REAL,
+    piContact_Percent REAL,
+    piZone_Percent REAL,
+    piPace REAL,
+    Events REAL,
+    EV REAL,
+    LA REAL,
+    Barrels REAL,
+    BarrelPercent REAL,
+    maxEV REAL,
+    HardHit REAL,
+    HardHitPercent REAL,
+    Q REAL,
+    TG REAL,
+    TPA REAL,
+    PlayerNameRoute TEXT,
+    PlayerNameDup TEXT,
+    position TEXT,
+    SourcePlayerID INTEGER,
+    TeamName TEXT,
+    SourceTeamNameAbb TEXT,
+    SourceTeamID INTEGER,
+    Pos REAL,
+    RowHash TEXT
+);
+
+CREATE TABLE IF NOT EXISTS FactSeasonStatsPitching (
+    FactSeasonStatsID INTEGER PRIMARY KEY,
+    PlayerID INTEGER NOT NULL REFERENCES DimPlayer (PlayerID),
+    TeamID INTEGER NOT NULL REFERENCES DimTeam (TeamID),
+    SeasonID INTEGER NOT NULL REFERENCES DimSeason (SeasonID),
+    Throws TEXT,
+    xMLBAMID INTEGER,
+    Name TEXT,
+    Team TEXT,
+    Season INTEGER,
+    Age REAL,
+    AgeR TEXT,
+    SeasonMin INTEGER,
+    SeasonMax INTEGER,
+    W REAL,
+    L REAL,
+    ERA REAL,
+    G REAL,
+    GS REAL,
+    QS REAL,
+    CG REAL,
+    ShO REAL,
+    SV REAL,
+    BS REAL,
+    IP REAL,
+    TBF REAL,
+    H REAL,
+    R REAL,
+    ER REAL,
+    HR REAL,
+    BB REAL,
+    IBB REAL,
+    HBP REAL,
+    WP REAL,
+    BK REAL,
+    SO REAL,
+    GB REAL,
+    FB REAL,
+    LD REAL,
+    IFFB REAL,
+    Pitches REAL,
+    Balls REAL,
+    Strikes REAL,
+    RS REAL,
+    IFH REAL,
+    BU REAL,
+    BUH REAL,
+    KPer9 REAL,
+    BBPer9 REAL,
+    K_BB REAL,
+    HPer9 REAL,
+    HRPer9 REAL,
+    AVG REAL,
+    WHIP REAL,
+    BABIP REAL,
+    LOBPercent REAL,
+    FIP REAL,
+    GB_FB REAL,
+    LDPercent REAL,
+    GBPercent REAL,
+    FBPercent REAL,
+    IFFBPercent REAL,
+    HR_FB REAL,
+    IFHPercent REAL,
+    BUHPercent REAL,
+    TTOPercent REAL,
+    CFraming REAL,
+    Starting REAL,
+    Start_IP REAL,
+    Relieving REAL,
+    Relief_IP REAL,
+    RAR REAL,
+    WAR REAL,
+    Dollars REAL,
+    RA9_Wins REAL,
+    LOB_Wins REAL,
+    BIP_Wins REAL,
+    BS_Wins REAL,
+    tERA REAL,
+    xFIP REAL,
+    WPA REAL,
+    Negative_WPA REAL,
+    Positive_WPA REAL,
+    RE24 REAL,
+    REW REAL,
+    pLI REAL,
+    inLI REAL,
+    gmLI REAL,
+    exLI REAL,
+    Pulls REAL,
+    Games REAL,
+    WPA_LI REAL,
+    Clutch REAL,
+    FBPercent1 REAL,
+    FBv REAL,
+    SLPercent REAL,
+    SLv REAL,
+    CTPercent REAL,
+    CTv REAL,
+    CBPercent REAL,
+    CBv REAL,
+    CHPercent REAL,
+    CHv REAL,
+    SFPercent REAL,
+    SFv REAL,
+    KNPercent REAL,
+    KNv REAL,
+    XXPercent REAL,
+    POPercent REAL,
+    wFB REAL,
+    wSL REAL,
+    wCT REAL,
+    wCB REAL,
+    wCH REAL,
+    wSF REAL,
+    wKN REAL,
+    wFB_PerC REAL,
+    wSL_PerC REAL,
+    wCT_PerC REAL,
+    wCB_PerC REAL,
+    wCH_PerC REAL,
+    wSF_PerC REAL,
+    wKN_PerC REAL,
+    O_SwingPercent REAL,
+    Z_SwingPercent REAL,
+    SwingPercent REAL,
+    O_ContactPercent REAL,
+    Z_ContactPercent REAL,
+    ContactPercent REAL,
+    ZonePercent REAL,
+    F_StrikePercent REAL,
+    SwStrPercent REAL,
+    CStrPercent REAL,
+    CPlusSwStrPercent REAL,
+    HLD REAL,
+    SD REAL,
+    MD REAL,
+    ERA_Minus REAL,
+    FIP_Minus REAL,
+    xFIP_Minus REAL,
+    KPercent REAL,
+    BBPercent REAL,
+    K_BBPercent REAL,
+    SIERA REAL,
+    kwERA REAL,
+    RS_Per9 REAL,
+    E_F REAL,
+    Pull REAL,
+    Cent REAL,
+    Oppo REAL,
+    Soft REAL,
+    Med REAL,
+    Hard REAL,
+    bipCount REAL,
+    PullPercent REAL,
+    CentPercent REAL,
+    OppoPercent REAL,
+    SoftPercent REAL,
+    MedPercent REAL,
+    HardPercent REAL,
+    KPer9_Plus REAL,
+    BBPer9_Plus REAL,
+    K_BB_Plus REAL,
+    HPer9_Plus REAL,
+    HRPer9_Plus REAL,
+    AVG_Plus REAL,
+    WHIP_Plus REAL,
+    BABIP_Plus REAL,
+    LOBPercent_Plus REAL,
+    KPercent_Plus REAL,
+    BBPercent_Plus REAL,
+    LDPercent_Plus REAL,
+    GBPercent_Plus REAL,
+    FBPercent_Plus REAL,
+    HRFBPercent_Plus REAL,
+    PullPercent_Plus REAL,
+    CentPercent_Plus REAL,
+    OppoPercent_Plus REAL,
+    SoftPercent_Plus REAL,
+    MedPercent_Plus REAL,
+    HardPercent_Plus REAL,
+    pb_o_CH REAL,
+    pb_s_CH REAL,
+    pb_c_CH REAL,
+    pb_o_CU REAL,
+    pb_s_CU REAL,
+    pb_c_CU REAL,
+    pb_o_FF REAL,
+    pb_s_FF REAL,
+    pb_c_FF REAL,
+    pb_o_SI REAL,
+    pb_s_SI REAL,
+    pb_c_SI REAL,
+    pb_o_SL REAL,
+    pb_s_SL REAL,
+    pb_c_SL REAL,
+    pb_o_KC REAL,
+    pb_s_KC REAL,
+    pb_c_KC REAL,
+    pb_o_FC REAL,
+    pb_s_FC REAL,
+    pb_c_FC REAL,
+    pb_o_FS REAL,
+    pb_s_FS REAL,
+    pb_c_FS REAL,
+    pb_overall REAL,
+    pb_stuff REAL,
+    pb_command REAL,
+    pb_xRV100 REAL,
+    pb_ERA REAL,
+    sp_s_CH REAL,
+    sp_l_CH REAL,
+    sp_p_CH REAL,
+    sp_s_CU REAL,
+    sp_l_CU REAL,
+    sp_p_CU REAL,
+    sp_s_FF REAL,
+    sp_l_FF REAL,
+    sp_p_FF REAL,
+    sp_s_SI REAL,
+    sp_l_SI REAL,
+    sp_p_SI REAL,
+    sp_s_SL REAL,
+    sp_l_SL REAL,
+    sp_p_SL REAL,
+    sp_s_KC REAL,
+    sp_l_KC REAL,
+    sp_p_KC REAL,
+    sp_s_FC REAL,
+    sp_l_FC REAL,
+    sp_p_FC REAL,
+    sp_s_FS REAL,
+    sp_l_FS REAL,
+    sp_p_FS REAL,
+    sp_s_FO REAL,
+    sp_l_FO REAL,
+    sp_p_FO REAL,
+    sp_stuff REAL,
+    sp_location REAL,
+    sp_pitching REAL,
+    PPTV REAL,
+    CPTV REAL,
+    BPTV REAL,
+    DSV REAL,
+    DGV REAL,
+    BTV REAL,
+    rPPTV REAL,
+    rCPTV REAL,
+    rBPTV REAL,
+    rDSV REAL,
+    rDGV REAL,
+    rBTV REAL,
+    EBV REAL,
+    ESV REAL,
+    rFTeamV REAL,
+    rBTeamV REAL,
+    rTV REAL,
+    pfxFA_Percent REAL,
+    pfxFT_Percent REAL,
+    pfxFC_Percent REAL,
+    pfxFS_Percent REAL,
+    pfxFO_Percent REAL,
+    pfxSI_Percent REAL,
+    pfxSL_Percent REAL,
+    pfxCU_Percent REAL,
+    pfxKC_Percent REAL,
+    pfxEP_Percent REAL,
+    pfxCH_Percent REAL,
+    pfxSC_Percent REAL,
+    pfxKN_Percent REAL,
+    pfxUN_Percent REAL,
+    pfxvFA REAL,
+    pfxvFT REAL,
+    pfxvFC REAL,
+    pfxvFS REAL,
+    pfxvFO REAL,
+    pfxvSI REAL,
+    pfxvSL REAL,
+    pfxvCU REAL,
+    pfxvKC REAL,
+    pfxvEP REAL,
+    pfxvCH REAL,
+    pfxvSC REAL,
+    pfxvKN REAL,
+    pfxFA_X REAL,
+    pfxFT_X REAL,
+    pfxFC_X REAL,
+    pfxFS_X REAL,
+    pfxFO_X REAL,
+    pfxSI_X REAL,
+    pfxSL_X REAL,
+    pfxCU_X REAL,
+    pfxKC_X REAL,
+    pfxEP_X REAL,
+    pfxCH_X REAL,
+    pfxSC_X REAL,
+    pfxKN_X REAL,
+    pfxFA_Z REAL,
+    pfxFT_Z REAL,
+    pfxFC_Z REAL,
+    pfxFS_Z REAL,
+    pfxFO_Z REAL,
+    pfxSI_Z REAL,
+    pfxSL_Z REAL,
+    pfxCU_Z REAL,
+    pfxKC_Z REAL,
+    pfxEP_Z REAL,
+    pfxCH_Z REAL,
+    pfxSC_Z REAL,
+    pfxKN_Z REAL,
+    pfxwFA REAL,
+    pfxwFT REAL,
+    pfxwFC REAL,
+    pfxwFS REAL,
+    pfxwFO REAL,
+    pfxwSI REAL,
+    pfxwSL REAL,
+    pfxwCU REAL,
+    pfxwKC REAL,
+    pfxwEP REAL,
+    pfxwCH REAL,
+    pfxwSC REAL,
+    pfxwKN REAL,
+    pfxwFA_PerC REAL,
+    pfxwFT_PerC REAL,
+    pfxwFC_PerC REAL,
+    pfxwFS_PerC REAL,
+    pfxwFO_PerC REAL,
+    pfxwSI_PerC REAL,
+    pfxwSL_PerC REAL,
+    pfxwCU_PerC REAL,
+    pfxwKC_PerC REAL,
+    pfxwEP_PerC REAL,
+    pfxwCH_PerC REAL,
+    pfxwSC_PerC REAL,
+    pfxwKN_PerC REAL,
+    pfxO_SwingPercent REAL,
+    pfxZ_SwingPercent REAL,
+    pfxSwingPercent REAL,
+    pfxO_ContactPercent REAL,
+    pfxZ_ContactPercent REAL,
+    pfxContactPercent REAL,
+    pfxZonePercent REAL,
+    pfxPace REAL,
+    piCH_Percent REAL,
+    piCS_Percent REAL,
+    piCU_Percent REAL,
+    piFA_Percent REAL,
+    piFC_Percent REAL,
+    piFS_Percent REAL,
+    piKN_Percent REAL,
+    piSB_Percent REAL,
+    piSI_Percent REAL,
+    piSL_Percent REAL,
+    piXX_Percent REAL,
+    pivCH REAL,
+    pivCS REAL,
+    pivCU REAL,
+    pivFA REAL,
+    pivFC REAL,
+    pivFS REAL,
+    pivKN REAL,
+    pivSB REAL,
+    pivSI REAL,
+    pivSL REAL,
+    pivXX REAL,
+    piCH_X REAL,
+    piCS_X REAL,
+    piCU_X REAL,
+    piFA_X REAL,
+    piFC_X REAL,
+    piFS_X REAL,
+    piKN_X REAL,
+    piSB_X REAL,
+    piSI_X REAL,
+    piSL_X REAL,
+    piXX_X REAL,
+    piCH_Z REAL,
+    piCS_Z REAL,
+    piCU_Z REAL,
+    piFA_Z REAL,
+    piFC_Z REAL,
+    piFS_Z REAL,
+    piKN_Z REAL,
+    piSB_Z REAL,
+    piSI_Z REAL,
+    piSL_Z REAL,
+    piXX_Z REAL,
+    piwCH REAL,
+    piwCS REAL,
+    piwCU REAL,
+    piwFA REAL,
+    piwFC REAL,
+    piwFS REAL,
+    piwKN REAL,
+    piwSB REAL,
+    piwSI REAL,
+    piwSL REAL,
+    piwXX REAL,
+    piwCH_PerC REAL,
+    piwCS_PerC REAL,
+    piwCU_PerC REAL,
+    piwFA_PerC REAL,
+    piwFC_PerC REAL,
+    piwFS_PerC REAL,
+    piwKN_PerC REAL,
+    piwSB_PerC REAL,
+    piwSI_PerC REAL,
+    piwSL_PerC REAL,
+    piwXX_PerC REAL,
+    piO_SwingPercent REAL,
+    piZ_SwingPercent REAL,
+    piSwingPercent REAL,
+    piO_ContactPercent REAL,
+    piZ_ContactPercent REAL,
+    piContactPercent REAL,
+    piZonePercent REAL,
+    piPace REAL,
+    Events REAL,
+    EV REAL,
+    LA REAL,
+    Barrels REAL,
+    BarrelPercent REAL,
+    maxEV REAL,
+    HardHit REAL,
+    HardHitPercent REAL,
+    Q REAL,
+    TG REAL,
+    TIP REAL,
+    PlayerNameRoute TEXT,
+    PlayerName TEXT,
+    position TEXT,
+    TeamName TEXT,
+    TeamNameAbb TEXT,
+    SourceTeamID INTEGER,
+    SourcePlayerID INTEGER,
+    AgeRange TEXT,
+    xwOBA REAL,
+    xAVG REAL,
+    xSLG REAL,
+    XBR REAL,
+    RowHash TEXT
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimPlayer_FangraphsPlayerID ON DimPlayer (FangraphsPlayerID);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimTeam_TeamNameAbb ON DimTeam (TeamNameAbb);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimSeason_SeasonYear ON DimSeason (SeasonYear);
+
+CREATE INDEX IF NOT EXISTS IX_FactSeasonProjections_PlayerID ON FactSeasonProjections (PlayerID);
+CREATE INDEX IF NOT EXISTS IX_FactSeasonProjections_TeamID ON FactSeasonProjections (TeamID);
+CREATE INDEX IF NOT EXISTS IX_FactSeasonProjections_SeasonID ON FactSeasonProjections (SeasonID);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_FactSeasonStatsBatting_Key ON FactSeasonStatsBatting (PlayerID, TeamID, SeasonID);
+DROP INDEX IF EXISTS IX_FactSeasonStatsBatting_PlayerID;
+CREATE INDEX IF NOT EXISTS IX_FactSeasonStatsBatting_TeamID ON FactSeasonStatsBatting (TeamID);
+CREATE INDEX IF NOT EXISTS IX_FactSeasonStatsBatting_SeasonID ON FactSeasonStatsBatting (SeasonID);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_FactSeasonStatsPitching_Key ON FactSeasonStatsPitching (PlayerID, TeamID, SeasonID);
+DROP INDEX IF EXISTS IX_FactSeasonStatsPitching_PlayerID;
+CREATE INDEX IF NOT EXISTS IX_FactSeasonStatsPitching_TeamID ON FactSeasonStatsPitching (TeamID);
+CREATE INDEX IF NOT EXISTS IX_FactSeasonStatsPitching_SeasonID ON FactSeasonStatsPitching (SeasonID);
@@ -2,80 +2,18 @@
 """
 Fantasy Baseball Analysis Script
 """
+import numpy as np
 import pandas as pd
 import re
-import unidecode
 import logging
 from warnings import simplefilter
+from normalization import name_keys, team_keys
+from fuzzy_match import DEFAULT_THRESHOLD, match_unmatched
 
 logger = logging.getLogger(__name__)
 pd.set_option('future.no_silent_downcasting', True)
 simplefilter(action="ignore", category=pd.errors.PerformanceWarning)
 
-# Comprehensive team abbreviation mapping (all common aliases to 3-letter codes)
-TEAM_ABBREVIATION_MAP = {
-    # Arizona Diamondbacks
-    "ari": "ari", "az": "ari", "arizona": "ari", "diamondbacks": "ari", "d-backs": "ari", "dbacks": "ari",
-    # Atlanta Braves
-    "atl": "atl", "atlanta": "atl", "braves": "atl",
-    # Baltimore Orioles
-    "bal": "bal", "baltimore": "bal", "orioles": "bal",
-    # Boston Red Sox
-    "bos": "bos", "boston": "bos", "red sox": "bos", "redsox": "bos",
-    # Chicago Cubs
-    "chc": "chc", "cubs": "chc", "chi": "chc",
-    # Chicago White Sox
-    "cws": "cws", "white sox": "cws", "whitesox": "cws",
-    # Cincinnati Reds
-    "cin": "cin", "reds": "cin", "cincinnati": "cin",
-    # Cleveland Guardians
-    "cle": "cle", "cleveland": "cle", "guardians": "cle", "indians": "cle",
-    # Colorado Rockies
-    "col": "col", "rockies": "col", "colorado": "col",
-    # Detroit Tigers
-    "det": "det", "tigers": "det", "detroit": "det",
-    # Houston Astros
-    "hou": "hou", "astros": "hou", "houston": "hou",
-    # Kansas City Royals
-    "kc": "kcr", "kcr": "kcr", "royals": "kcr", "kansas city": "kcr",
-    # Los Angeles Angels
-    "laa": "ana", "ana": "ana", "angels": "ana", "los angeles angels": "ana",
-    # Los Angeles Dodgers
-    "lad": "lad", "dodgers": "lad", "los angeles dodgers": "lad",
-    # Miami Marlins
-    "mia": "mia", "marlins": "mia", "miami": "mia",
-    # Milwaukee Brewers
-    "mil": "mil", "brewers": "mil", "milwaukee": "mil",
-    # Minnesota Twins
-    "min": "min", "twins": "min", "minnesota": "min",
-    # New York Yankees
-    "nyy": "nyy", "yankees": "nyy", "new york yankees": "nyy",
-    # New York Mets
-    "nym": "nym", "mets": "nym", "new york mets": "nym",
-    # Oakland Athletics
-    "oak": "oak", "athletics": "oak", "a's": "oak", "as": "oak", "oakland": "oak",
-    # Philadelphia Phillies
-    "phi": "phi", "phillies": "phi", "philadelphia": "phi",
-    # Pittsburgh Pirates
-    "pit": "pit", "pirates": "pit", "pittsburgh": "pit",
-    # San Diego Padres
-    "sd": "sdg", "sdg": "sdg", "sdp": "sdg", "padres": "sdg", "san diego": "sdg",
-    # Seattle Mariners
-    "sea": "sea", "mariners": "sea", "seattle": "sea",
-    # San Francisco Giants
-    "sf": "sf", "sfg": "sf", "giants": "sf", "san francisco": "sf",
-    # St. Louis Cardinals
-    "stl": "stl", "cards": "stl", "cardinals": "stl", "st. louis": "stl",
-    # Tampa Bay Rays
-    "tbr": "tb", "tb": "tb", "rays": "tb", "tampa bay": "tb",
-    # Texas Rangers
-    "tex": "tex", "rangers": "tex", "texas": "tex",
-    # Toronto Blue Jays
-    "tor": "tor", "blue jays": "tor", "bluejays": "tor", "toronto": "tor",
-    # Washington Nationals
-    "was": "wsh", "wsh": "wsh", "nationals": "wsh", "washington": "wsh"
-}
-
 VALID_POSITIONS = {"C", "1B", "2B", "3B", "SS", "OF", "DH"}
 IGNORE_KEYWORDS = {"DL", "IL"}
 
@@ -133,10 +71,25 @@ def composite_score(row, weights, prefix):
     return score, stats_used
 
 
+def composite_scores(df, weights, prefix):
+    """Vectorized composite_score: one weighted matrix product over the stat block.
+
+    Missing stats contribute nothing to the score and are not counted in stats_used.
+    """
+    cols = [prefix + stat for stat in weights if prefix + stat in df.columns]
+    if not cols:
+        return pd.Series(0.0, index=df.index), pd.Series(0, index=df.index, dtype=int)
+    block = df[cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    present = ~np.isnan(block)
+    w = np.array([weights[col[len(prefix):]] for col in cols], dtype=float)
+    scores = np.where(present, block, 0.0) @ w
+    return pd.Series(scores, index=df.index), pd.Series(present.sum(axis=1), index=df.index)
+
+
 def merge_on_name_team(fa_df, fg_df):
     for df in (fa_df, fg_df):
-        df['clean_name'] = df['name'].apply(lambda x: unidecode.unidecode(str(x)).lower().strip())
-        df['clean_team'] = df['team'].str.lower().map(TEAM_ABBREVIATION_MAP)
+        df['clean_name'] = name_keys(df['name'])
+        df['clean_team'] = team_keys(df['team'])
 
     merged = pd.merge(
         fa_df,
@@ -171,24 +124,101 @@ def merge_with_fallback(fa_df, fg_df, merged):
     if len(fallback) != len(merged):
         # Defensive alignment guard: preserve existing behavior safely.
         fallback = fallback.reindex(merged.index)
-    for col in fallback.columns:
-        if col in merged.columns and isinstance(col, str) and col.endswith("_fg"):
-            merged.loc[unmatched_idx, col] = merged.loc[unmatched_idx, col].combine_first(fallback.loc[unmatched_idx, col])
+    for col in _fg_side_columns(fa_df, unique_fg).values():
+        if col in merged.columns and col in fallback.columns:
+            current = merged.loc[unmatched_idx, col]
+            merged.loc[unmatched_idx, col] = current.where(current.notna(), fallback.loc[unmatched_idx, col])
     return merged
 
 
+def _fg_side_columns(fa_df, fg_df):
+    """Names the FanGraphs columns take in a merged frame (suffixed when they collide with ESPN)."""
+    return {
+        c: (f"{c}_fg" if c in fa_df.columns else c)
+        for c in fg_df.columns
+        if c not in ("clean_name", "clean_team")
+    }
+
+
+def merge_fuzzy(fa_df, fg_df, merged, exclude_ids=(), threshold=DEFAULT_THRESHOLD, report=None):
+    """
+    Fuzzy-match rows still missing a FanGraphs playerid against FanGraphs rows nobody claimed,
+    blocked by team and position class. Rows left over are appended to `report` (a list) if given.
+    """
+    if merged.empty or "playerid" not in merged.columns or "playerid" not in fg_df.columns:
+        return merged
+    unmatched_idx = merged.index[merged["playerid"].isna()]
+    if unmatched_idx.empty:
+        return merged
+
+    used = set(merged["playerid"].dropna().astype(str)) | {str(x) for x in exclude_ids}
+    fg_free = fg_df[~fg_df["playerid"].astype(str).isin(used)]
+    espn = merged.loc[unmatched_idx].rename(columns={"name_fa": "name", "team_fa": "team"})
+    matches, unmatched = match_unmatched(espn, fg_free, threshold)
+    if report is not None and not unmatched.empty:
+        report.append(unmatched)
+    if not matches:
+        return merged
+
+    rows = [m for m, _, _ in matches]
+    fg_rows = [f for _, f, _ in matches]
+    for src, dst in _fg_side_columns(fa_df, fg_df).items():
+        merged.loc[rows, dst] = fg_free.loc[fg_rows, src].to_numpy()
+    logger.info(f"Fuzzy matched {len(matches)} players; {len(unmatched)} remain unmatched.")
+    return merged
+
+
+def merge_on_crosswalk(fa_df, fg_df, crosswalk):
+    """
+    Join ESPN rows whose player_id is in the crosswalk straight to their FanGraphs row
+    by integer position. Returns (joined known rows, remaining ESPN rows).
+    """
+    if not crosswalk or "player_id" not in fa_df.columns or "playerid" not in fg_df.columns:
+        return pd.DataFrame(), fa_df
+
+    fg_ids = fg_df["playerid"].astype(str)
+    unique_rows = np.flatnonzero(~fg_ids.duplicated(keep=False).to_numpy())
+    lookup = pd.Index(fg_ids.to_numpy()[unique_rows])
+    wanted = pd.to_numeric(fa_df["player_id"], errors="coerce").map(crosswalk)
+    found = lookup.get_indexer(wanted)
+    positions = np.where(found >= 0, unique_rows[found] if len(unique_rows) else -1, -1)
+    known_mask = positions >= 0
+    if not known_mask.any():
+        return pd.DataFrame(), fa_df
+
+    fa_known = fa_df[known_mask].reset_index(drop=True)
+    fg_known = fg_df.iloc[positions[known_mask]].reset_index(drop=True)
+    fg_known = fg_known.drop(columns=["clean_name", "clean_team"], errors="ignore")
+    overlap = set(fa_known.columns) & set(fg_known.columns)
+    known = pd.concat(
+        [fa_known.rename(columns={c: f"{c}_fa" for c in overlap}),
+         fg_known.rename(columns={c: f"{c}_fg" for c in overlap})],
+        axis=1,
+    )
+    known["clean_name"] = name_keys(fa_known["name"])
+    known["clean_team"] = team_keys(fa_known["team"])
+    return known, fa_df[~known_mask].copy()
+
+
 def determine_position(row):
     slots = row if isinstance(row, (list, tuple, pd.Series)) else []
     return classify_player(slots)
 
 
-def merge_data(fa_df, fg_df):
+def merge_data(fa_df, fg_df, crosswalk=None, fuzzy_threshold=DEFAULT_THRESHOLD, unmatched_report=None):
     if fa_df.empty or fg_df.empty:
         logger.warning("Merge aborted: one or both datasets are empty.")
         return pd.DataFrame()
 
+    # Players already in the ESPN -> FanGraphs crosswalk skip name matching entirely.
+    known, fa_df = merge_on_crosswalk(fa_df, fg_df, crosswalk)
     fa_df, fg_df, merged = merge_on_name_team(fa_df, fg_df)
     merged = merge_with_fallback(fa_df, fg_df, merged)
+    known_ids = known["playerid"].dropna() if "playerid" in known.columns else ()
+    merged = merge_fuzzy(fa_df, fg_df, merged, known_ids, fuzzy_threshold, unmatched_report)
+    if not known.empty:
+        logger.info(f"Crosswalk matched {len(known)} players; {len(merged)} went through name matching.")
+        merged = pd.concat([known, merged], ignore_index=True)
 
     if "eligible_positions" in merged.columns:
         pos_series = merged["eligible_positions"]
@@ -256,25 +286,15 @@ def rank_free_agents(merged_df):
     pitchers = normalize_stats(pitchers, list(pitcher_weights), "proj_", invert_metrics=invert_pitcher)
     
     # Calculate projected scores and track data completeness
-    hitter_proj_results = hitters.apply(lambda r: composite_score(r, hitter_weights, "proj_"), axis=1)
-    hitters["proj_CompositeScore"] = [result[0] for result in hitter_proj_results]
-    hitters["proj_stats_used"] = [result[1] for result in hitter_proj_results]
-    
-    pitcher_proj_results = pitchers.apply(lambda r: composite_score(r, pitcher_weights, "proj_"), axis=1)
-    pitchers["proj_CompositeScore"] = [result[0] for result in pitcher_proj_results]
-    pitchers["proj_stats_used"] = [result[1] for result in pitcher_proj_results]
+    hitters["proj_CompositeScore"], hitters["proj_stats_used"] = composite_scores(hitters, hitter_weights, "proj_")
+    pitchers["proj_CompositeScore"], pitchers["proj_stats_used"] = composite_scores(pitchers, pitcher_weights, "proj_")
 
     hitters = normalize_stats(hitters, list(hitter_weights), "curr_")
     pitchers = normalize_stats(pitchers, list(pitcher_weights), "curr_", invert_metrics=invert_pitcher)
-    
+
     # Calculate current scores and track data completeness
-    hitter_curr_results = hitters.apply(lambda r: composite_score(r, hitter_weights, "curr_"), axis=1)
-    hitters["curr_CompositeScore"] = [result[0] for result in hitter_curr_results]
-    hitters["curr_stats_used"] = [result[1] for result in hitter_curr_results]
-    
-    pitcher_curr_results = pitchers.apply(lambda r: composite_score(r, pitcher_weights, "curr_"), axis=1)
-    pitchers["curr_CompositeScore"] = [result[0] for result in pitcher_curr_results]
-    pitchers["curr_stats_used"] = [result[1] for result in pitcher_curr_results]
+    hitters["curr_CompositeScore"], hitters["curr_stats_used"] = composite_scores(hitters, hitter_weights, "curr_")
+    pitchers["curr_CompositeScore"], pitchers["curr_stats_used"] = composite_scores(pitchers, pitcher_weights, "curr_")
 
     df = pd.concat([hitters, pitchers], ignore_index=True)
 
@@ -296,37 +316,32 @@ def rank_free_agents(merged_df):
 
     # Collapse duplicate rows (same normalized name + team) caused by source mismatches.
     # Keep the row with the strongest projection completeness/value profile.
-    df["_name_key"] = df["Name"].apply(lambda x: unidecode.unidecode(str(x)).lower().strip())
-    df["_team_key"] = df["Team"].astype(str).str.lower().map(TEAM_ABBREVIATION_MAP).fillna(df["Team"].astype(str).str.lower())
+    df["_name_key"] = name_keys(df["Name"])
+    df["_team_key"] = team_keys(df["Team"].astype(str), keep_unmapped=True)
     adp_vals = pd.to_numeric(df.get("proj_ADP"), errors="coerce")
     df["_adp_sort"] = adp_vals.where(adp_vals > 0, 9999.0)
+    # One stable sort serves both dedup passes: best profile first, name/team breaks ties.
     df = df.sort_values(
-        by=["_name_key", "_team_key", "proj_stats_used", "proj_CompositeScore", "_adp_sort"],
-        ascending=[True, True, False, False, True],
+        by=["proj_stats_used", "proj_CompositeScore", "_adp_sort", "_name_key", "_team_key"],
+        ascending=[False, False, True, True, True],
         na_position="last",
+        kind="stable",
     )
     df = df.drop_duplicates(subset=["_name_key", "_team_key"], keep="first")
     if "player_id" in df.columns:
         pid = pd.to_numeric(df["player_id"], errors="coerce").fillna(0)
         has_pid = pid > 0
-        with_pid = df[has_pid].copy()
-        no_pid = df[~has_pid].copy()
-        if not with_pid.empty:
-            with_pid = with_pid.sort_values(
-                by=["player_id", "proj_stats_used", "proj_CompositeScore", "_adp_sort"],
-                ascending=[True, False, False, True],
-                na_position="last",
-            ).drop_duplicates(subset=["player_id"], keep="first")
-            # If we have an ESPN player_id-backed row, drop name-only ghosts for that same name.
-            name_keys_with_pid = set(with_pid["_name_key"].astype(str))
-            no_pid = no_pid[~no_pid["_name_key"].astype(str).isin(name_keys_with_pid)]
-        df = pd.concat([with_pid, no_pid], ignore_index=True)
+        dup_pid = has_pid & pid.duplicated(keep="first")
+        # If we have an ESPN player_id-backed row, drop name-only ghosts for that same name.
+        ghost = ~has_pid & df["_name_key"].isin(set(df.loc[has_pid & ~dup_pid, "_name_key"]))
+        df = df[~(dup_pid | ghost)]
+    df = df.reset_index(drop=True)
     df = df.drop(columns=["_name_key", "_team_key", "_adp_sort"], errors="ignore")
     
     # Add normalized value scores for better cross-position comparison
     df = add_normalized_value_scores(df)
     
-    return df.sort_values(by="proj_CompositeScore", ascending=False)
+    return df.sort_values(by="proj_CompositeScore", ascending=False, kind="stable")
 
 
 def add_normalized_value_scores(df):
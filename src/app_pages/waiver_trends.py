@@ -11,7 +11,8 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from config import COLORS, POSITIONS
-from data_utils import can_play_position
+from data_utils import can_play_position, load_player_history, load_score_trends, load_snapshot_changes
+from history import player_keys
 
 def show_waiver_trends(fa_df):
     """Show trending players and hot pickups"""
@@ -98,6 +99,9 @@ def show_waiver_trends(fa_df):
     else:
         st.info("No players are currently underperforming their projections.")
     
+    show_recent_changes(fa_df)
+    show_score_trends(fa_df)
+    
     # Performance distribution chart
     st.markdown("### Performance Distribution")
     
@@ -197,4 +201,92 @@ def show_waiver_trends(fa_df):
                             {pos_data['Count']} players
                         </div>
                     </div>
-                    """, unsafe_allow_html=True)
\ No newline at end of file
+                    """, unsafe_allow_html=True)
+
+def show_recent_changes(fa_df):
+    """Free agents that were just dropped or jumped in the rankings since the previous update"""
+    since, changes = load_snapshot_changes()
+    if changes.empty:
+        return
+    
+    st.markdown("### Since Last Update")
+    st.markdown(f"*Compared with the {since[4:6]}/{since[6:8]} {since[9:11]}:{since[11:13]} snapshot*")
+    
+    free_agents = changes[changes["fantasy_team"].eq("Free Agent") & changes["Name"].isin(fa_df["Name"])]
+    kinds = free_agents["change"].fillna("")
+    dropped = free_agents[kinds.str.contains("dropped")].sort_values("curr_CompositeScore", ascending=False)
+    risers = free_agents[free_agents["rank_change"] > 0].sort_values("rank_change", ascending=False)
+    
+    cols = st.columns(2)
+    with cols[0]:
+        st.markdown("**Newly Available**")
+        if dropped.empty:
+            st.caption("No players were dropped.")
+        else:
+            st.dataframe(
+                dropped[["Name", "Team", "prev_fantasy_team", "curr_CompositeScore"]].head(8).rename(columns={
+                    "prev_fantasy_team": "Dropped By", "curr_CompositeScore": "Current"
+                }).round(2),
+                hide_index=True,
+                use_container_width=True
+            )
+    with cols[1]:
+        st.markdown("**Biggest Rank Jumps**")
+        if risers.empty:
+            st.caption("No free agents moved up.")
+        else:
+            st.dataframe(
+                risers[["Name", "Team", "prev_rank", "rank", "rank_change"]].head(8).rename(columns={
+                    "prev_rank": "Was", "rank": "Now", "rank_change": "Moved"
+                }).astype({"Was": "Int64", "Now": "Int64", "Moved": "Int64"}),
+                hide_index=True,
+                use_container_width=True
+            )
+
+def show_score_trends(fa_df):
+    """Free agents whose current score moved most over the last three weeks of refreshes"""
+    st.markdown("### Score Trends (Last 3 Weeks)")
+    st.markdown("*Change in current score across refreshes, from the snapshot history*")
+    
+    trends = load_score_trends(days=21)
+    if trends.empty:
+        st.info("No snapshot history yet. Trends appear after a few data updates.")
+        return
+    
+    keyed = fa_df.assign(key=player_keys(fa_df).to_numpy())
+    movers = keyed.merge(trends[["key", "curr_CompositeScore_change", "changes"]], on="key")
+    movers = movers.dropna(subset=["curr_CompositeScore_change"])
+    movers = movers[movers["curr_CompositeScore_change"] != 0]
+    if movers.empty:
+        st.info("No free agent scores have changed in the last three weeks.")
+        return
+    
+    cols = st.columns(2)
+    for col, title, ascending in ((cols[0], "Rising", False), (cols[1], "Falling", True)):
+        with col:
+            st.markdown(f"**{title}**")
+            top = movers.sort_values("curr_CompositeScore_change", ascending=ascending).head(8)
+            st.dataframe(
+                top[["display_name", "Team", "curr_CompositeScore", "curr_CompositeScore_change"]].rename(columns={
+                    "display_name": "Player", "curr_CompositeScore": "Current", "curr_CompositeScore_change": "3-Week Change"
+                }).round(2),
+                hide_index=True,
+                use_container_width=True
+            )
+    
+    options = movers.sort_values("curr_CompositeScore_change", key=abs, ascending=False)
+    selected = st.selectbox("Player history", options["display_name"].tolist())
+    history = load_player_history(options[options["display_name"] == selected].iloc[0])
+    if len(history) > 1:
+        fig = px.line(
+            history,
+            x="as_of",
+            y=["curr_CompositeScore", "proj_CompositeScore"],
+            markers=True,
+            title=f"{selected}: Score History",
+            labels={"as_of": "Refresh", "value": "Composite Score", "variable": "Score"},
+            color_discrete_sequence=[COLORS["primary"], COLORS["muted"]]
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.caption("Only one stored snapshot for this player so far.")
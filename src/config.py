@@ -56,4 +56,33 @@ POSITION_VARIATIONS = {
     "THIRD": "3B",
     "SHORT": "SS",
     "CATCHER": "C"
-}
\ No newline at end of file
+}
+
+# =============================================================================
+# FanGraphs Projection Models
+# =============================================================================
+PROJECTION_MODELS = {
+    "steamer":     {"label": "Steamer",       "ros": "steamerr",       "full": "steamer"},
+    "zips":        {"label": "ZiPS",          "ros": "zipss",          "full": "zips"},
+    "thebat":      {"label": "THE BAT",       "ros": "thebat",         "full": "thebat"},
+    "thebatx":     {"label": "THE BAT X",     "ros": "thebatx",        "full": "thebatx"},
+    "atc":         {"label": "ATC",           "ros": "atc",            "full": "atc"},
+    "fangraphsdc": {"label": "Depth Charts",  "ros": "fangraphsdcros", "full": "fangraphsdc"},
+}
+
+# =============================================================================
+# Hosted Leagues
+# =============================================================================
+def configured_leagues():
+    """
+    Leagues hosted by one install, as {league_id: label}, from the LEAGUES env var
+    ("id" or "id:label", comma-separated). Empty when LEAGUES is unset, in which case
+    the single LEAGUE_ID league keeps its files directly in output/.
+    """
+    import os
+    leagues = {}
+    for entry in os.getenv("LEAGUES", "").split(","):
+        league_id, _, label = (part.strip() for part in entry.partition(":"))
+        if league_id:
+            leagues[league_id] = label or f"League {league_id}"
+    return leagues
@@ -0,0 +1,61 @@
+"""
+Persistent ESPN player_id -> FanGraphs playerid crosswalk.
+
+Learned from successful name/team matches during a refresh and reused on later
+runs, so known players are joined by id and only new or unmatched players go
+through the name-matching path in analysis.merge_data.
+"""
+import logging
+import os
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CROSSWALK_FILENAME = "player_crosswalk.csv"
+
+
+def crosswalk_path(output_dir: str = "output") -> str:
+    return os.path.join(output_dir, CROSSWALK_FILENAME)
+
+
+def load_crosswalk(output_dir: str = "output") -> dict[int, str]:
+    """Load {espn_player_id: fangraphs_playerid}; empty when no crosswalk exists yet."""
+    path = crosswalk_path(output_dir)
+    if not os.path.exists(path):
+        return {}
+    try:
+        df = pd.read_csv(path, dtype={"espn_player_id": "int64", "fangraphs_playerid": str})
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable crosswalk {path}: {e}")
+        return {}
+    return dict(zip(df["espn_player_id"].astype(int), df["fangraphs_playerid"].astype(str)))
+
+
+def save_crosswalk(crosswalk: dict[int, str], output_dir: str = "output") -> None:
+    os.makedirs(output_dir, exist_ok=True)
+    df = pd.DataFrame(sorted(crosswalk.items()), columns=["espn_player_id", "fangraphs_playerid"])
+    df.to_csv(crosswalk_path(output_dir), index=False)
+
+
+def learn_matches(crosswalk: dict[int, str], merged: pd.DataFrame) -> int:
+    """
+    Record ESPN -> FanGraphs id pairs from a merged frame.
+    A FanGraphs id claimed by more than one ESPN id in the same frame is ambiguous and skipped.
+    Returns the number of new or changed entries.
+    """
+    if merged.empty or "player_id" not in merged.columns or "playerid" not in merged.columns:
+        return 0
+    pairs = pd.DataFrame({
+        "espn": pd.to_numeric(merged["player_id"], errors="coerce"),
+        "fg": merged["playerid"],
+    }).dropna()
+    pairs = pairs[pairs["espn"] > 0].drop_duplicates()
+    pairs = pairs[~pairs["fg"].duplicated(keep=False) & ~pairs["espn"].duplicated(keep=False)]
+
+    changed = 0
+    for espn_id, fg_id in zip(pairs["espn"].astype(int), pairs["fg"].astype(str)):
+        if crosswalk.get(espn_id) != fg_id:
+            crosswalk[espn_id] = fg_id
+            changed += 1
+    return changed
@@ -6,9 +6,7 @@ import os
 import glob
 import pandas as pd
 import streamlit as st
-import subprocess
-import sys
-from config import PITCHER_ROLES, HITTER_ROLES, POSITION_VARIATIONS
+from player_utils import expand_positions, can_play_position, format_player_name
 
 def get_newest_csv(folder="./output", pattern="free_agents_ranked_*.csv"):
     """Get the most recent CSV file"""
@@ -18,48 +16,6 @@ def get_newest_csv(folder="./output", pattern="free_agents_ranked_*.csv"):
     files = glob.glob(os.path.join(folder_path, pattern))
     return max(files, key=os.path.getmtime) if files else None
 
-def expand_positions(pos_str):
-    """Convert position string to list of positions"""
-    if not isinstance(pos_str, str) or pos_str.strip() == "":
-        return []
-    
-    # Clean up the position string
-    pos_str = pos_str.upper().replace("\n", " ").replace("/", " ").replace(",", " ")
-    positions = [p.strip() for p in pos_str.split() if p.strip()]
-    
-    normalized = set()
-    
-    for pos in positions:
-        pos = pos.strip()
-        if pos in PITCHER_ROLES:
-            normalized.add("P")
-        elif pos in HITTER_ROLES:
-            normalized.add(pos)
-        elif pos in POSITION_VARIATIONS:
-            normalized.add(POSITION_VARIATIONS[pos])
-    
-    return list(normalized)
-
-def can_play_position(player_positions, target_position):
-    """Check if player can play target position"""
-    if not isinstance(player_positions, list):
-        return False
-    return target_position in player_positions
-
-def format_player_name(row):
-    """Format player name with injury status"""
-    name = row.get("Name", "Unknown")
-    injury = row.get("injury_status", "")
-    
-    # Handle NaN values and convert to string
-    if pd.isna(injury) or injury == "":
-        return name
-    
-    injury_str = str(injury).strip()
-    if injury_str and injury_str.upper() not in ["ACTIVE", "HEALTHY", ""]:
-        return f"{name} ({injury_str})"
-    return name
-
 def get_player_stats(df, is_pitcher=False):
     """Get relevant stats for display"""
     base_cols = ["Name", "Team", "fantasy_team", "position"]
@@ -80,24 +36,24 @@ def get_player_stats(df, is_pitcher=False):
     available_cols = [col for col in base_cols + stat_cols if col in df.columns]
     return df[available_cols].round(3)
 
+def refresh_data():
+    """Run the refresh pipeline in this process and report the outcome"""
+    from pipeline import run_refresh
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with st.spinner("Updating data..."):
+        result = run_refresh(output_dir=os.path.join(project_root, "output"))
+    if result["status"] == "ok":
+        st.success("Data updated successfully")
+        st.rerun()
+    else:
+        st.error("Update failed")
+        st.code(result["error"] or "No data returned from ESPN/FanGraphs")
+
 def run_data_update():
-    """Run the main.py script to update data"""
+    """Refresh data from ESPN and FanGraphs"""
     if st.button("Update Data", help="Fetch latest data from ESPN and FanGraphs"):
-        with st.spinner("Updating data..."):
-            try:
-                result = subprocess.run(
-                    [sys.executable, "./src/main.py"],
-                    check=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    cwd="."
-                )
-                st.success("Data updated successfully")
-                st.rerun()
-            except subprocess.CalledProcessError as e:
-                st.error("Update failed")
-                st.code(e.stderr or "No error output")
+        refresh_data()
 
 def load_data():
     """Load and process the data - cache based on file modification time"""
@@ -128,4 +84,50 @@ def _load_data_cached(csv_path, file_mtime):
     # Filter out players with no valid positions for most operations
     df["has_valid_position"] = df["norm_positions"].apply(lambda x: len(x) > 0)
     
-    return df, csv_path
\ No newline at end of file
+    return df, csv_path
+
+def history_model():
+    """Projection model whose history matches the CSV the app loads"""
+    return os.getenv("PROJECTION_MODEL", "steamer").strip("'\"")
+
+def load_score_trends(days=21):
+    """Per-player score changes over the last `days` from output/history - cache based on last append"""
+    from history import LATEST_FILENAME, history_dir
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output_dir = os.path.join(project_root, "output")
+    latest = os.path.join(history_dir(output_dir, history_model()), LATEST_FILENAME)
+    if not os.path.exists(latest):
+        return pd.DataFrame()
+    return _load_score_trends_cached(output_dir, history_model(), days, os.path.getmtime(latest))
+
+@st.cache_data
+def _load_score_trends_cached(output_dir, model, days, latest_mtime):
+    """Internal cached function keyed on the history's latest.parquet modification time"""
+    from history import score_trends
+    return score_trends(output_dir, model, days=days)
+
+def load_player_history(row):
+    """Every stored version of one player, oldest first"""
+    from history import player_history, player_key
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return player_history(os.path.join(project_root, "output"), history_model(), player_key(row))
+
+def load_snapshot_changes():
+    """Changes between the two newest ranked snapshots of the app's projection model"""
+    from snapshot_diff import list_snapshots
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    model_dir = os.path.join(project_root, "output", "models", history_model())
+    snapshots = list_snapshots(model_dir)
+    if len(snapshots) < 2:
+        return None, pd.DataFrame()
+    return _load_snapshot_changes_cached(model_dir, os.path.basename(snapshots[-1]))
+
+@st.cache_data
+def _load_snapshot_changes_cached(model_dir, latest_name):
+    """Internal cached function keyed on the newest snapshot's file name"""
+    from snapshot_diff import load_changes
+    since, _, changes = load_changes(model_dir)
+    return since, changes
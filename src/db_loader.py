@@ -1,656 +1,925 @@
+import argparse
+import datetime
+import hashlib
+import html
+import itertools
 import json
+import os
+import pickle
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
 import requests
-import pyodbc
 from bs4 import BeautifulSoup
 
-def get_fangraphs_data(api_url):
+import warehouse
+
+# Rows per executemany call in the bulk path.
+BATCH_SIZE = 1000
+# SQL Server allows at most 2100 parameters per statement.
+_LOOKUP_CHUNK = 1000
+# A fact row's key: one stat line per player, team and season.
+FACT_KEY = ("PlayerID", "TeamID", "SeasonID")
+# A lone link with text only, e.g. <a href="statss.aspx?playerid=1">Name</a>.
+_SIMPLE_LINK = re.compile(r"\s*<a\b[^<>]*>([^<>]*)</a>\s*", re.IGNORECASE)
+# FanGraphs season leaderboard (type=8) for one stat group ("bat" or "pit") and season.
+LEADERBOARD_URL = (
+    "https://www.fangraphs.com/api/leaders/major-league/data?age=&pos=all&stats={stats}&lg=all&qual=0"
+    "&season={season}&season1={season}&startdate={season}-03-01&enddate={season}-11-01&month=0&hand=&team=0"
+    "&pageitems=2000000000&pagenum=1&ind=0&rost=0&players=&type=8&postseason=&sortdir=default&sortstat=WAR"
+)
+# Backfill progress on SQL Server, one entry per finished (season, stat group). A SQLite
+# warehouse keeps its checkpoint next to the database file.
+DEFAULT_CHECKPOINT = Path(__file__).resolve().parent.parent / "output" / "db_loader_checkpoint.json"
+
+# FactSeasonStatsBatting column -> FanGraphs leaderboard (type=8) field.
+BATTING_STAT_MAPPING = {
+    "Age": "Age",
+    "AgeRange": "AgeR",
+    "SeasonMin": "SeasonMin",
+    "SeasonMax": "SeasonMax",
+    "Games": "G",
+    "AtBats": "AB",
+    "PlateAppearances": "PA",
+    "Hits": "H",
+    "Singles": "1B",
+    "Doubles": "2B",
+    "Triples": "3B",
+    "HomeRuns": "HR",
+    "Runs": "R",
+    "RBI": "RBI",
+    "BaseOnBalls": "BB",
+    "IntentionalWalks": "IBB",
+    "StrikeOuts": "SO",
+    "HitByPitch": "HBP",
+    "SacrificeFlies": "SF",
+    "SacrificeHits": "SH",
+    "GroundedIntoDoublePlay": "GDP",
+    "StolenBases": "SB",
+    "CaughtStealing": "CS",
+    "BattingAverage": "AVG",
+    "GroundBalls": "GB",
+    "FlyBalls": "FB",
+    "LineDrives": "LD",
+    "InfieldFlyBalls": "IFFB",
+    "Pitches": "Pitches",
+    "Balls": "Balls",
+    "Strikes": "Strikes",
+    "IFH": "IFH",
+    "BU": "BU",
+    "BUH": "BUH",
+    "BBPercent": "BB%",
+    "KPercent": "K%",
+    "BBPerK": "BB/K",
+    "OnBasePercentage": "OBP",
+    "SluggingPercentage": "SLG",
+    "OPS": "OPS",
+    "ISO": "ISO",
+    "BABIP": "BABIP",
+    "GB_FB_Ratio": "GB/FB",
+    "LDPercent": "LD%",
+    "GBPercent": "GB%",
+    "FBPercent": "FB%",
+    "IFFBPercent": "IFFB%",
+    "HR_FB_Ratio": "HR/FB",
+    "IFHPercent": "IFH%",
+    "BUHPercent": "BUH%",
+    "TTOPercent": "TTO%",
+    "wOBA": "wOBA",
+    "wRAA": "wRAA",
+    "wRC": "wRC",
+    "BattingValue": "Batting",
+    "Fielding": "Fielding",
+    "Replacement": "Replacement",
+    "Positional": "Positional",
+    "wLeague": "wLeague",
+    "CFraming": "CFraming",
+    "Defense": "Defense",
+    "Offense": "Offense",
+    "RAR": "RAR",
+    "WAR": "WAR",
+    "WAROld": "WAROld",
+    "Dollars": "Dollars",
+    "BaseRunning": "BaseRunning",
+    "Spd": "Spd",
+    "wRCPlus": "wRC+",
+    "wBsR": "wBsR",
+    "WPA": "WPA",
+    "WPA_Negative": "-WPA",
+    "WPA_Positive": "+WPA",
+    "RE24": "RE24",
+    "REW": "REW",
+    "pLI": "pLI",
+    "phLI": "phLI",
+    "PH": "PH",
+    "WPA_per_LI": "WPA/LI",
+    "Clutch": "Clutch",
+    "FBPercent1": "FB%1",
+    "FBv": "FBv",
+    "SLPercent": "SL%",
+    "SLv": "SLv",
+    "CTPercent": "CT%",
+    "CTv": "CTv",
+    "CBPercent": "CB%",
+    "CBv": "CBv",
+    "CHPercent": "CH%",
+    "CHv": "CHv",
+    "SFPercent": "SF%",
+    "SFv": "SFv",
+    "KNPercent": "KN%",
+    "KNv": "KNv",
+    "XXPercent": "XX%",
+    "POPercent": "PO%",
+    "wFB": "wFB",
+    "wSL": "wSL",
+    "wCT": "wCT",
+    "wCB": "wCB",
+    "wCH": "wCH",
+    "wSF": "wSF",
+    "wKN": "wKN",
+    "wFB_PerC": "wFB/C",
+    "wSL_PerC": "wSL/C",
+    "wCT_PerC": "wCT/C",
+    "wCB_PerC": "wCB/C",
+    "wCH_PerC": "wCH/C",
+    "wSF_PerC": "wSF/C",
+    "wKN_PerC": "wKN/C",
+    "OSwingPercent": "O-Swing%",
+    "ZSwingPercent": "Z-Swing%",
+    "SwingPercent": "Swing%",
+    "OContactPercent": "O-Contact%",
+    "ZContactPercent": "Z-Contact%",
+    "ContactPercent": "Contact%",
+    "ZonePercent": "Zone%",
+    "FStrikePercent": "F-Strike%",
+    "SwStrPercent": "SwStr%",
+    "CStrPercent": "CStr%",
+    "CPlusSwStrPercent": "C+SwStr%"
+}
+
+# FactSeasonStatsPitching column -> FanGraphs leaderboard (type=8) field.
+PITCHING_STAT_MAPPING = {
+    "Throws": "Throws",
+    "xMLBAMID": "xMLBAMID",
+    "Age": "Age",
+    "AgeRange": "AgeR",
+    "SeasonMin": "SeasonMin",
+    "SeasonMax": "SeasonMax",
+    "W": "W",
+    "L": "L",
+    "ERA": "ERA",
+    "G": "G",
+    "GS": "GS",
+    "QS": "QS",
+    "CG": "CG",
+    "ShO": "ShO",
+    "SV": "SV",
+    "BS": "BS",
+    "IP": "IP",
+    "TBF": "TBF",
+    "H": "H",
+    "R": "R",
+    "ER": "ER",
+    "HR": "HR",
+    "BB": "BB",
+    "IBB": "IBB",
+    "HBP": "HBP",
+    "WP": "WP",
+    "BK": "BK",
+    "SO": "SO",
+    "GB": "GB",
+    "FB": "FB",
+    "LD": "LD",
+    "IFFB": "IFFB",
+    "Pitches": "Pitches",
+    "Balls": "Balls",
+    "Strikes": "Strikes",
+    "RS": "RS",
+    "IFH": "IFH",
+    "BU": "BU",
+    "BUH": "BUH",
+    "KPer9": "K/9",
+    "BBPer9": "BB/9",
+    "K_BB": "K/BB",
+    "HPer9": "H/9",
+    "HRPer9": "HR/9",
+    "AVG": "AVG",
+    "WHIP": "WHIP",
+    "BABIP": "BABIP",
+    "LOBPercent": "LOB%",
+    "FIP": "FIP",
+    "GB_FB": "GB/FB",
+    "LDPercent": "LD%",
+    "GBPercent": "GB%",
+    "FBPercent": "FB%",
+    "IFFBPercent": "IFFB%",
+    "HR_FB": "HR/FB",
+    "IFHPercent": "IFH%",
+    "BUHPercent": "BUH%",
+    "TTOPercent": "TTO%",
+    "CFraming": "CFraming",
+    "Starting": "Starting",
+    "Start_IP": "Start-IP",
+    "Relieving": "Relieving",
+    "Relief_IP": "Relief-IP",
+    "RAR": "RAR",
+    "WAR": "WAR",
+    "Dollars": "Dollars",
+    "RA9_Wins": "RA9-Wins",
+    "LOB_Wins": "LOB-Wins",
+    "BIP_Wins": "BIP-Wins",
+    "BS_Wins": "BS-Wins",
+    "tERA": "tERA",
+    "xFIP": "xFIP",
+    "WPA": "WPA",
+    "Negative_WPA": "-WPA",
+    "Positive_WPA": "+WPA",
+    "RE24": "RE24",
+    "REW": "REW",
+    "pLI": "pLI",
+    "inLI": "inLI",
+    "gmLI": "gmLI",
+    "exLI": "exLI",
+    "Pulls": "Pulls",
+    "Games": "Games",
+    "WPA_LI": "WPA/LI",
+    "Clutch": "Clutch",
+    "FBPercent1": "FB%1",
+    "FBv": "FBv",
+    "SLPercent": "SL%",
+    "SLv": "SLv",
+    "CTPercent": "CT%",
+    "CTv": "CTv",
+    "CBPercent": "CB%",
+    "CBv": "CBv",
+    "CHPercent": "CH%",
+    "CHv": "CHv",
+    "SFPercent": "SF%",
+    "SFv": "SFv",
+    "KNPercent": "KN%",
+    "KNv": "KNv",
+    "XXPercent": "XX%",
+    "POPercent": "PO%",
+    "wFB": "wFB",
+    "wSL": "wSL",
+    "wCT": "wCT",
+    "wCB": "wCB",
+    "wCH": "wCH",
+    "wSF": "wSF",
+    "wKN": "wKN",
+    "wFB_PerC": "wFB/C",
+    "wSL_PerC": "wSL/C",
+    "wCT_PerC": "wCT/C",
+    "wCB_PerC": "wCB/C",
+    "wCH_PerC": "wCH/C",
+    "wSF_PerC": "wSF/C",
+    "wKN_PerC": "wKN/C",
+    "O_SwingPercent": "O-Swing%",
+    "Z_SwingPercent": "Z-Swing%",
+    "SwingPercent": "Swing%",
+    "O_ContactPercent": "O-Contact%",
+    "Z_ContactPercent": "Z-Contact%",
+    "ContactPercent": "Contact%",
+    "ZonePercent": "Zone%",
+    "F_StrikePercent": "F-Strike%",
+    "SwStrPercent": "SwStr%",
+    "CStrPercent": "CStr%",
+    "CPlusSwStrPercent": "C+SwStr%",
+    "Pull": "Pull",
+    "Cent": "Cent",
+    "Oppo": "Oppo",
+    "Soft": "Soft",
+    "Med": "Med",
+    "Hard": "Hard",
+    "bipCount": "bipCount",
+    "PullPercent": "Pull%",
+    "CentPercent": "Cent%",
+    "OppoPercent": "Oppo%",
+    "SoftPercent": "Soft%",
+    "MedPercent": "Med%",
+    "HardPercent": "Hard%",
+    "KPer9_Plus": "K/9+",
+    "BBPer9_Plus": "BB/9+",
+    "K_BB_Plus": "K/BB+",
+    "HPer9_Plus": "H/9+",
+    "HRPer9_Plus": "HR/9+",
+    "AVG_Plus": "AVG+",
+    "WHIP_Plus": "WHIP+",
+    "BABIP_Plus": "BABIP+",
+    "LOBPercent_Plus": "LOB%+",
+    "KPercent_Plus": "K%+",
+    "BBPercent_Plus": "BB%+",
+    "LDPercent_Plus": "LD+",
+    "GBPercent_Plus": "GB+",
+    "FBPercent_Plus": "FB+",
+    "HRFBPercent_Plus": "HRFB+",
+    "PullPercent_Plus": "Pull%+",
+    "CentPercent_Plus": "Cent%+",
+    "OppoPercent_Plus": "Oppo%+",
+    "SoftPercent_Plus": "Soft%+",
+    "MedPercent_Plus": "Med%+",
+    "HardPercent_Plus": "Hard%+",
+    "xwOBA": "xwOBA",
+    "xAVG": "xAVG",
+    "xSLG": "xSLG",
+    "XBR": "XBR",
+    "PPTV": "PPTV",
+    "CPTV": "CPTV",
+    "BPTV": "BPTV",
+    "DSV": "DSV",
+    "DGV": "DGV",
+    "BTV": "BTV",
+    "rPPTV": "rPPTV",
+    "rCPTV": "rCPTV",
+    "rBPTV": "rBPTV",
+    "rDSV": "rDSV",
+    "rDGV": "rDGV",
+    "rBTV": "rBTV",
+    "EBV": "EBV",
+    "ESV": "ESV",
+    "rFTeamV": "rFTeamV",
+    "rBTeamV": "rBTeamV",
+    "rTV": "rTV",
+    "pfxFA_Percent": "pfxFA%",
+    "pfxFT_Percent": "pfxFT%",
+    "pfxFC_Percent": "pfxFC%",
+    "pfxFS_Percent": "pfxFS%",
+    "pfxFO_Percent": "pfxFO%",
+    "pfxSI_Percent": "pfxSI%",
+    "pfxSL_Percent": "pfxSL%",
+    "pfxCU_Percent": "pfxCU%",
+    "pfxKC_Percent": "pfxKC%",
+    "pfxEP_Percent": "pfxEP%",
+    "pfxCH_Percent": "pfxCH%",
+    "pfxSC_Percent": "pfxSC%",
+    "pfxKN_Percent": "pfxKN%",
+    "pfxUN_Percent": "pfxUN%",
+    "pfxvFA": "pfxvFA",
+    "pfxvFT": "pfxvFT",
+    "pfxvFC": "pfxvFC",
+    "pfxvFS": "pfxvFS",
+    "pfxvFO": "pfxvFO",
+    "pfxvSI": "pfxvSI",
+    "pfxvSL": "pfxvSL",
+    "pfxvCU": "pfxvCU",
+    "pfxvKC": "pfxvKC",
+    "pfxvEP": "pfxvEP",
+    "pfxvCH": "pfxvCH",
+    "pfxvSC": "pfxvSC",
+    "pfxvKN": "pfxvKN",
+    "pfxFA_X": "pfxFA-X",
+    "pfxFT_X": "pfxFT-X",
+    "pfxFC_X": "pfxFC-X",
+    "pfxFS_X": "pfxFS-X",
+    "pfxFO_X": "pfxFO-X",
+    "pfxSI_X": "pfxSI-X",
+    "pfxSL_X": "pfxSL-X",
+    "pfxCU_X": "pfxCU-X",
+    "pfxKC_X": "pfxKC-X",
+    "pfxEP_X": "pfxEP-X",
+    "pfxCH_X": "pfxCH-X",
+    "pfxSC_X": "pfxSC-X",
+    "pfxKN_X": "pfxKN-X",
+    "pfxFA_Z": "pfxFA-Z",
+    "pfxFT_Z": "pfxFT-Z",
+    "pfxFC_Z": "pfxFC-Z",
+    "pfxFS_Z": "pfxFS-Z",
+    "pfxFO_Z": "pfxFO-Z",
+    "pfxSI_Z": "pfxSI-Z",
+    "pfxSL_Z": "pfxSL-Z",
+    "pfxCU_Z": "pfxCU-Z",
+    "pfxKC_Z": "pfxKC-Z",
+    "pfxEP_Z": "pfxEP-Z",
+    "pfxCH_Z": "pfxCH-Z",
+    "pfxSC_Z": "pfxSC-Z",
+    "pfxKN_Z": "pfxKN-Z",
+    "pfxwFA": "pfxwFA",
+    "pfxwFT": "pfxwFT",
+    "pfxwFC": "pfxwFC",
+    "pfxwFS": "pfxwFS",
+    "pfxwFO": "pfxwFO",
+    "pfxwSI": "pfxwSI",
+    "pfxwSL": "pfxwSL",
+    "pfxwCU": "pfxwCU",
+    "pfxwKC": "pfxwKC",
+    "pfxwEP": "pfxwEP",
+    "pfxwCH": "pfxwCH",
+    "pfxwSC": "pfxwSC",
+    "pfxwKN": "pfxwKN",
+    "pfxwFA_PerC": "pfxwFA/C",
+    "pfxwFT_PerC": "pfxwFT/C",
+    "pfxwFC_PerC": "pfxwFC/C",
+    "pfxwFS_PerC": "pfxwFS/C",
+    "pfxwFO_PerC": "pfxwFO/C",
+    "pfxwSI_PerC": "pfxwSI/C",
+    "pfxwSL_PerC": "pfxwSL/C",
+    "pfxwCU_PerC": "pfxwCU/C",
+    "pfxwKC_PerC": "pfxwKC/C",
+    "pfxwEP_PerC": "pfxwEP/C",
+    "pfxwCH_PerC": "pfxwCH/C",
+    "pfxwSC_PerC": "pfxwSC/C",
+    "pfxwKN_PerC": "pfxwKN/C",
+    "pfxO_SwingPercent": "pfxO-Swing%",
+    "pfxZ_SwingPercent": "pfxZ-Swing%",
+    "pfxSwingPercent": "pfxSwing%",
+    "pfxO_ContactPercent": "pfxO-Contact%",
+    "pfxZ_ContactPercent": "pfxZ-Contact%",
+    "pfxContactPercent": "pfxContact%",
+    "pfxZonePercent": "pfxZone%",
+    "pfxPace": "pfxPace",
+    "piCH_Percent": "piCH%",
+    "piCS_Percent": "piCS%",
+    "piCU_Percent": "piCU%",
+    "piFA_Percent": "piFA%",
+    "piFC_Percent": "piFC%",
+    "piFS_Percent": "piFS%",
+    "piKN_Percent": "piKN%",
+    "piSB_Percent": "piSB%",
+    "piSI_Percent": "piSI%",
+    "piSL_Percent": "piSL%",
+    "piXX_Percent": "piXX%",
+    "pivCH": "pivCH",
+    "pivCS": "pivCS",
+    "pivCU": "pivCU",
+    "pivFA": "pivFA",
+    "pivFC": "pivFC",
+    "pivFS": "pivFS",
+    "pivKN": "pivKN",
+    "pivSB": "pivSB",
+    "pivSI": "pivSI",
+    "pivSL": "pivSL",
+    "pivXX": "pivXX",
+    "piCH_X": "piCH-X",
+    "piCS_X": "piCS-X",
+    "piCU_X": "piCU-X",
+    "piFA_X": "piFA-X",
+    "piFC_X": "piFC-X",
+    "piFS_X": "piFS-X",
+    "piKN_X": "piKN-X",
+    "piSB_X": "piSB-X",
+    "piSI_X": "piSI-X",
+    "piSL_X": "piSL-X",
+    "piXX_X": "piXX-X",
+    "piCH_Z": "piCH-Z",
+    "piCS_Z": "piCS-Z",
+    "piCU_Z": "piCU-Z",
+    "piFA_Z": "piFA-Z",
+    "piFC_Z": "piFC-Z",
+    "piFS_Z": "piFS-Z",
+    "piKN_Z": "piKN-Z",
+    "piSB_Z": "piSB-Z",
+    "piSI_Z": "piSI-Z",
+    "piSL_Z": "piSL-Z",
+    "piXX_Z": "piXX-Z",
+    "piwCH": "piwCH",
+    "piwCS": "piwCS",
+    "piwCU": "piwCU",
+    "piwFA": "piwFA",
+    "piwFC": "piwFC",
+    "piwFS": "piwFS",
+    "piwKN": "piwKN",
+    "piwSB": "piwSB",
+    "piwSI": "piwSI",
+    "piwSL": "piwSL",
+    "piwXX": "piwXX",
+    "piwCH_PerC": "piwCH/C",
+    "piwCS_PerC": "piwCS/C",
+    "piwCU_PerC": "piwCU/C",
+    "piwFA_PerC": "piwFA/C",
+    "piwFC_PerC": "piwFC/C",
+    "piwFS_PerC": "piwFS/C",
+    "piwKN_PerC": "piwKN/C",
+    "piwSB_PerC": "piwSB/C",
+    "piwSI_PerC": "piwSI/C",
+    "piwSL_PerC": "piwSL/C",
+    "piwXX_PerC": "piwXX/C",
+    "piO_SwingPercent": "piO-Swing%",
+    "piZ_SwingPercent": "piZ-Swing%",
+    "piSwingPercent": "piSwing%",
+    "piO_ContactPercent": "piO-Contact%",
+    "piZ_ContactPercent": "piZ-Contact%",
+    "piContactPercent": "piContact%",
+    "piZonePercent": "piZone%",
+    "piPace": "piPace",
+    "Events": "Events",
+    "EV": "EV",
+    "LA": "LA",
+    "Barrels": "Barrels",
+    "BarrelPercent": "Barrel%",
+    "maxEV": "maxEV",
+    "HardHit": "HardHit",
+    "HardHitPercent": "HardHit%",
+    "Q": "Q",
+    "TG": "TG",
+    "TIP": "TIP",
+    "PlayerNameRoute": "PlayerNameRoute",
+    "PlayerName": "PlayerName",
+    "position": "position",
+    "TeamName": "TeamName",
+    "TeamNameAbb": "TeamNameAbb",
+    "SourceTeamID": "teamid",
+    "SourcePlayerID": "playerid",
+    "position": "position"
+}
+
+# Stat group -> (column mapping, fact table).
+STAT_TYPES = {
+    "bat": (BATTING_STAT_MAPPING, "FactSeasonStatsBatting"),
+    "pit": (PITCHING_STAT_MAPPING, "FactSeasonStatsPitching"),
+}
+
+
+def leaderboard_url(stats, season):
+    return LEADERBOARD_URL.format(stats=stats, season=season)
+
+
+def get_fangraphs_data(api_url, timeout=120):
     """
     Fetches data from the Fangraphs API and returns the parsed JSON.
     """
     try:
-        response = requests.get(api_url)
+        response = requests.get(api_url, timeout=timeout)
         response.raise_for_status()  # Raises an exception for HTTP errors
         return response.json()
     except Exception as e:
         print(f"Error retrieving data from API: {e}")
         return None
 
-def process_records(data, stat_mapping, insert_table, cursor, conn):
+def _clean_html(value):
     """
-    Processes a list of records using the provided stat_mapping and inserts into the given table.
-    Looks up or inserts DimPlayer, DimTeam, and DimSeason.
+    Text of an HTML fragment such as the API's linked Name/Team. Plain strings and a single
+    <a ...>text</a> link (almost every record) skip the parser.
     """
-    table_columns = list(stat_mapping.keys())
-    placeholders = ", ".join("?" for _ in table_columns)
-    # Build the complete INSERT query.
-    # Note: PlayerID, TeamID, and SeasonID come from the Dim* lookups.
-    insert_query = (
-        f"INSERT INTO {insert_table} (PlayerID, TeamID, SeasonID, " +
-        ", ".join(table_columns) +
-        ") VALUES (?, ?, ?, " + placeholders + ")"
-    )
-    
+    if not value:
+        return ""
+    if "<" not in value and "&" not in value:
+        return value.strip()
+    link = _SIMPLE_LINK.fullmatch(value)
+    if link:
+        return html.unescape(link.group(1)).strip()
+    return BeautifulSoup(value, "html.parser").get_text().strip()
+
+
+def _stage_records(data, stat_mapping):
+    """
+    Clean and key every record once, without touching the database. Returns a list of
+    (record, fangraphs_id, player_name, team_abb, season_year, stat_values).
+    """
+    staged = []
     for record in data.get("data", []):
-        # Clean HTML for Name and Team fields.
-        name_html = record.get("Name", "")
-        team_html = record.get("Team", "")
-        player_name = BeautifulSoup(name_html, "html.parser").get_text().strip()
-        team_abb = BeautifulSoup(team_html, "html.parser").get_text().strip()
-        season_year = record.get("Season")
-        
-        # DimPlayer: Check if the player exists using the API’s playerid.
         player_id_api = record.get("playerid")
         if not player_id_api:
             print("Warning: playerid is missing for record", record)
             continue
-        
-        cursor.execute(
-            "SELECT playerid FROM DimPlayer WHERE Fangraphsplayerid = ?",
-            player_id_api
+        try:
+            fangraphs_id = int(player_id_api)
+        except (TypeError, ValueError):
+            print(f"Warning: non-numeric playerid {player_id_api!r}; skipping record.")
+            continue
+        staged.append((
+            record,
+            fangraphs_id,
+            _clean_html(record.get("Name", "")),
+            _clean_html(record.get("Team", "")),
+            record.get("Season"),
+            tuple(record.get(api_key) for api_key in stat_mapping.values()),
+        ))
+    return staged
+
+
+def _lookup_ids(db, table, key_column, id_column, keys):
+    """{key: id} for the given natural keys, in IN-list chunks under SQL Server's parameter limit."""
+    keys = list(keys)
+    found = {}
+    for start in range(0, len(keys), _LOOKUP_CHUNK):
+        chunk = keys[start:start + _LOOKUP_CHUNK]
+        db.cursor.execute(
+            f"SELECT {key_column}, {id_column} FROM {table} WHERE {key_column} IN ({', '.join('?' for _ in chunk)})",
+            chunk
         )
-        row = cursor.fetchone()
-        if row and row[0]:
-            dim_player_id = row[0]
-        else:
-            cursor.execute(
-                "INSERT INTO DimPlayer (Fangraphsplayerid, PlayerName, Bats) OUTPUT INSERTED.playerid VALUES (?, ?, ?)",
-                player_id_api, player_name, record.get("Bats")
-            )
-            player_row = cursor.fetchone()
-            if player_row and player_row[0]:
-                dim_player_id = player_row[0]
-            else:
-                print(f"Error retrieving identity for player {player_name}. Skipping record.")
-                conn.rollback()
-                continue
-            conn.commit()
-
-        # DimTeam: Check if the team exists.
-        cursor.execute(
-            "SELECT TeamID FROM DimTeam WHERE TeamNameAbb = ?",
-            team_abb
+        found.update((key, dim_id) for key, dim_id in db.cursor.fetchall())
+    return found
+
+
+class DimensionCache:
+    """
+    Surrogate keys of DimPlayer, DimTeam and DimSeason, read once into dicts of natural key -> id
+    and kept in step with the members this loader inserts, so resolving a record's keys never
+    queries the database.
+    """
+
+    # Dim table -> (natural key column, surrogate id column, columns supplied on insert).
+    TABLES = {
+        "DimPlayer": ("FangraphsPlayerID", "PlayerID", ("FangraphsPlayerID", "PlayerName", "Bats")),
+        "DimTeam": ("TeamNameAbb", "TeamID", ("TeamName", "TeamNameAbb")),
+        "DimSeason": ("SeasonYear", "SeasonID", ("SeasonYear",)),
+    }
+
+    def __init__(self, db):
+        self.ids = {}
+        for table, (key_column, id_column, _) in self.TABLES.items():
+            db.cursor.execute(f"SELECT {key_column}, {id_column} FROM {table}")
+            self.ids[table] = {key: dim_id for key, dim_id in db.cursor.fetchall()}
+
+    def get(self, table, key):
+        return self.ids[table].get(key)
+
+    def add_missing(self, db, table, members):
+        """
+        Insert the members ({natural key: insert params}) not already cached with one executemany
+        and one commit, then read back their ids. Returns the number inserted.
+        """
+        missing = {key: params for key, params in members.items() if key not in self.ids[table]}
+        if not missing:
+            return 0
+        key_column, id_column, insert_columns = self.TABLES[table]
+        db.executemany(
+            f"INSERT INTO {table} ({', '.join(insert_columns)}) VALUES ({', '.join('?' for _ in insert_columns)})",
+            list(missing.values())
         )
-        row = cursor.fetchone()
-        if row and row[0]:
-            team_id = row[0]
-        else:
-            cursor.execute(
-                "INSERT INTO DimTeam (TeamName, TeamNameAbb) OUTPUT INSERTED.TeamID VALUES (?, ?)",
-                team_abb, team_abb
-            )
-            team_row = cursor.fetchone()
-            if team_row and team_row[0]:
-                team_id = team_row[0]
-            else:
-                print(f"Error retrieving identity for team {team_abb}. Skipping record.")
-                conn.rollback()
-                continue
-            conn.commit()
-
-        # DimSeason: Check if the season exists.
-        cursor.execute(
-            "SELECT SeasonID FROM DimSeason WHERE SeasonYear = ?",
-            season_year
+        db.commit()
+        self.ids[table].update(_lookup_ids(db, table, key_column, id_column, missing))
+        return len(missing)
+
+    def get_or_insert(self, db, table, key, params):
+        """A member's id, inserting it (committed) if new. None if no id came back."""
+        dim_id = self.ids[table].get(key)
+        if dim_id is not None:
+            return dim_id
+        _, id_column, insert_columns = self.TABLES[table]
+        dim_id = db.insert_returning_id(table, insert_columns, id_column, params)
+        if not dim_id:
+            db.rollback()
+            return None
+        db.commit()
+        self.ids[table][key] = dim_id
+        return dim_id
+
+
+def _row_hash(stat_values):
+    """
+    Digest of a stat line, stored as RowHash so unchanged rows can be skipped. Pickle protocol 4
+    is a fixed encoding of the JSON value types (and much cheaper than formatting the floats).
+    """
+    return hashlib.blake2b(pickle.dumps(stat_values, protocol=4), digest_size=16).hexdigest()
+
+
+def _fact_statements(insert_table, stat_mapping):
+    """(INSERT, UPDATE) statements for a fact table; both take the stat columns then RowHash."""
+    table_columns = list(stat_mapping.keys())
+    # Note: PlayerID, TeamID, and SeasonID come from the Dim* lookups.
+    insert_query = (
+        f"INSERT INTO {insert_table} ({', '.join(FACT_KEY)}, " +
+        ", ".join(table_columns) +
+        ", RowHash) VALUES (?, ?, ?, " + ", ".join("?" for _ in table_columns) + ", ?)"
+    )
+    update_query = (
+        f"UPDATE {insert_table} SET " +
+        ", ".join(f"{column} = ?" for column in table_columns + ["RowHash"]) +
+        " WHERE " + " AND ".join(f"{column} = ?" for column in FACT_KEY)
+    )
+    return insert_query, update_query
+
+
+def _existing_hashes(db, insert_table, season_ids):
+    """{(PlayerID, TeamID, SeasonID): RowHash} of the fact rows already stored for these seasons."""
+    season_ids = list(season_ids)
+    found = {}
+    for start in range(0, len(season_ids), _LOOKUP_CHUNK):
+        chunk = season_ids[start:start + _LOOKUP_CHUNK]
+        db.cursor.execute(
+            f"SELECT {', '.join(FACT_KEY)}, RowHash FROM {insert_table} "
+            f"WHERE SeasonID IN ({', '.join('?' for _ in chunk)})",
+            chunk
         )
-        row = cursor.fetchone()
-        if row and row[0]:
-            season_id = row[0]
-        else:
-            cursor.execute(
-                "INSERT INTO DimSeason (SeasonYear) OUTPUT INSERTED.SeasonID VALUES (?)",
-                season_year
-            )
-            season_row = cursor.fetchone()
-            if season_row and season_row[0]:
-                season_id = season_row[0]
-            else:
-                print(f"Error retrieving identity for season {season_year}. Skipping record.")
-                conn.rollback()
-                continue
-            conn.commit()
+        found.update(((player_id, team_id, season_id), row_hash)
+                     for player_id, team_id, season_id, row_hash in db.cursor.fetchall())
+    return found
+
+
+def process_records(data, stat_mapping, insert_table, db, dims=None):
+    """
+    Processes a list of records using the provided stat_mapping and upserts them into the given
+    table of the warehouse `db` (a warehouse backend), one row and commit at a time: a new
+    (PlayerID, TeamID, SeasonID) is inserted, a changed stat line is updated in place and an
+    unchanged one (same RowHash) is skipped. DimPlayer, DimTeam and DimSeason keys come from
+    `dims` (a DimensionCache, loaded here if not given); new members are inserted as they are met.
+    """
+    if dims is None:
+        dims = DimensionCache(db)
+    insert_query, update_query = _fact_statements(insert_table, stat_mapping)
+    existing, seasons_read = {}, set()
+
+    for record, fangraphs_id, player_name, team_abb, season_year, stat_values in _stage_records(data, stat_mapping):
+        dim_player_id = dims.get_or_insert(db, "DimPlayer", fangraphs_id,
+                                           (fangraphs_id, player_name, record.get("Bats")))
+        if dim_player_id is None:
+            print(f"Error retrieving identity for player {player_name}. Skipping record.")
+            continue
+        team_id = dims.get_or_insert(db, "DimTeam", team_abb, (team_abb, team_abb))
+        if team_id is None:
+            print(f"Error retrieving identity for team {team_abb}. Skipping record.")
+            continue
+        season_id = dims.get_or_insert(db, "DimSeason", season_year, (season_year,))
+        if season_id is None:
+            print(f"Error retrieving identity for season {season_year}. Skipping record.")
+            continue
+        if season_id not in seasons_read:
+            existing.update(_existing_hashes(db, insert_table, [season_id]))
+            seasons_read.add(season_id)
 
-        # Build the parameter tuple for the stat fields using the mapping.
-        stat_values = tuple(record.get(api_key) for api_key in stat_mapping.values())
-        params = (dim_player_id, team_id, season_id) + stat_values
+        key = (dim_player_id, team_id, season_id)
+        row_hash = _row_hash(stat_values)
+        if existing.get(key) == row_hash:
+            continue
 
         try:
-            cursor.execute(insert_query, params)
-            conn.commit()
-        except pyodbc.IntegrityError as ie:
+            if key in existing:
+                db.cursor.execute(update_query, stat_values + (row_hash,) + key)
+            else:
+                db.cursor.execute(insert_query, key + stat_values + (row_hash,))
+            db.commit()
+            existing[key] = row_hash
+        except db.IntegrityError as ie:
             print(f"Integrity error when inserting fact stats for player {player_name}: {ie}")
-            conn.rollback()
+            db.rollback()
             continue
         except Exception as e:
             print(f"Unexpected error when inserting fact stats for player {player_name}: {e}")
-            conn.rollback()
+            db.rollback()
             continue
 
+
+def bulk_process_records(data, stat_mapping, insert_table, db, batch_size=BATCH_SIZE, dims=None):
+    """
+    Same result as process_records, loaded in bulk: records are cleaned and staged in memory,
+    keys are resolved against `dims` (a DimensionCache, loaded here if not given) with only new
+    players, teams and seasons inserted (one transaction per Dim table), and each stat line's
+    RowHash is compared with the stored one for its (PlayerID, TeamID, SeasonID). New rows are
+    inserted and changed rows updated with executemany (fast_executemany on SQL Server) in
+    batches of `batch_size`, committed once; unchanged rows are not written. If a batch fails,
+    the fact transaction is rolled back and the table is reloaded through the per-row path so
+    that bad rows are reported and skipped as before. Returns the number of stat lines staged.
+    """
+    started = time.perf_counter()
+    staged = _stage_records(data, stat_mapping)
+    if not staged:
+        return 0
+    if dims is None:
+        dims = DimensionCache(db)
+
+    players, teams, seasons = {}, {}, {}
+    for record, fangraphs_id, player_name, team_abb, season_year, _ in staged:
+        players.setdefault(fangraphs_id, (fangraphs_id, player_name, record.get("Bats")))
+        teams.setdefault(team_abb, (team_abb, team_abb))
+        seasons.setdefault(season_year, (season_year,))
+    new_members = (dims.add_missing(db, "DimPlayer", players)
+                   + dims.add_missing(db, "DimTeam", teams)
+                   + dims.add_missing(db, "DimSeason", seasons))
+
+    # A key listed twice keeps its last stat line, as the per-row path would.
+    lines = {}
+    for _, fangraphs_id, player_name, team_abb, season_year, stat_values in staged:
+        key = (dims.get("DimPlayer", fangraphs_id), dims.get("DimTeam", team_abb), dims.get("DimSeason", season_year))
+        if None in key:
+            print(f"Error retrieving dimension ids for player {player_name}. Skipping record.")
+            continue
+        lines[key] = stat_values
+
+    existing = _existing_hashes(db, insert_table, {key[2] for key in lines})
+    inserts, updates = [], []
+    for key, stat_values in lines.items():
+        row_hash = _row_hash(stat_values)
+        if key not in existing:
+            inserts.append(key + stat_values + (row_hash,))
+        elif existing[key] != row_hash:
+            updates.append(stat_values + (row_hash,) + key)
+
+    insert_query, update_query = _fact_statements(insert_table, stat_mapping)
+    try:
+        for query, rows in ((insert_query, inserts), (update_query, updates)):
+            for start in range(0, len(rows), batch_size):
+                db.executemany(query, rows[start:start + batch_size])
+        db.commit()
+    except db.Error as e:
+        db.rollback()
+        print(f"Bulk upsert into {insert_table} failed ({e}); reloading row by row.")
+        process_records({"data": [s[0] for s in staged]}, stat_mapping, insert_table, db, dims)
+        return len(lines)
+    print(f"Loaded {len(lines)} rows into {insert_table}: {len(inserts)} new, {len(updates)} changed, "
+          f"{len(lines) - len(inserts) - len(updates)} unchanged ({new_members} new dimension members) "
+          f"in {time.perf_counter() - started:.2f}s.")
+    return len(lines)
+
+
+def _load_checkpoint(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _save_checkpoint(path, checkpoint):
+    """Write via a temp file and rename, so an interrupted run never leaves a torn checkpoint."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(checkpoint, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def backfill(seasons, db, workers=4, checkpoint_path=DEFAULT_CHECKPOINT, restart=False):
+    """
+    Load the batting and pitching leaderboards of every season in `seasons` into `db`.
+
+    Up to `workers` leaderboards are fetched (or waiting to be loaded) at once; each one is
+    loaded on this thread through bulk_process_records, with one DimensionCache shared by all.
+    Loads are upserts, so rerunning one (after a crash, or daily for the season in progress)
+    only writes the stat lines that changed. Each (season, stat group) is checkpointed once its
+    rows are committed, and a rerun skips checkpointed past seasons; the current season (SEASON,
+    default this year) is always reloaded, and `restart` reloads everything. Returns the
+    (season, stats) pairs that could not be fetched.
+    """
+    checkpoint = _load_checkpoint(checkpoint_path)
+    current = int(os.getenv("SEASON") or datetime.date.today().year)
+    jobs = [(season, stats) for season in seasons for stats in STAT_TYPES
+            if restart or season >= current or checkpoint.get(f"{season}/{stats}", {}).get("status") != "done"]
+    skipped = len(seasons) * len(STAT_TYPES) - len(jobs)
+    if skipped:
+        print(f"Skipping {skipped} leaderboards already loaded (checkpoint {checkpoint_path}).")
+    dims = DimensionCache(db)
+    failed = []
+    queue = iter(jobs)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as pool:
+        pending = {}
+
+        def submit():
+            for season, stats in itertools.islice(queue, workers - len(pending)):
+                pending[pool.submit(get_fangraphs_data, leaderboard_url(stats, season))] = (season, stats)
+
+        submit()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                season, stats = pending.pop(future)
+                data = future.result()
+                if data is None or "data" not in data:
+                    print(f"No {stats} data retrieved for {season}; it will be retried on the next run.")
+                    failed.append((season, stats))
+                    continue
+                stat_mapping, insert_table = STAT_TYPES[stats]
+                rows = bulk_process_records(data, stat_mapping, insert_table, db, dims=dims)
+                checkpoint[f"{season}/{stats}"] = {"status": "done", "rows": rows,
+                                   "loaded_at": datetime.datetime.now().isoformat(timespec="seconds")}
+                _save_checkpoint(checkpoint_path, checkpoint)
+            submit()
+    return failed
+
+
+def parse_seasons(spec):
+    """"2015-2024" or "2019,2021,2023-2024" -> sorted list of seasons."""
+    seasons = set()
+    for part in spec.split(","):
+        first, _, last = part.strip().partition("-")
+        seasons.update(range(int(first), int(last or first) + 1))
+    return sorted(seasons)
+
+
 def main():
-    # Define your SQL Server connection string.
-    conn = pyodbc.connect(
-        "DRIVER={ODBC Driver 17 for SQL Server};"
-        "SERVER=localhost;"
-        "DATABASE=Baseball;"
-        "UID=FangraphsApp;"
-        "PWD=FangraphsApp;"
-        "Trusted_Connection=yes;"
-    )
-    cursor = conn.cursor()
-    
-    # Optionally, set NOCOUNT ON for the session.
-    cursor.execute("SET NOCOUNT ON;")
-    
-    # API URL for batting data.
-    batting_api_url = (
-        "https://www.fangraphs.com/api/leaders/major-league/data?age=&pos=all&stats=bat&lg=all&qual=0&season=2024&season1=2024&startdate=2024-03-01&enddate=2024-11-01&month=0&hand=&team=0&pageitems=2000000000&pagenum=1&ind=0&rost=0&players=&type=8&postseason=&sortdir=default&sortstat=WAR"
-    )
-    batting_data = get_fangraphs_data(batting_api_url)
-    if batting_data is None or "data" not in batting_data:
-        print("No batting data retrieved from the API. Exiting batting process.")
-    else:
-        # Mapping for batting – as in your original script.
-        batting_stat_mapping = {
-            "Age": "Age",
-            "AgeRange": "AgeR",
-            "SeasonMin": "SeasonMin",
-            "SeasonMax": "SeasonMax",
-            "Games": "G",
-            "AtBats": "AB",
-            "PlateAppearances": "PA",
-            "Hits": "H",
-            "Singles": "1B",
-            "Doubles": "2B",
-            "Triples": "3B",
-            "HomeRuns": "HR",
-            "Runs": "R",
-            "RBI": "RBI",
-            "BaseOnBalls": "BB",
-            "IntentionalWalks": "IBB",
-            "StrikeOuts": "SO",
-            "HitByPitch": "HBP",
-            "SacrificeFlies": "SF",
-            "SacrificeHits": "SH",
-            "GroundedIntoDoublePlay": "GDP",
-            "StolenBases": "SB",
-            "CaughtStealing": "CS",
-            "BattingAverage": "AVG",
-            "GroundBalls": "GB",
-            "FlyBalls": "FB",
-            "LineDrives": "LD",
-            "InfieldFlyBalls": "IFFB",
-            "Pitches": "Pitches",
-            "Balls": "Balls",
-            "Strikes": "Strikes",
-            "IFH": "IFH",
-            "BU": "BU",
-            "BUH": "BUH",
-            "BBPercent": "BB%",
-            "KPercent": "K%",
-            "BBPerK": "BB/K",
-            "OnBasePercentage": "OBP",
-            "SluggingPercentage": "SLG",
-            "OPS": "OPS",
-            "ISO": "ISO",
-            "BABIP": "BABIP",
-            "GB_FB_Ratio": "GB/FB",
-            "LDPercent": "LD%",
-            "GBPercent": "GB%",
-            "FBPercent": "FB%",
-            "IFFBPercent": "IFFB%",
-            "HR_FB_Ratio": "HR/FB",
-            "IFHPercent": "IFH%",
-            "BUHPercent": "BUH%",
-            "TTOPercent": "TTO%",
-            "wOBA": "wOBA",
-            "wRAA": "wRAA",
-            "wRC": "wRC",
-            "BattingValue": "Batting",
-            "Fielding": "Fielding",
-            "Replacement": "Replacement",
-            "Positional": "Positional",
-            "wLeague": "wLeague",
-            "CFraming": "CFraming",
-            "Defense": "Defense",
-            "Offense": "Offense",
-            "RAR": "RAR",
-            "WAR": "WAR",
-            "WAROld": "WAROld",
-            "Dollars": "Dollars",
-            "BaseRunning": "BaseRunning",
-            "Spd": "Spd",
-            "wRCPlus": "wRC+",
-            "wBsR": "wBsR",
-            "WPA": "WPA",
-            "WPA_Negative": "-WPA",
-            "WPA_Positive": "+WPA",
-            "RE24": "RE24",
-            "REW": "REW",
-            "pLI": "pLI",
-            "phLI": "phLI",
-            "PH": "PH",
-            "WPA_per_LI": "WPA/LI",
-            "Clutch": "Clutch",
-            "FBPercent1": "FB%1",
-            "FBv": "FBv",
-            "SLPercent": "SL%",
-            "SLv": "SLv",
-            "CTPercent": "CT%",
-            "CTv": "CTv",
-            "CBPercent": "CB%",
-            "CBv": "CBv",
-            "CHPercent": "CH%",
-            "CHv": "CHv",
-            "SFPercent": "SF%",
-            "SFv": "SFv",
-            "KNPercent": "KN%",
-            "KNv": "KNv",
-            "XXPercent": "XX%",
-            "POPercent": "PO%",
-            "wFB": "wFB",
-            "wSL": "wSL",
-            "wCT": "wCT",
-            "wCB": "wCB",
-            "wCH": "wCH",
-            "wSF": "wSF",
-            "wKN": "wKN",
-            "wFB_PerC": "wFB/C",
-            "wSL_PerC": "wSL/C",
-            "wCT_PerC": "wCT/C",
-            "wCB_PerC": "wCB/C",
-            "wCH_PerC": "wCH/C",
-            "wSF_PerC": "wSF/C",
-            "wKN_PerC": "wKN/C",
-            "OSwingPercent": "O-Swing%",
-            "ZSwingPercent": "Z-Swing%",
-            "SwingPercent": "Swing%",
-            "OContactPercent": "O-Contact%",
-            "ZContactPercent": "Z-Contact%",
-            "ContactPercent": "Contact%",
-            "ZonePercent": "Zone%",
-            "FStrikePercent": "F-Strike%",
-            "SwStrPercent": "SwStr%",
-            "CStrPercent": "CStr%",
-            "CPlusSwStrPercent": "C+SwStr%"
-        }
-        process_records(batting_data, batting_stat_mapping, "FactSeasonStatsBatting", cursor, conn)
-    
-    # API URL for pitching data.
-    pitching_api_url = (
-        "https://www.fangraphs.com/api/leaders/major-league/data?age=&pos=all&stats=pit&lg=all&qual=0&season=2024&season1=2024&startdate=2024-03-01&enddate=2024-11-01&month=0&hand=&team=0&pageitems=2000000000&pagenum=1&ind=0&rost=0&players=&type=8&postseason=&sortdir=default&sortstat=WAR"
-    )
-    pitching_data = get_fangraphs_data(pitching_api_url)
-    if pitching_data is None or "data" not in pitching_data:
-        print("No pitching data retrieved from the API. Exiting pitching process.")
-    else:
-        # Mapping for pitching (all metrics from your JSON sample).
-        pitching_stat_mapping = {
-            "Throws": "Throws",
-            "xMLBAMID": "xMLBAMID",
-            "Age": "Age",
-            "AgeRange": "AgeR",
-            "SeasonMin": "SeasonMin",
-            "SeasonMax": "SeasonMax",
-            "W": "W",
-            "L": "L",
-            "ERA": "ERA",
-            "G": "G",
-            "GS": "GS",
-            "QS": "QS",
-            "CG": "CG",
-            "ShO": "ShO",
-            "SV": "SV",
-            "BS": "BS",
-            "IP": "IP",
-            "TBF": "TBF",
-            "H": "H",
-            "R": "R",
-            "ER": "ER",
-            "HR": "HR",
-            "BB": "BB",
-            "IBB": "IBB",
-            "HBP": "HBP",
-            "WP": "WP",
-            "BK": "BK",
-            "SO": "SO",
-            "GB": "GB",
-            "FB": "FB",
-            "LD": "LD",
-            "IFFB": "IFFB",
-            "Pitches": "Pitches",
-            "Balls": "Balls",
-            "Strikes": "Strikes",
-            "RS": "RS",
-            "IFH": "IFH",
-            "BU": "BU",
-            "BUH": "BUH",
-            "KPer9": "K/9",
-            "BBPer9": "BB/9",
-            "K_BB": "K/BB",
-            "HPer9": "H/9",
-            "HRPer9": "HR/9",
-            "AVG": "AVG",
-            "WHIP": "WHIP",
-            "BABIP": "BABIP",
-            "LOBPercent": "LOB%",
-            "FIP": "FIP",
-            "GB_FB": "GB/FB",
-            "LDPercent": "LD%",
-            "GBPercent": "GB%",
-            "FBPercent": "FB%",
-            "IFFBPercent": "IFFB%",
-            "HR_FB": "HR/FB",
-            "IFHPercent": "IFH%",
-            "BUHPercent": "BUH%",
-            "TTOPercent": "TTO%",
-            "CFraming": "CFraming",
-            "Starting": "Starting",
-            "Start_IP": "Start-IP",
-            "Relieving": "Relieving",
-            "Relief_IP": "Relief-IP",
-            "RAR": "RAR",
-            "WAR": "WAR",
-            "Dollars": "Dollars",
-            "RA9_Wins": "RA9-Wins",
-            "LOB_Wins": "LOB-Wins",
-            "BIP_Wins": "BIP-Wins",
-            "BS_Wins": "BS-Wins",
-            "tERA": "tERA",
-            "xFIP": "xFIP",
-            "WPA": "WPA",
-            "Negative_WPA": "-WPA",
-            "Positive_WPA": "+WPA",
-            "RE24": "RE24",
-            "REW": "REW",
-            "pLI": "pLI",
-            "inLI": "inLI",
-            "gmLI": "gmLI",
-            "exLI": "exLI",
-            "Pulls": "Pulls",
-            "Games": "Games",
-            "WPA_LI": "WPA/LI",
-            "Clutch": "Clutch",
-            "FBPercent1": "FB%1",
-            "FBv": "FBv",
-            "SLPercent": "SL%",
-            "SLv": "SLv",
-            "CTPercent": "CT%",
-            "CTv": "CTv",
-            "CBPercent": "CB%",
-            "CBv": "CBv",
-            "CHPercent": "CH%",
-            "CHv": "CHv",
-            "SFPercent": "SF%",
-            "SFv": "SFv",
-            "KNPercent": "KN%",
-            "KNv": "KNv",
-            "XXPercent": "XX%",
-            "POPercent": "PO%",
-            "wFB": "wFB",
-            "wSL": "wSL",
-            "wCT": "wCT",
-            "wCB": "wCB",
-            "wCH": "wCH",
-            "wSF": "wSF",
-            "wKN": "wKN",
-            "wFB_PerC": "wFB/C",
-            "wSL_PerC": "wSL/C",
-            "wCT_PerC": "wCT/C",
-            "wCB_PerC": "wCB/C",
-            "wCH_PerC": "wCH/C",
-            "wSF_PerC": "wSF/C",
-            "wKN_PerC": "wKN/C",
-            "O_SwingPercent": "O-Swing%",
-            "Z_SwingPercent": "Z-Swing%",
-            "SwingPercent": "Swing%",
-            "O_ContactPercent": "O-Contact%",
-            "Z_ContactPercent": "Z-Contact%",
-            "ContactPercent": "Contact%",
-            "ZonePercent": "Zone%",
-            "F_StrikePercent": "F-Strike%",
-            "SwStrPercent": "SwStr%",
-            "CStrPercent": "CStr%",
-            "CPlusSwStrPercent": "C+SwStr%",
-            "Pull": "Pull",
-            "Cent": "Cent",
-            "Oppo": "Oppo",
-            "Soft": "Soft",
-            "Med": "Med",
-            "Hard": "Hard",
-            "bipCount": "bipCount",
-            "PullPercent": "Pull%",
-            "CentPercent": "Cent%",
-            "OppoPercent": "Oppo%",
-            "SoftPercent": "Soft%",
-            "MedPercent": "Med%",
-            "HardPercent": "Hard%",
-            "KPer9_Plus": "K/9+",
-            "BBPer9_Plus": "BB/9+",
-            "K_BB_Plus": "K/BB+",
-            "HPer9_Plus": "H/9+",
-            "HRPer9_Plus": "HR/9+",
-            "AVG_Plus": "AVG+",
-            "WHIP_Plus": "WHIP+",
-            "BABIP_Plus": "BABIP+",
-            "LOBPercent_Plus": "LOB%+",
-            "KPercent_Plus": "K%+",
-            "BBPercent_Plus": "BB%+",
-            "LDPercent_Plus": "LD+",
-            "GBPercent_Plus": "GB+",
-            "FBPercent_Plus": "FB+",
-            "HRFBPercent_Plus": "HRFB+",
-            "PullPercent_Plus": "Pull%+",
-            "CentPercent_Plus": "Cent%+",
-            "OppoPercent_Plus": "Oppo%+",
-            "SoftPercent_Plus": "Soft%+",
-            "MedPercent_Plus": "Med%+",
-            "HardPercent_Plus": "Hard%+",
-            "xwOBA": "xwOBA",
-            "xAVG": "xAVG",
-            "xSLG": "xSLG",
-            "XBR": "XBR",
-            "PPTV": "PPTV",
-            "CPTV": "CPTV",
-            "BPTV": "BPTV",
-            "DSV": "DSV",
-            "DGV": "DGV",
-            "BTV": "BTV",
-            "rPPTV": "rPPTV",
-            "rCPTV": "rCPTV",
-            "rBPTV": "rBPTV",
-            "rDSV": "rDSV",
-            "rDGV": "rDGV",
-            "rBTV": "rBTV",
-            "EBV": "EBV",
-            "ESV": "ESV",
-            "rFTeamV": "rFTeamV",
-            "rBTeamV": "rBTeamV",
-            "rTV": "rTV",
-            "pfxFA_Percent": "pfxFA%",
-            "pfxFT_Percent": "pfxFT%",
-            "pfxFC_Percent": "pfxFC%",
-            "pfxFS_Percent": "pfxFS%",
-            "pfxFO_Percent": "pfxFO%",
-            "pfxSI_Percent": "pfxSI%",
-            "pfxSL_Percent": "pfxSL%",
-            "pfxCU_Percent": "pfxCU%",
-            "pfxKC_Percent": "pfxKC%",
-            "pfxEP_Percent": "pfxEP%",
-            "pfxCH_Percent": "pfxCH%",
-            "pfxSC_Percent": "pfxSC%",
-            "pfxKN_Percent": "pfxKN%",
-            "pfxUN_Percent": "pfxUN%",
-            "pfxvFA": "pfxvFA",
-            "pfxvFT": "pfxvFT",
-            "pfxvFC": "pfxvFC",
-            "pfxvFS": "pfxvFS",
-            "pfxvFO": "pfxvFO",
-            "pfxvSI": "pfxvSI",
-            "pfxvSL": "pfxvSL",
-            "pfxvCU": "pfxvCU",
-            "pfxvKC": "pfxvKC",
-            "pfxvEP": "pfxvEP",
-            "pfxvCH": "pfxvCH",
-            "pfxvSC": "pfxvSC",
-            "pfxvKN": "pfxvKN",
-            "pfxFA_X": "pfxFA-X",
-            "pfxFT_X": "pfxFT-X",
-            "pfxFC_X": "pfxFC-X",
-            "pfxFS_X": "pfxFS-X",
-            "pfxFO_X": "pfxFO-X",
-            "pfxSI_X": "pfxSI-X",
-            "pfxSL_X": "pfxSL-X",
-            "pfxCU_X": "pfxCU-X",
-            "pfxKC_X": "pfxKC-X",
-            "pfxEP_X": "pfxEP-X",
-            "pfxCH_X": "pfxCH-X",
-            "pfxSC_X": "pfxSC-X",
-            "pfxKN_X": "pfxKN-X",
-            "pfxFA_Z": "pfxFA-Z",
-            "pfxFT_Z": "pfxFT-Z",
-            "pfxFC_Z": "pfxFC-Z",
-            "pfxFS_Z": "pfxFS-Z",
-            "pfxFO_Z": "pfxFO-Z",
-            "pfxSI_Z": "pfxSI-Z",
-            "pfxSL_Z": "pfxSL-Z",
-            "pfxCU_Z": "pfxCU-Z",
-            "pfxKC_Z": "pfxKC-Z",
-            "pfxEP_Z": "pfxEP-Z",
-            "pfxCH_Z": "pfxCH-Z",
-            "pfxSC_Z": "pfxSC-Z",
-            "pfxKN_Z": "pfxKN-Z",
-            "pfxwFA": "pfxwFA",
-            "pfxwFT": "pfxwFT",
-            "pfxwFC": "pfxwFC",
-            "pfxwFS": "pfxwFS",
-            "pfxwFO": "pfxwFO",
-            "pfxwSI": "pfxwSI",
-            "pfxwSL": "pfxwSL",
-            "pfxwCU": "pfxwCU",
-            "pfxwKC": "pfxwKC",
-            "pfxwEP": "pfxwEP",
-            "pfxwCH": "pfxwCH",
-            "pfxwSC": "pfxwSC",
-            "pfxwKN": "pfxwKN",
-            "pfxwFA_PerC": "pfxwFA/C",
-            "pfxwFT_PerC": "pfxwFT/C",
-            "pfxwFC_PerC": "pfxwFC/C",
-            "pfxwFS_PerC": "pfxwFS/C",
-            "pfxwFO_PerC": "pfxwFO/C",
-            "pfxwSI_PerC": "pfxwSI/C",
-            "pfxwSL_PerC": "pfxwSL/C",
-            "pfxwCU_PerC": "pfxwCU/C",
-            "pfxwKC_PerC": "pfxwKC/C",
-            "pfxwEP_PerC": "pfxwEP/C",
-            "pfxwCH_PerC": "pfxwCH/C",
-            "pfxwSC_PerC": "pfxwSC/C",
-            "pfxwKN_PerC": "pfxwKN/C",
-            "pfxO_Swing_Percent": "pfxO-Swing%",
-            "pfxZ_Swing_Percent": "pfxZ-Swing%",
-            "pfxSwing_Percent": "pfxSwing%",
-            "pfxO_Contact_Percent": "pfxO-Contact%",
-            "pfxZ_Contact_Percent": "pfxZ-Contact%",
-            "pfxContact_Percent": "pfxContact%",
-            "pfxZone_Percent": "pfxZone%",
-            "pfxPace": "pfxPace",
-            "piCH_Percent": "piCH%",
-            "piCS_Percent": "piCS%",
-            "piCU_Percent": "piCU%",
-            "piFA_Percent": "piFA%",
-            "piFC_Percent": "piFC%",
-            "piFS_Percent": "piFS%",
-            "piKN_Percent": "piKN%",
-            "piSB_Percent": "piSB%",
-            "piSI_Percent": "piSI%",
-            "piSL_Percent": "piSL%",
-            "piXX_Percent": "piXX%",
-            "pivCH": "pivCH",
-            "pivCS": "pivCS",
-            "pivCU": "pivCU",
-            "pivFA": "pivFA",
-            "pivFC": "pivFC",
-            "pivFS": "pivFS",
-            "pivKN": "pivKN",
-            "pivSB": "pivSB",
-            "pivSI": "pivSI",
-            "pivSL": "pivSL",
-            "pivXX": "pivXX",
-            "piCH_X": "piCH-X",
-            "piCS_X": "piCS-X",
-            "piCU_X": "piCU-X",
-            "piFA_X": "piFA-X",
-            "piFC_X": "piFC-X",
-            "piFS_X": "piFS-X",
-            "piKN_X": "piKN-X",
-            "piSB_X": "piSB-X",
-            "piSI_X": "piSI-X",
-            "piSL_X": "piSL-X",
-            "piXX_X": "piXX-X",
-            "piCH_Z": "piCH-Z",
-            "piCS_Z": "piCS-Z",
-            "piCU_Z": "piCU-Z",
-            "piFA_Z": "piFA-Z",
-            "piFC_Z": "piFC-Z",
-            "piFS_Z": "piFS-Z",
-            "piKN_Z": "piKN-Z",
-            "piSB_Z": "piSB-Z",
-            "piSI_Z": "piSI-Z",
-            "piSL_Z": "piSL-Z",
-            "piXX_Z": "piXX-Z",
-            "piwCH": "piwCH",
-            "piwCS": "piwCS",
-            "piwCU": "piwCU",
-            "piwFA": "piwFA",
-            "piwFC": "piwFC",
-            "piwFS": "piwFS",
-            "piwKN": "piwKN",
-            "piwSB": "piwSB",
-            "piwSI": "piwSI",
-            "piwSL": "piwSL",
-            "piwXX": "piwXX",
-            "piwCH_PerC": "piwCH/C",
-            "piwCS_PerC": "piwCS/C",
-            "piwCU_PerC": "piwCU/C",
-            "piwFA_PerC": "piwFA/C",
-            "piwFC_PerC": "piwFC/C",
-            "piwFS_PerC": "piwFS/C",
-            "piwKN_PerC": "piwKN/C",
-            "piwSB_PerC": "piwSB/C",
-            "piwSI_PerC": "piwSI/C",
-            "piwSL_PerC": "piwSL/C",
-            "piwXX_PerC": "piwXX/C",
-            "piO_Swing_Percent": "piO-Swing%",
-            "piZ_Swing_Percent": "piZ-Swing%",
-            "piSwing_Percent": "piSwing%",
-            "piO_Contact_Percent": "piO-Contact%",
-            "piZ_Contact_Percent": "piZ-Contact%",
-            "piContact_Percent": "piContact%",
-            "piZone_Percent": "piZone%",
-            "piPace": "piPace",
-            "Events": "Events",
-            "EV": "EV",
-            "LA": "LA",
-            "Barrels": "Barrels",
-            "BarrelPercent": "Barrel%",
-            "maxEV": "maxEV",
-            "HardHit": "HardHit",
-            "HardHitPercent": "HardHit%",
-            "Q": "Q",
-            "TG": "TG",
-            "TIP": "TIP",
-            "PlayerNameRoute": "PlayerNameRoute",
-            "PlayerName": "PlayerName",
-            "position": "position",
-            "TeamName": "TeamName",
-            "TeamNameAbb": "TeamNameAbb",
-            "teamid": "teamid",
-            "playerid": "playerid",
-            "position": "position"
-        }
-        process_records(pitching_data, pitching_stat_mapping, "FactSeasonStatsPitching", cursor, conn)
-    
-    cursor.close()
-    conn.close()
-    print("ETL process completed successfully.")
+    parser = argparse.ArgumentParser(description="Load FanGraphs season leaderboards into the Baseball database.")
+    parser.add_argument("--seasons", type=parse_seasons, default=[2024],
+                        help='season range to load, e.g. "2015-2024" or "2019,2021-2024" (default: 2024)')
+    parser.add_argument("--backend", choices=sorted(warehouse.BACKENDS), default="sqlite",
+                        help="warehouse backend (default: sqlite)")
+    parser.add_argument("--database", default=None,
+                        help="SQLite file (default: output/baseball.db) or SQL Server ODBC connection string")
+    parser.add_argument("--workers", type=int, default=4, help="leaderboards fetched concurrently (default: 4)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="progress file for resuming (default: <database>.checkpoint.json for SQLite, "
+                             "output/db_loader_checkpoint.json for SQL Server)")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and reload every season")
+    args = parser.parse_args()
+
+    db = warehouse.connect(args.backend, args.database)
+    checkpoint = args.checkpoint
+    if checkpoint is None:
+        checkpoint = (Path(str(db.path) + ".checkpoint.json") if args.backend == "sqlite" else DEFAULT_CHECKPOINT)
+
+    started = time.perf_counter()
+    try:
+        failed = backfill(args.seasons, db, workers=args.workers, checkpoint_path=checkpoint, restart=args.restart)
+    finally:
+        db.close()
+    if failed:
+        print(f"ETL process finished with {len(failed)} leaderboards not loaded: "
+              f"{', '.join(f'{season} {stats}' for season, stats in failed)}. Rerun to resume.")
+        sys.exit(1)
+    print(f"ETL process completed successfully in {time.perf_counter() - started:.1f}s.")
 
 if __name__ == "__main__":
     main()
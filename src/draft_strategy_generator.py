@@ -95,14 +95,14 @@ def load_data(file_path: Optional[str] = None) -> pd.DataFrame:
             df[new] = df[old]
     return df
 
-def calculate_league_fpts(df: pd.DataFrame) -> pd.DataFrame:
+def calculate_league_fpts(df: pd.DataFrame, settings_dir: str = "output") -> pd.DataFrame:
     """
     Calculate projected fantasy points using the league's actual ESPN scoring rules.
     Maps ESPN scoring categories to FanGraphs projection columns.
     Falls back gracefully if scoring_settings.json doesn't exist.
     """
     import json
-    settings_path = os.path.join("output", "scoring_settings.json")
+    settings_path = os.path.join(settings_dir, "scoring_settings.json")
     if not os.path.exists(settings_path):
         logging.warning("No scoring_settings.json found — cannot calculate league FPTS")
         return df
@@ -597,7 +597,7 @@ def add_suggested_draft_round(df: pd.DataFrame) -> pd.DataFrame:
     df["Suggested_Draft_Round"] = np.ceil(df["Recommended_Pick"] / 10)
     return df
 
-def calculate_fpts_par(df: pd.DataFrame) -> pd.DataFrame:
+def calculate_fpts_par(df: pd.DataFrame, settings_dir: str = "output") -> pd.DataFrame:
     """
     Calculate Points Above Replacement (PAR) using League_FPTS.
     Replacement level = the Nth-best player at each position, where N = league demand.
@@ -608,7 +608,7 @@ def calculate_fpts_par(df: pd.DataFrame) -> pd.DataFrame:
         df["PAR"] = 0.0
         return df
 
-    roster_slots = _load_roster_slots()
+    roster_slots = _load_roster_slots(settings_dir)
 
     total_teams = 10
 
@@ -666,9 +666,9 @@ def calculate_fpts_par(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _load_roster_slots() -> Dict[str, int]:
+def _load_roster_slots(settings_dir: str = "output") -> Dict[str, int]:
     """Load roster slot configuration with sensible defaults."""
-    settings_path = os.path.join("output", "roster_settings.json")
+    settings_path = os.path.join(settings_dir, "roster_settings.json")
     if os.path.exists(settings_path):
         with open(settings_path) as f:
             raw_slots = json.load(f)
@@ -700,7 +700,7 @@ def _slot_accepts_player(slot: str, eligible: Set[str]) -> bool:
     return slot in eligible
 
 
-def cap_to_roster_demand(df: pd.DataFrame, total_teams: int = 10) -> pd.DataFrame:
+def cap_to_roster_demand(df: pd.DataFrame, total_teams: int = 10, settings_dir: str = "output") -> pd.DataFrame:
     """
     Keep only realistically draftable players:
     union of top N players per roster slot where N = slot_count * teams.
@@ -708,7 +708,7 @@ def cap_to_roster_demand(df: pd.DataFrame, total_teams: int = 10) -> pd.DataFram
     if df.empty or "Eligible_Positions" not in df.columns:
         return df
 
-    roster_slots = _load_roster_slots()
+    roster_slots = _load_roster_slots(settings_dir)
     teams = max(1, int(total_teams))
 
     # Dynamic caps by summing slots a position can fill.
@@ -818,26 +818,27 @@ def export_to_excel(all_players_df: pd.DataFrame, hitters_df: pd.DataFrame, pitc
     logging.info("Excel workbook saved to %s", xlsx_file)
     return xlsx_file
 
-def analyze_and_adjust_rankings(file_path: Optional[str] = None) -> pd.DataFrame:
+def analyze_and_adjust_rankings(file_path: Optional[str] = None, output_directory: str = "output") -> pd.DataFrame:
     """
     Orchestrate the data processing steps: load, process, adjust scores, and export.
+    League settings are read from, and the workbook written to, `output_directory`.
     """
     df = load_data(file_path)
-    df = calculate_league_fpts(df)
+    df = calculate_league_fpts(df, output_directory)
     df = add_eligibility_column(df)
     df = filter_players(df)
     df = add_cross_position_value_scores(df)
     df = restrict_to_top_players(df)
-    df = calculate_fpts_par(df)
+    df = calculate_fpts_par(df, output_directory)
 
     _, scarce_positions, deep_positions = compute_positional_depth(df)
     df = add_ranking_and_adjust_scores(df, scarce_positions, deep_positions)
     df = add_vadp_and_tiers(df)
     df = add_suggested_draft_round(df)
-    df = cap_to_roster_demand(df)
+    df = cap_to_roster_demand(df, settings_dir=output_directory)
     
     all_players_df, hitters_df, pitchers_df, position_dfs = create_views(df)
-    export_to_excel(all_players_df, hitters_df, pitchers_df, position_dfs)
+    export_to_excel(all_players_df, hitters_df, pitchers_df, position_dfs, output_directory)
     
     return df
 
@@ -1,10 +1,10 @@
-from espn_api.baseball import League
-from espn_api.baseball.constant import POSITION_MAP
 import pandas as pd
 import json
 import re
 import requests
 
+from run_report import stage
+
 
 def remove_emojis(text):
     """Remove emojis from a string."""
@@ -130,6 +130,8 @@ def get_roster_settings(league_id, season, espn_s2, swid, output_dir="output"):
     Returns dict like {"C": 1, "1B": 1, "SP": 6, "RP": 3, ...}
     """
     try:
+        from espn_api.baseball import League
+        from espn_api.baseball.constant import POSITION_MAP
         league = League(league_id=league_id, year=season, espn_s2=espn_s2, swid=swid)
         # Access the raw league data for roster settings
         # The league object stores lineup slot counts from the settings
@@ -185,6 +187,7 @@ def get_scoring_settings(league_id, season, espn_s2, swid, output_dir="output"):
     """
     try:
         import requests, os
+        from espn_api.baseball.constant import POSITION_MAP
         cookies = {"espn_s2": espn_s2, "SWID": swid}
         url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/flb/seasons/{season}/segments/0/leagues/{league_id}"
         resp = requests.get(url, cookies=cookies, params={"view": "mSettings"})
@@ -224,8 +227,12 @@ def get_all_players(league_id, season, espn_s2, swid):
     Includes both rostered players and free agents.
     """
     try:
-        league = League(league_id=league_id, year=season, espn_s2=espn_s2, swid=swid)
-        adp_map = fetch_espn_adp_map(league_id, season, espn_s2, swid)
+        with stage("espn_league"):
+            from espn_api.baseball import League
+            league = League(league_id=league_id, year=season, espn_s2=espn_s2, swid=swid)
+        with stage("espn_adp") as st:
+            adp_map = fetch_espn_adp_map(league_id, season, espn_s2, swid)
+            st["rows"] = len(adp_map)
         all_players = []
         rostered_names = set()
 
@@ -235,7 +242,10 @@ def get_all_players(league_id, season, espn_s2, swid):
                 all_players.append(extract_player_info(player, team_name, adp_map))
                 rostered_names.add(player.name)
 
-        for player in league.free_agents(size=5000):
+        with stage("espn_free_agents") as st:
+            free_agents = league.free_agents(size=5000)
+            st["rows"] = len(free_agents)
+        for player in free_agents:
             if player.name not in rostered_names:
                 all_players.append(extract_player_info(player, "Free Agent", adp_map))
 
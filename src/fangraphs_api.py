@@ -1,17 +1,202 @@
+import codecs
+import json
+import os
+import threading
+import time
+from array import array
+
+import numpy as np
 import pandas as pd
 import requests
 
-def fetch_json_df(url, root_key=None):
-    """Fetch and return a DataFrame from a JSON API."""
+from config import PROJECTION_MODELS
+from run_report import in_context, stage
+
+# Raw FanGraphs fields consumed downstream: identifiers, rank_free_agents weights,
+# server _FA_COLS/_ROSTER_COLS, calculate_league_fpts scoring map, and the
+# position/role hints used by merge_data and the draft generator.
+FANGRAPHS_ID_FIELDS = ("playerid", "PlayerName", "Team", "TeamName", "minpos", "Position", "Pos")
+FANGRAPHS_STAT_FIELDS = (
+    "wOBA", "ISO", "wBsR", "AB", "wRC+", "PA", "G", "H", "1B", "2B", "3B", "HR", "R", "RBI",
+    "BB", "SO", "HBP", "SB", "CS", "AVG",
+    "K-BB%", "IP", "WHIP", "FIP", "ERA", "W", "L", "SV", "HLD", "QS", "ER", "GS",
+    "ADP",
+)
+FANGRAPHS_FIELDS = FANGRAPHS_ID_FIELDS + FANGRAPHS_STAT_FIELDS
+
+_CHUNK_SIZE = 1 << 16
+
+# (season, model or "current") -> (fetched_at, frames): preprocessed projections per model and
+# the current-season leaderboards. Shared by every league refreshed in this process; entries
+# older than FANGRAPHS_CACHE_TTL seconds (or the caller's max age) are refetched.
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _cache_ttl():
+    return float(os.getenv("FANGRAPHS_CACHE_TTL", "900"))
+
+
+def _cached(key, max_age=None):
+    with _cache_lock:
+        entry = _cache.get(key)
+    if entry is None or time.monotonic() - entry[0] > (_cache_ttl() if max_age is None else max_age):
+        return None
+    return entry[1]
+
+
+def _store(key, frames):
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), frames)
+
+
+def clear_cache(keep_projections=False):
+    """Drop cached FanGraphs data; with `keep_projections`, only the current-season leaderboards."""
+    with _cache_lock:
+        for key in [k for k in _cache if not keep_projections or k[1] == "current"]:
+            del _cache[key]
+
+
+def _iter_json_array(chunks, root_key=None):
+    """
+    Yield the elements of a top-level JSON array (or of the array under `root_key` in a
+    top-level object) one at a time from an iterable of byte chunks, without ever holding
+    the whole document in memory.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buf = buf[pos:] + utf8.decode(b"", final=True)
+        else:
+            buf = buf[pos:] + utf8.decode(chunk)
+        pos = 0
+
+    def peek():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                return ""
+            fill()
+
+    def value():
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                # A number at the end of the buffer may continue in the next chunk.
+                if end < len(buf) or eof or not isinstance(obj, (int, float)):
+                    pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            # Grow the pending text geometrically so small chunks don't re-parse quadratically.
+            want = 2 * (len(buf) - pos)
+            fill()
+            while not eof and len(buf) - pos < want:
+                fill()
+
+    def expect(ch):
+        nonlocal pos
+        if peek() != ch:
+            raise ValueError(f"expected {ch!r} in JSON stream")
+        pos += 1
+
+    if root_key is not None:
+        if peek() != "{":
+            return
+        expect("{")
+        while True:
+            if peek() == "}":
+                return
+            key = value()
+            expect(":")
+            if key == root_key:
+                break
+            value()
+            if peek() == ",":
+                expect(",")
+    if peek() != "[":
+        return
+    expect("[")
+    while True:
+        ch = peek()
+        if ch == "]" or ch == "":
+            return
+        if ch == ",":
+            expect(",")
+            continue
+        yield value()
+
+
+def _project_records(records, columns):
+    """
+    Collect only `columns` from dict records into typed column arrays (float64 where numeric).
+    Identifier fields always stay as Python objects so numeric ids don't become floats.
+    """
+    cols = {c: None for c in columns}
+    n = 0
+    for rec in records:
+        if not isinstance(rec, dict):
+            continue
+        for c in columns:
+            v = rec.get(c)
+            store = cols[c]
+            if store is None:
+                if v is None:
+                    continue
+                numeric = _is_number(v) and c not in FANGRAPHS_ID_FIELDS
+                store = cols[c] = array("d", [np.nan] * n) if numeric else [None] * n
+            if isinstance(store, array):
+                if v is None:
+                    store.append(np.nan)
+                    continue
+                if _is_number(v):
+                    store.append(v)
+                    continue
+                store = cols[c] = list(store)
+            store.append(v)
+        n += 1
+    data = {
+        c: (np.frombuffer(store, dtype=np.float64) if isinstance(store, array) else np.array(store, dtype=object))
+        for c, store in cols.items() if store is not None
+    }
+    return pd.DataFrame(data, index=pd.RangeIndex(n))
+
+
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def fetch_json_df(url, root_key=None, columns=FANGRAPHS_FIELDS, raise_errors=False):
+    """
+    Fetch a JSON API array into a DataFrame.
+    The body is parsed incrementally and only `columns` are kept (all columns when None).
+    A failed fetch returns an empty DataFrame, or re-raises with `raise_errors`.
+    """
     try:
-        data = requests.get(url).json()
-        if root_key is not None:
-            data = data.get(root_key, [])
-        if not isinstance(data, list):
-            return pd.DataFrame()
-        return pd.DataFrame(data)
+        with requests.get(url, stream=True, timeout=60) as resp:
+            resp.raise_for_status()
+            records = _iter_json_array(resp.iter_content(chunk_size=_CHUNK_SIZE), root_key)
+            if columns is None:
+                return pd.DataFrame(list(records))
+            return _project_records(records, columns)
     except Exception as e:
         print(f"ERROR: Failed to fetch {url}: {e}")
+        if raise_errors:
+            raise
         return pd.DataFrame()
 
 def prefix_stat_columns(df, prefix, exclude=("playerid", "name", "team", "position")):
@@ -45,15 +230,6 @@ def preprocess_fangraphs(df, mapping, prefix, position_value=None):
 
     return df
 
-PROJECTION_MODELS = {
-    "steamer":     {"label": "Steamer",       "ros": "steamerr",       "full": "steamer"},
-    "zips":        {"label": "ZiPS",          "ros": "zipss",          "full": "zips"},
-    "thebat":      {"label": "THE BAT",       "ros": "thebat",         "full": "thebat"},
-    "thebatx":     {"label": "THE BAT X",     "ros": "thebatx",        "full": "thebatx"},
-    "atc":         {"label": "ATC",           "ros": "atc",            "full": "atc"},
-    "fangraphsdc": {"label": "Depth Charts",  "ros": "fangraphsdcros", "full": "fangraphsdc"},
-}
-
 def _season_started(season: str) -> bool:
     from datetime import date
     try:
@@ -61,13 +237,12 @@ def _season_started(season: str) -> bool:
     except Exception:
         return False
 
-def get_fangraphs_merged_data(model: str = "steamer"):
-    import os
+def _season():
     from datetime import datetime
+    return os.getenv("SEASON", str(datetime.now().year))
 
-    season = os.getenv("SEASON", str(datetime.now().year))
-    model = model.strip("'\"")  # guard against quoted values in .env
-
+def _projection_type(model, season):
+    """Resolve a model name to the FanGraphs projection type to fetch (ROS when published)."""
     cfg = PROJECTION_MODELS.get(model)
     if cfg is None:
         print(f"WARNING: Unknown projection model '{model}', falling back to steamer")
@@ -76,39 +251,63 @@ def get_fangraphs_merged_data(model: str = "steamer"):
 
     # ATC has no separate ROS variant — use as-is
     if ros_type == full_type:
-        proj_type = full_type
-        print(f"INFO: Using {cfg['label']} projections ({proj_type})")
-    else:
-        test = fetch_json_df(f"https://www.fangraphs.com/api/projections?type={ros_type}&stats=bat&pos=all&team=0&players=0&lg=all")
-        if test.empty:
-            proj_type = full_type
-            if _season_started(season):
-                print(f"WARNING: Season is active but {ros_type} ROS projections are unavailable — falling back to preseason {full_type}. Rankings may be less accurate.")
-            else:
-                print(f"INFO: {ros_type} not yet published — using preseason {full_type} projections")
+        print(f"INFO: Using {cfg['label']} projections ({full_type})")
+        return full_type
+    test = fetch_json_df(f"https://www.fangraphs.com/api/projections?type={ros_type}&stats=bat&pos=all&team=0&players=0&lg=all", columns=("playerid",))
+    if test.empty:
+        if _season_started(season):
+            print(f"WARNING: Season is active but {ros_type} ROS projections are unavailable — falling back to preseason {full_type}. Rankings may be less accurate.")
         else:
-            proj_type = ros_type
-            print(f"INFO: Using {cfg['label']} rest-of-season projections ({proj_type})")
-
-    urls = {
-        "proj_bat": f"https://www.fangraphs.com/api/projections?type={proj_type}&stats=bat&pos=all&team=0&players=0&lg=all",
-        "proj_pit": f"https://www.fangraphs.com/api/projections?type={proj_type}&stats=pit&pos=all&team=0&players=0&lg=all",
-        "curr_bat": f"https://www.fangraphs.com/api/leaders/major-league/data?age=&pos=all&stats=bat&lg=all&qual=0&season={season}&season1={season}&startdate={season}-03-01&enddate={season}-11-01&month=0&hand=&team=0&pageitems=2000000000&pagenum=1&ind=0&rost=0&players=&type=26&postseason=&sortdir=default&sortstat=WAR",
-        "curr_pit": f"https://www.fangraphs.com/api/leaders/major-league/data?age=&pos=all&stats=pit&lg=all&qual=0&season={season}&season1={season}&startdate={season}-03-01&enddate={season}-11-01&month=0&hand=&team=0&pageitems=2000000000&pagenum=1&ind=0&rost=0&players=&type=26&postseason=&sortdir=default&sortstat=WAR",
-    }
+            print(f"INFO: {ros_type} not yet published — using preseason {full_type} projections")
+        return full_type
+    print(f"INFO: Using {cfg['label']} rest-of-season projections ({ros_type})")
+    return ros_type
+
+def fetch_current_stats(season=None):
+    """
+    Season-to-date batting and pitching leaderboards, preprocessed; shared by every projection model.
+    Raises when either leaderboard cannot be fetched, or when both come back empty after the
+    season has started, so an outage is not mistaken for the preseason.
+    """
+    season = season or _season()
+    base = (f"https://www.fangraphs.com/api/leaders/major-league/data?age=&pos=all&stats={{stats}}&lg=all&qual=0&season={season}&season1={season}&startdate={season}-03-01&enddate={season}-11-01&month=0&hand=&team=0&pageitems=2000000000&pagenum=1&ind=0&rost=0&players=&type=26&postseason=&sortdir=default&sortstat=WAR")
+    with stage("fangraphs_curr_bat") as st:
+        curr_bat = fetch_json_df(base.format(stats="bat"), root_key="data", raise_errors=True)
+        st["rows"] = len(curr_bat)
+    with stage("fangraphs_curr_pit") as st:
+        curr_pit = fetch_json_df(base.format(stats="pit"), root_key="data", raise_errors=True)
+        st["rows"] = len(curr_pit)
+    if curr_bat.empty and curr_pit.empty and _season_started(season):
+        raise RuntimeError(f"FanGraphs returned no {season} leaderboards although the season has started")
+    curr_bat = preprocess_fangraphs(curr_bat, {"PlayerName": "name", "TeamName": "team", "Position": "position"}, "curr_")
+    curr_pit = preprocess_fangraphs(curr_pit, {"PlayerName": "name", "TeamName": "team"}, "curr_", position_value="Pitcher")
+    return curr_bat, curr_pit
+
+def fetch_projections(model: str = "steamer", season=None):
+    """Batting and pitching projections for `model`, preprocessed, as (batters, pitchers)."""
+    season = season or _season()
+    proj_type = _projection_type(model, season)
+    raw = {}
+    for key, stats in (("proj_bat", "bat"), ("proj_pit", "pit")):
+        with stage(f"fangraphs_{key}") as st:
+            raw[key] = fetch_json_df(f"https://www.fangraphs.com/api/projections?type={proj_type}&stats={stats}&pos=all&team=0&players=0&lg=all")
+            st["rows"] = len(raw[key])
+    proj_bat = preprocess_fangraphs(raw["proj_bat"], {"PlayerName": "name", "minpos": "position", "Team": "team"}, "proj_")
+    proj_pit = preprocess_fangraphs(raw["proj_pit"], {"PlayerName": "name", "Team": "team"}, "proj_", position_value="Pitcher")
+    return proj_bat, proj_pit
+
+def get_fangraphs_merged_data(model: str = "steamer", current=None, projections=None):
+    """
+    Projections for `model` merged with current stats, as (batters, pitchers).
+    Pass `current` (from fetch_current_stats) and/or `projections` (from fetch_projections) to
+    reuse frames already fetched.
+    """
+    season = _season()
+    model = model.strip("'\"")  # guard against quoted values in .env
 
     try:
-        # --- Fetch raw data ---
-        proj_bat = fetch_json_df(urls["proj_bat"])
-        proj_pit = fetch_json_df(urls["proj_pit"])
-        curr_bat = fetch_json_df(urls["curr_bat"], root_key="data")
-        curr_pit = fetch_json_df(urls["curr_pit"], root_key="data")
-
-        # --- Normalize and preprocess ---
-        proj_bat = preprocess_fangraphs(proj_bat, {"PlayerName": "name", "minpos": "position", "Team": "team"}, "proj_")
-        proj_pit = preprocess_fangraphs(proj_pit, {"PlayerName": "name", "Team": "team"}, "proj_", position_value="Pitcher")
-        curr_bat = preprocess_fangraphs(curr_bat, {"PlayerName": "name", "TeamName": "team", "Position": "position"}, "curr_")
-        curr_pit = preprocess_fangraphs(curr_pit, {"PlayerName": "name", "TeamName": "team"}, "curr_", position_value="Pitcher")
+        proj_bat, proj_pit = projections if projections is not None else fetch_projections(model, season)
+        curr_bat, curr_pit = current if current is not None else fetch_current_stats(season)
 
         # --- Merge on playerid (handle empty current stats for preseason) ---
         if curr_bat.empty or "playerid" not in curr_bat.columns:
@@ -125,9 +324,52 @@ def get_fangraphs_merged_data(model: str = "steamer"):
             pit_df = pd.merge(proj_pit, curr_pit, on="playerid", how="outer")
             pit_df = unify_identifiers(pit_df)
 
-        print(f"INFO: Merged {len(bat_df)} batters and {len(pit_df)} pitchers.")
+        print(f"INFO: Merged {len(bat_df)} batters and {len(pit_df)} pitchers ({model}).")
         return bat_df, pit_df
 
     except Exception as e:
-        print(f"ERROR: Failed to process FanGraphs data: {e}")
+        print(f"ERROR: Failed to process FanGraphs data ({model}): {e}")
         return pd.DataFrame(), pd.DataFrame()
+
+def get_fangraphs_models_data(models, max_workers=4, projections_max_age=None):
+    """
+    Fetch several projection models concurrently, as {model: (batters, pitchers)}.
+    Current-season leaderboards are fetched once and shared by every model. Leaderboards and
+    projections are cached for FANGRAPHS_CACHE_TTL seconds so other leagues refreshed in the
+    same process reuse them; `projections_max_age` (seconds) overrides that for projections,
+    so frequent stat refreshes can keep projections that only change daily. Empty results are
+    not cached, and a failed leaderboard fetch raises (see fetch_current_stats).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    season = _season()
+    projections = {m: _cached((season, m), projections_max_age) for m in models}
+    missing = [m for m, cached in projections.items() if cached is None]
+    if len(missing) < len(models):
+        print(f"INFO: Reusing cached FanGraphs projections for {', '.join(m for m in models if m not in missing)}")
+    current = _cached((season, "current"))
+    if current is None:
+        current = fetch_current_stats(season)
+        if not (current[0].empty and current[1].empty):
+            _store((season, "current"), current)
+
+    def fetch(model):
+        with stage(f"fangraphs_{model}") as st:
+            try:
+                proj = fetch_projections(model.strip("'\""), season)
+            except Exception as e:
+                print(f"ERROR: Failed to fetch FanGraphs projections ({model}): {e}")
+                return None
+            st["rows"] = len(proj[0]) + len(proj[1])
+        if not (proj[0].empty and proj[1].empty):
+            _store((season, model), proj)
+        return proj
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fangraphs") as pool:
+            projections.update(zip(missing, pool.map(in_context(fetch), missing)))
+    empty = (pd.DataFrame(), pd.DataFrame())
+    return {
+        m: get_fangraphs_merged_data(m, current=current, projections=proj) if proj is not None else empty
+        for m, proj in projections.items()
+    }
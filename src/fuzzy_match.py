@@ -0,0 +1,119 @@
+"""
+Fuzzy matching for ESPN players left unmatched after the id, name/team and
+name-only merge passes.
+
+Candidates are blocked by (team, position class) so each unmatched player is
+only compared against the handful of FanGraphs players on the same club and
+side of the ball, never the whole pool.
+"""
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+import pandas as pd
+
+from normalization import normalize_name
+
+DEFAULT_THRESHOLD = 0.88
+
+_SUFFIX_RE = re.compile(r"\b(jr|sr|ii|iii|iv|v)\b")
+_PUNCT_RE = re.compile(r"[.'\-,]")
+
+# Common nickname -> given-name pairs seen between ESPN and FanGraphs.
+FIRST_NAME_ALIASES = {
+    "mike": "michael", "matt": "matthew", "nick": "nicholas", "chris": "christopher",
+    "alex": "alexander", "josh": "joshua", "jake": "jacob", "zach": "zachary",
+    "zack": "zachary", "dan": "daniel", "danny": "daniel", "tony": "anthony",
+    "joe": "joseph", "joey": "joseph", "will": "william", "bill": "william",
+    "rob": "robert", "bobby": "robert", "jon": "jonathan", "ben": "benjamin",
+    "sam": "samuel", "tom": "thomas", "tommy": "thomas", "andy": "andrew",
+    "drew": "andrew", "cam": "cameron", "jt": "j t", "aj": "a j", "cj": "c j",
+}
+
+
+@lru_cache(maxsize=65536)
+def fuzzy_key(name: str) -> str:
+    """Name key with punctuation, generational suffixes and first-name nicknames folded."""
+    key = _PUNCT_RE.sub(" ", normalize_name(name).replace(".", ""))
+    key = _SUFFIX_RE.sub(" ", key)
+    parts = key.split()
+    if parts:
+        parts[0] = FIRST_NAME_ALIASES.get(parts[0], parts[0])
+    return " ".join(" ".join(parts).split())
+
+
+def name_similarity(a: str, b: str) -> float:
+    ka, kb = fuzzy_key(a), fuzzy_key(b)
+    if ka == kb:
+        return 1.0
+    matcher = SequenceMatcher(None, ka, kb)
+    if matcher.quick_ratio() < 0.5:
+        return 0.0
+    return matcher.ratio()
+
+
+def position_class(value) -> str:
+    """'P' for pitchers, 'H' for everyone else; accepts ESPN slot lists or position strings."""
+    slots = value if isinstance(value, (list, tuple, set)) else [value]
+    for slot in slots:
+        s = str(slot).upper()
+        if "PITCHER" in s or s in {"P", "SP", "RP"}:
+            return "P"
+    return "H"
+
+
+def match_unmatched(espn: pd.DataFrame, fg: pd.DataFrame, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Match unmatched ESPN rows to unused FanGraphs rows within (team, position class) blocks.
+
+    Both frames need `name`, `clean_team` and a position column (`eligible_positions` or
+    `position`). Returns (matches, report): matches is a list of (espn_index, fg_index, score)
+    pairs assigned greedily by score; report is a DataFrame of ESPN rows left unmatched with
+    their best candidate below the threshold.
+    """
+    def block_keys(df: pd.DataFrame) -> pd.Series:
+        team = df["clean_team"].astype(object).where(df["clean_team"].notna(), "")
+        pos_col = "eligible_positions" if "eligible_positions" in df.columns else "position"
+        pos = df[pos_col].apply(position_class) if pos_col in df.columns else pd.Series("H", index=df.index)
+        return team.astype(str) + "|" + pos
+
+    espn_blocks = block_keys(espn)
+    fg_groups = {key: idx for key, idx in fg.groupby(block_keys(fg)).groups.items()}
+
+    scored = []
+    best = {}
+    for espn_idx, key in espn_blocks.items():
+        name = str(espn.at[espn_idx, "name"])
+        for fg_idx in fg_groups.get(key, []):
+            score = name_similarity(name, str(fg.at[fg_idx, "name"]))
+            if espn_idx not in best or score > best[espn_idx][1]:
+                best[espn_idx] = (fg_idx, score)
+            if score >= threshold:
+                scored.append((score, espn_idx, fg_idx))
+
+    matches = []
+    used_espn, used_fg = set(), set()
+    for score, espn_idx, fg_idx in sorted(scored, key=lambda t: t[0], reverse=True):
+        if espn_idx in used_espn or fg_idx in used_fg:
+            continue
+        used_espn.add(espn_idx)
+        used_fg.add(fg_idx)
+        matches.append((espn_idx, fg_idx, score))
+
+    report_rows = []
+    for espn_idx in espn.index:
+        if espn_idx in used_espn:
+            continue
+        fg_idx, score = best.get(espn_idx, (None, 0.0))
+        report_rows.append({
+            "player_id": espn.at[espn_idx, "player_id"] if "player_id" in espn.columns else None,
+            "name": espn.at[espn_idx, "name"],
+            "team": espn.at[espn_idx, "team"] if "team" in espn.columns else None,
+            "block": espn_blocks.at[espn_idx],
+            "fantasy_team": espn.at[espn_idx, "fantasy_team"] if "fantasy_team" in espn.columns else None,
+            "best_candidate": fg.at[fg_idx, "name"] if fg_idx is not None else None,
+            "best_score": round(score, 3),
+        })
+    report = pd.DataFrame(report_rows, columns=["player_id", "name", "team", "block", "fantasy_team",
+                                                "best_candidate", "best_score"])
+    return matches, report
@@ -0,0 +1,177 @@
+"""
+Append-only history of ranked snapshots, for score trends.
+
+Each refresh appends only the players whose tracked values changed since
+their last stored row, to a Parquet dataset partitioned by date:
+
+    <output_dir>/history/<model>/date=YYYY-MM-DD/part-<run_id>.parquet
+
+Two small files next to the partitions are rewritten on every append:
+`latest.parquet` (the last stored row per player, which new snapshots are
+diffed against) and `index.parquet` (player key -> partition file), so one
+player's series is read from just the files that hold it. Changed rows also
+carry the previous score values (`prev_*`), so a trend over a window only
+needs that window's partitions.
+
+Players are keyed by ESPN `player_id`, or by name when the id is missing.
+Requires pyarrow; without it appends are skipped with a warning and reads
+return empty frames.
+"""
+import datetime
+import importlib.util
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+# pandas' Parquet engine; looked up rather than imported so importing this module stays cheap.
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR = "history"
+LATEST_FILENAME = "latest.parquet"
+INDEX_FILENAME = "index.parquet"
+
+SCORE_COLUMNS = ("proj_CompositeScore", "curr_CompositeScore")
+TRACKED_COLUMNS = ("fantasy_team", "injury_status", "position") + SCORE_COLUMNS
+# Scores are compared at this precision so float noise between refreshes is not a change.
+_DECIMALS = 4
+
+_index_cache = {}
+
+
+def history_dir(output_dir: str, model: str) -> str:
+    return os.path.join(output_dir, HISTORY_DIR, model)
+
+
+def player_keys(df: pd.DataFrame) -> pd.Series:
+    """History key per snapshot row: ESPN player_id, else "name:<Name>"."""
+    names = "name:" + df["Name"].astype(str)
+    if "player_id" not in df.columns:
+        return names
+    ids = pd.to_numeric(df["player_id"], errors="coerce")
+    return ids.astype("Int64").astype(str).where(ids.notna(), names)
+
+
+def _tracked_frame(snapshot: pd.DataFrame) -> pd.DataFrame:
+    frame = pd.DataFrame({"key": player_keys(snapshot), "Name": snapshot["Name"].astype(str)})
+    for col in TRACKED_COLUMNS:
+        if col in SCORE_COLUMNS:
+            values = pd.to_numeric(snapshot[col], errors="coerce") if col in snapshot else np.nan
+            frame[col] = pd.Series(values, index=snapshot.index, dtype="float64").round(_DECIMALS)
+        else:
+            frame[col] = snapshot[col].fillna("").astype(str) if col in snapshot else ""
+    return frame.drop_duplicates("key", keep="first").reset_index(drop=True)
+
+
+def _changed(current: pd.DataFrame, latest: pd.DataFrame) -> pd.Series:
+    """Mask over `current`: new players, or any tracked value differs from `latest`."""
+    prev = latest.set_index("key").reindex(current["key"])
+    changed = pd.Series(prev["Name"].isna().to_numpy(), index=current.index)
+    for col in TRACKED_COLUMNS:
+        a, b = current[col].to_numpy(), prev[col].to_numpy()
+        if col in SCORE_COLUMNS:
+            a, b = a.astype("float64"), b.astype("float64")
+            changed |= ~((a == b) | (np.isnan(a) & np.isnan(b)))
+        else:
+            changed |= a != b
+    return changed
+
+
+def _read(path: str, **kwargs) -> pd.DataFrame:
+    return pd.read_parquet(path, **kwargs) if os.path.exists(path) else pd.DataFrame()
+
+
+def append_snapshot(snapshot: pd.DataFrame, output_dir: str, model: str, run_id: str,
+                    as_of: datetime.datetime | None = None) -> int:
+    """Append changed players from a ranked snapshot; returns the number of rows written."""
+    if not HAS_PYARROW:
+        logger.warning("pyarrow is not installed; skipping snapshot history")
+        return 0
+    if snapshot is None or snapshot.empty or "Name" not in snapshot.columns:
+        return 0
+    as_of = as_of or datetime.datetime.now()
+    root = history_dir(output_dir, model)
+    latest = _read(os.path.join(root, LATEST_FILENAME))
+    current = _tracked_frame(snapshot)
+    changes = current[_changed(current, latest)] if not latest.empty else current
+    if changes.empty:
+        return 0
+
+    prev = latest.set_index("key").reindex(changes["key"]) if not latest.empty else None
+    rows = changes.assign(as_of=pd.Timestamp(as_of), run_id=run_id)
+    for col in SCORE_COLUMNS:
+        rows[f"prev_{col}"] = prev[col].to_numpy() if prev is not None else np.nan
+
+    partition = os.path.join(f"date={as_of:%Y-%m-%d}", f"part-{run_id}.parquet")
+    os.makedirs(os.path.join(root, os.path.dirname(partition)), exist_ok=True)
+    rows.to_parquet(os.path.join(root, partition), index=False)
+
+    stored = rows[list(current.columns) + ["as_of"]]
+    if not latest.empty:
+        stored = pd.concat([latest[~latest["key"].isin(rows["key"])], stored], ignore_index=True)
+    latest = stored
+    latest.to_parquet(os.path.join(root, LATEST_FILENAME), index=False)
+
+    index_path = os.path.join(root, INDEX_FILENAME)
+    index = pd.concat([_read(index_path), pd.DataFrame({"key": rows["key"], "file": partition})], ignore_index=True)
+    index.to_parquet(index_path, index=False)
+    logger.info(f"History ({model}): {len(rows)} of {len(current)} players changed")
+    return len(rows)
+
+
+def _load_index(root: str) -> pd.DataFrame:
+    """Key -> partition file pairs, cached until index.parquet changes."""
+    path = os.path.join(root, INDEX_FILENAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return pd.DataFrame(columns=["key", "file"])
+    cached = _index_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, pd.read_parquet(path))
+        _index_cache[path] = cached
+    return cached[1]
+
+
+def player_key(row) -> str:
+    """History key for one snapshot row (dict or Series)."""
+    return player_keys(pd.DataFrame([dict(row)])).iloc[0]
+
+
+def player_history(output_dir: str, model: str, key: str) -> pd.DataFrame:
+    """Every stored version of one player, oldest first."""
+    if not HAS_PYARROW:
+        return pd.DataFrame()
+    root = history_dir(output_dir, model)
+    index = _load_index(root)
+    files = index.loc[index["key"] == key, "file"].drop_duplicates()
+    if files.empty:
+        return pd.DataFrame()
+    parts = [pd.read_parquet(os.path.join(root, f), filters=[("key", "==", key)]) for f in files]
+    return pd.concat(parts, ignore_index=True).sort_values("as_of", ignore_index=True)
+
+
+def score_trends(output_dir: str, model: str, days: int = 21, today: datetime.date | None = None) -> pd.DataFrame:
+    """
+    Net change in each score over the last `days` per player, for players that changed in the
+    window; players first seen inside the window are measured from that first row. Columns:
+    key, Name, <score>_change for each score, changes (rows stored in the window).
+    """
+    root = history_dir(output_dir, model)
+    if not HAS_PYARROW or not os.path.isdir(root):
+        return pd.DataFrame()
+    start = f"date={(today or datetime.date.today()) - datetime.timedelta(days=days):%Y-%m-%d}"
+    partitions = sorted(d for d in os.listdir(root) if d.startswith("date=") and d >= start)
+    files = [os.path.join(root, d, f) for d in partitions for f in sorted(os.listdir(os.path.join(root, d)))]
+    if not files:
+        return pd.DataFrame()
+    rows = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True).sort_values("as_of", kind="stable")
+    first = rows.drop_duplicates("key", keep="first").set_index("key")
+    last = rows.drop_duplicates("key", keep="last").set_index("key")
+    out = pd.DataFrame({"Name": last["Name"], "changes": rows.groupby("key").size()})
+    for col in SCORE_COLUMNS:
+        out[f"{col}_change"] = last[col] - first[f"prev_{col}"].fillna(first[col])
+    return out.rename_axis("key").reset_index()
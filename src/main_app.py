@@ -2,6 +2,7 @@
 Main Fantasy Baseball App - Modular Version
 """
 
+import importlib
 import os
 import sys
 import streamlit as st
@@ -12,21 +13,35 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 try:
     from config import PAGE_CONFIG, DEFAULT_TEAM, COLORS
     from styles import get_custom_css, get_hero_section
-    from data_utils import load_data
+    from data_utils import load_data, refresh_data
     from ui_components import create_metric_tile
-    from app_pages.add_drop_recommendations import show_add_drop_recommendations
-    from app_pages.best_free_agents import show_best_free_agents
-    from app_pages.drop_candidates import show_drop_candidates
-    from app_pages.team_overview import show_team_overview
-    from app_pages.player_comparison import show_player_comparison
-    from app_pages.waiver_trends import show_waiver_trends
-    from app_pages.league_analysis import show_league_analysis
-    from app_pages.draft_strategy import show_draft_strategy
 except ImportError as e:
     st.error(f"Import error: {e}")
     st.error("Please make sure all required modules are available.")
     st.stop()
 
+# Page modules are imported when first shown, so a rerun only loads the page on screen
+PAGES = {
+    "Add/Drop Recommendations": ("app_pages.add_drop_recommendations", "show_add_drop_recommendations"),
+    "Best Free Agents": ("app_pages.best_free_agents", "show_best_free_agents"),
+    "Drop Candidates": ("app_pages.drop_candidates", "show_drop_candidates"),
+    "Team Analysis": ("app_pages.team_overview", "show_team_overview"),
+    "Player Comparison": ("app_pages.player_comparison", "show_player_comparison"),
+    "Draft Strategy": ("app_pages.draft_strategy", "show_draft_strategy"),
+    "Waiver Trends": ("app_pages.waiver_trends", "show_waiver_trends"),
+    "League Analysis": ("app_pages.league_analysis", "show_league_analysis"),
+}
+
+def load_page(page_key):
+    """Import and return the render function for a page"""
+    module_name, func_name = PAGES[page_key]
+    try:
+        return getattr(importlib.import_module(module_name), func_name)
+    except ImportError as e:
+        st.error(f"Import error: {e}")
+        st.error("Please make sure all required modules are available.")
+        st.stop()
+
 def main():
     """Main application function"""
     # Configure Streamlit
@@ -105,23 +120,7 @@ def main():
             
             # Data update button
             if st.button("Update Data", use_container_width=True, key="mobile_update_data"):
-                with st.spinner("Updating data..."):
-                    try:
-                        import subprocess
-                        import sys
-                        result = subprocess.run(
-                            [sys.executable, "./src/main.py"],
-                            check=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                            cwd="."
-                        )
-                        st.success("Data updated successfully")
-                        st.rerun()
-                    except subprocess.CalledProcessError as e:
-                        st.error("Update failed")
-                        st.code(e.stderr or "No error output")
+                refresh_data()
         
         st.markdown('</div>', unsafe_allow_html=True)
         st.markdown("---")
@@ -134,23 +133,7 @@ def main():
         
         # Data update button
         if st.button("Update Data", help="Fetch latest data from ESPN and FanGraphs", use_container_width=True):
-            with st.spinner("Updating data..."):
-                try:
-                    import subprocess
-                    import sys
-                    result = subprocess.run(
-                        [sys.executable, "./src/main.py"],
-                        check=True,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        cwd="."
-                    )
-                    st.success("Data updated successfully")
-                    st.rerun()
-                except subprocess.CalledProcessError as e:
-                    st.error("Update failed")
-                    st.code(e.stderr or "No error output")
+            refresh_data()
         
         st.markdown("---")
         
@@ -247,22 +230,22 @@ def main():
     # Remove duplicate page titles - let each page handle its own title
     
     if st.session_state.current_page == "Add/Drop Recommendations":
-        show_add_drop_recommendations(team_df, fa_df)
+        load_page("Add/Drop Recommendations")(team_df, fa_df)
     elif st.session_state.current_page == "Best Free Agents":
-        show_best_free_agents(fa_df)
+        load_page("Best Free Agents")(fa_df)
     elif st.session_state.current_page == "Drop Candidates":
-        show_drop_candidates(team_df)
+        load_page("Drop Candidates")(team_df)
     # Trade Finder tab has been removed
     elif st.session_state.current_page == "Team Analysis":
-        show_team_overview(team_df, fa_df)
+        load_page("Team Analysis")(team_df, fa_df)
     elif st.session_state.current_page == "Player Comparison":
-        show_player_comparison(df)
+        load_page("Player Comparison")(df)
     elif st.session_state.current_page == "Draft Strategy":
-        show_draft_strategy(df)
+        load_page("Draft Strategy")(df)
     elif st.session_state.current_page == "Waiver Trends":
-        show_waiver_trends(fa_df)
+        load_page("Waiver Trends")(fa_df)
     elif st.session_state.current_page == "League Analysis":
-        show_league_analysis(df, selected_team)
+        load_page("League Analysis")(df, selected_team)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -0,0 +1,109 @@
+"""
+Name and team normalization shared by the ESPN/FanGraphs merge and ranking steps.
+
+Keys are computed once per distinct value and broadcast back to rows, so the
+cost scales with the number of unique names/teams rather than with row count.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Comprehensive team abbreviation mapping (all common aliases to 3-letter codes)
+TEAM_ABBREVIATION_MAP = {
+    # Arizona Diamondbacks
+    "ari": "ari", "az": "ari", "arizona": "ari", "diamondbacks": "ari", "d-backs": "ari", "dbacks": "ari",
+    # Atlanta Braves
+    "atl": "atl", "atlanta": "atl", "braves": "atl",
+    # Baltimore Orioles
+    "bal": "bal", "baltimore": "bal", "orioles": "bal",
+    # Boston Red Sox
+    "bos": "bos", "boston": "bos", "red sox": "bos", "redsox": "bos",
+    # Chicago Cubs
+    "chc": "chc", "cubs": "chc", "chi": "chc",
+    # Chicago White Sox
+    "cws": "cws", "white sox": "cws", "whitesox": "cws",
+    # Cincinnati Reds
+    "cin": "cin", "reds": "cin", "cincinnati": "cin",
+    # Cleveland Guardians
+    "cle": "cle", "cleveland": "cle", "guardians": "cle", "indians": "cle",
+    # Colorado Rockies
+    "col": "col", "rockies": "col", "colorado": "col",
+    # Detroit Tigers
+    "det": "det", "tigers": "det", "detroit": "det",
+    # Houston Astros
+    "hou": "hou", "astros": "hou", "houston": "hou",
+    # Kansas City Royals
+    "kc": "kcr", "kcr": "kcr", "royals": "kcr", "kansas city": "kcr",
+    # Los Angeles Angels
+    "laa": "ana", "ana": "ana", "angels": "ana", "los angeles angels": "ana",
+    # Los Angeles Dodgers
+    "lad": "lad", "dodgers": "lad", "los angeles dodgers": "lad",
+    # Miami Marlins
+    "mia": "mia", "marlins": "mia", "miami": "mia",
+    # Milwaukee Brewers
+    "mil": "mil", "brewers": "mil", "milwaukee": "mil",
+    # Minnesota Twins
+    "min": "min", "twins": "min", "minnesota": "min",
+    # New York Yankees
+    "nyy": "nyy", "yankees": "nyy", "new york yankees": "nyy",
+    # New York Mets
+    "nym": "nym", "mets": "nym", "new york mets": "nym",
+    # Oakland Athletics
+    "oak": "oak", "athletics": "oak", "a's": "oak", "as": "oak", "oakland": "oak",
+    # Philadelphia Phillies
+    "phi": "phi", "phillies": "phi", "philadelphia": "phi",
+    # Pittsburgh Pirates
+    "pit": "pit", "pirates": "pit", "pittsburgh": "pit",
+    # San Diego Padres
+    "sd": "sdg", "sdg": "sdg", "sdp": "sdg", "padres": "sdg", "san diego": "sdg",
+    # Seattle Mariners
+    "sea": "sea", "mariners": "sea", "seattle": "sea",
+    # San Francisco Giants
+    "sf": "sf", "sfg": "sf", "giants": "sf", "san francisco": "sf",
+    # St. Louis Cardinals
+    "stl": "stl", "cards": "stl", "cardinals": "stl", "st. louis": "stl",
+    # Tampa Bay Rays
+    "tbr": "tb", "tb": "tb", "rays": "tb", "tampa bay": "tb",
+    # Texas Rangers
+    "tex": "tex", "rangers": "tex", "texas": "tex",
+    # Toronto Blue Jays
+    "tor": "tor", "blue jays": "tor", "bluejays": "tor", "toronto": "tor",
+    # Washington Nationals
+    "was": "wsh", "wsh": "wsh", "nationals": "wsh", "washington": "wsh"
+}
+
+TEAM_CODES = sorted(set(TEAM_ABBREVIATION_MAP.values()))
+TEAM_DTYPE = pd.CategoricalDtype(TEAM_CODES)
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(name: str) -> str:
+    """ASCII-fold, lowercase and strip a player name (memoized across refreshes)."""
+    from unidecode import unidecode  # deferred: only refreshes need it
+    return unidecode(name).lower().strip()
+
+
+def name_keys(names: pd.Series) -> pd.Series:
+    """Normalized name key per row; each distinct name is normalized once."""
+    codes, uniques = pd.factorize(names, use_na_sentinel=False)
+    keys = np.array([normalize_name(str(u)) for u in uniques], dtype=object)
+    return pd.Series(keys[codes], index=names.index, dtype=object)
+
+
+def team_keys(teams: pd.Series, keep_unmapped: bool = False) -> pd.Series:
+    """
+    Canonical team code per row as a categorical over TEAM_CODES.
+    Unknown teams become NaN, or their lowercased value when keep_unmapped is set
+    (the result is then a plain object Series).
+    """
+    codes, uniques = pd.factorize(teams, use_na_sentinel=True)
+    lowered = pd.Series(uniques, dtype=object).str.lower()
+    mapped = lowered.map(TEAM_ABBREVIATION_MAP)
+    if keep_unmapped:
+        keys = mapped.fillna(lowered).to_numpy(dtype=object)
+        out = np.where(codes >= 0, keys[codes] if len(keys) else None, np.nan)
+        return pd.Series(out, index=teams.index, dtype=object)
+    cat_codes = pd.Categorical(mapped, dtype=TEAM_DTYPE).codes
+    out_codes = np.where(codes >= 0, cat_codes[codes] if len(cat_codes) else -1, -1)
+    return pd.Series(pd.Categorical.from_codes(out_codes, dtype=TEAM_DTYPE), index=teams.index)
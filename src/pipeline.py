@@ -0,0 +1,283 @@
+"""
+Importable refresh pipeline: ESPN pull -> FanGraphs pull -> merge/rank -> timestamped CSV.
+
+`run_refresh()` runs one refresh in the calling process and hands back the
+ranked frame alongside the files it wrote, so the FastAPI server and the
+Streamlit app can refresh without spawning a new interpreter. main.py is the
+command-line wrapper. League credentials are read from the environment when a
+refresh starts, not at import time.
+
+Each refresh ranks every projection model in REFRESH_MODELS (default: all of
+PROJECTION_MODELS). ESPN and the current-season FanGraphs leaderboards are
+fetched once, projections are fetched concurrently, and each model's ranking
+is written to output/models/<model>/. The primary model (PROJECTION_MODEL)
+is also written to output/ itself, where the Streamlit app and older tools
+look for it. Players whose scores or status changed are appended to the
+Parquet history under output/history/<model>/ (see history.py), and each
+model's change set against its previous snapshot is saved beside the new CSV
+(see snapshot_diff.py).
+
+With LEAGUES set, `run_refresh_all()` refreshes each league into
+output/leagues/<league_id>/ (same layout as output/). FanGraphs data is cached
+in-process, so every league after the first costs one ESPN fetch and a merge.
+The learned player crosswalk is league-independent and stays in output/.
+"""
+import os
+import logging
+import datetime
+import shutil
+import pandas as pd
+from dotenv import load_dotenv
+from analysis import (
+    merge_data,
+    rank_free_agents,
+    determine_position
+)
+from config import PROJECTION_MODELS, configured_leagues
+from crosswalk import learn_matches, load_crosswalk, save_crosswalk
+from espn_data import get_all_players, get_roster_settings, get_scoring_settings
+from fangraphs_api import get_fangraphs_models_data
+from history import append_snapshot
+from snapshot_diff import save_changes
+from run_report import RunReport, recording, stage
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = "output"
+UNMATCHED_REPORT = "unmatched_players.csv"
+
+# --- Configuration ---
+def get_env_var(name, default=None, required=True, var_type=str):
+    val = os.getenv(name, default)
+    if required and val is None:
+        raise ValueError(f"{name} is required but missing from .env.")
+    try:
+        return var_type(val)
+    except ValueError:
+        raise ValueError(f"{name} must be of type {var_type.__name__}.")
+
+def refresh_models(primary):
+    """Models ranked on each refresh, primary first: REFRESH_MODELS (comma-separated) or all of them."""
+    names = [m.strip().strip("'\"") for m in os.getenv("REFRESH_MODELS", "").split(",") if m.strip()]
+    unknown = [m for m in names if m not in PROJECTION_MODELS]
+    if unknown:
+        logger.warning(f"Ignoring unknown models in REFRESH_MODELS: {', '.join(unknown)}")
+    names = [m for m in names if m in PROJECTION_MODELS] or list(PROJECTION_MODELS)
+    return [primary] + [m for m in names if m != primary]
+
+def load_config(model=None, league_id=None):
+    """League credentials and projection models from the environment / .env."""
+    load_dotenv()
+    model = (model or os.getenv("PROJECTION_MODEL", "steamer")).strip("'\"")
+    return {
+        "league_id": int(league_id) if league_id else get_env_var("LEAGUE_ID", var_type=int),
+        "season": get_env_var("SEASON", var_type=int),
+        "swid": get_env_var("SWID"),
+        "espn_s2": get_env_var("ESPN_S2"),
+        "model": model,
+        "models": refresh_models(model),
+    }
+
+def model_output_dir(output_dir, model):
+    return os.path.join(output_dir, "models", model)
+
+def league_output_dir(output_dir, league_id):
+    return os.path.join(output_dir, "leagues", str(league_id))
+
+# --- Helpers ---
+def add_clean_position(df):
+    if "eligible_positions" in df.columns:
+        df["clean_position"] = df["eligible_positions"].apply(determine_position)
+    elif "position" in df.columns:
+        logger.warning("Missing 'eligible_positions'. Using 'position'.")
+        df["clean_position"] = df["position"].apply(lambda p: determine_position([p]))
+    else:
+        logger.warning("Missing both 'eligible_positions' and 'position'. Defaulting to Unknown.")
+        df["clean_position"] = "Unknown"
+    return df
+
+def filter_position_groups(df):
+    df = add_clean_position(df)
+    hitters = df[~df["clean_position"].str.contains("Pitcher", na=False)].copy()
+    pitchers = df[df["clean_position"].str.contains("Pitcher", na=False)].copy()
+    return hitters, pitchers
+
+def remove_redundant_columns(df):
+    to_remove = ["clean_name", "clean_team", "name_fa", "name_proj",
+                 "team_fa", "team_proj", "position_fa", "position_proj", "eligible_positions"]
+    return df.drop(columns=[col for col in to_remove if col in df.columns], errors="ignore")
+
+def prepare_output_dataframe(df, all_columns=False):
+    df = remove_redundant_columns(df)
+    preferred = ["Name", "Team", "fantasy_team", "position", "injury_status", "fantasy_points"]
+    proj = ["proj_CompositeScore", "proj_ADP", "proj_AB", "proj_wOBA", "proj_ISO", "proj_wBsR",
+            "proj_FIP", "proj_K-BB%", "proj_WHIP", "proj_IP", "proj_SV"]
+    curr = ["curr_CompositeScore", "curr_AB", "curr_wOBA", "curr_ISO", "curr_wBsR",
+            "curr_FIP", "curr_K-BB%", "curr_WHIP", "curr_IP", "curr_SV"]
+
+    columns = [c for c in preferred if c in df.columns] + [c for c in proj + curr if c in df.columns]
+    if all_columns:
+        columns += [col for col in df.columns if col not in columns]
+
+    df = df[columns]
+    round_map = {"proj_CompositeScore": 2, "proj_wOBA": 3, "proj_ISO": 3, "proj_wBsR": 2,
+                 "proj_FIP": 2, "proj_K-BB%": 2, "proj_WHIP": 2, "proj_IP": 1, "proj_SV": 1,
+                 "curr_CompositeScore": 2, "curr_wOBA": 3, "curr_ISO": 3, "curr_wBsR": 2,
+                 "curr_FIP": 2, "curr_K-BB%": 2, "curr_WHIP": 2, "curr_IP": 1, "curr_SV": 1}
+    return df.round({col: digits for col, digits in round_map.items() if col in df.columns})
+
+def save_dataframe(df, prefix, all_columns=False, timestamp=None, output_dir=OUTPUT_DIR):
+    """Write the formatted frame to <output_dir>/<prefix>_<timestamp>.csv; returns (path, formatted)."""
+    if df.empty:
+        logger.warning(f"No data to save for: {prefix}")
+        return None, None
+
+    timestamp = timestamp or datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = os.path.join(output_dir, f"{prefix}_{timestamp}.csv")
+    formatted = prepare_output_dataframe(df, all_columns=all_columns)
+    formatted.to_csv(filename, index=False)
+    logger.info(f"Saved: {filename}")
+    return filename, formatted
+
+def save_unmatched_report(reports, output_dir=OUTPUT_DIR):
+    path = os.path.join(output_dir, UNMATCHED_REPORT)
+    report = pd.concat(reports, ignore_index=True) if reports else pd.DataFrame()
+    report.to_csv(path, index=False)
+    rostered = report["fantasy_team"].fillna("").ne("Free Agent").sum() if "fantasy_team" in report else 0
+    logger.info(f"{len(report)} ESPN players have no FanGraphs match ({rostered} rostered): {path}")
+
+# --- Data Flow ---
+def fetch_data(config, output_dir=OUTPUT_DIR, projections_max_age=None):
+    league_id, season, espn_s2, swid = config["league_id"], config["season"], config["espn_s2"], config["swid"]
+    logger.info("Fetching players from ESPN...")
+    with stage("espn_players") as st:
+        fa_df = get_all_players(league_id, season, espn_s2, swid)
+        st["rows"] = len(fa_df)
+    if fa_df.empty:
+        logger.error("No players retrieved from ESPN.")
+        return None, None
+
+    logger.info("Fetching roster settings from ESPN...")
+    with stage("espn_roster_settings"):
+        get_roster_settings(league_id, season, espn_s2, swid, output_dir)
+
+    logger.info("Fetching scoring settings from ESPN...")
+    with stage("espn_scoring_settings"):
+        get_scoring_settings(league_id, season, espn_s2, swid, output_dir)
+
+    models = config["models"]
+    logger.info(f"Fetching FanGraphs projections and stats (models: {', '.join(models)})...")
+    with stage("fangraphs") as st:
+        projections = get_fangraphs_models_data(models, projections_max_age=projections_max_age)
+        st["rows"] = sum(len(bat_df) + len(pit_df) for bat_df, pit_df in projections.values())
+    for model, (bat_df, pit_df) in list(projections.items()):
+        if bat_df.empty and pit_df.empty:
+            logger.error(f"FanGraphs returned empty data for {model}.")
+            del projections[model]
+    if not projections:
+        return None, None
+
+    return fa_df, projections
+
+def process_data(fa_df, bat_df, pit_df, output_dir=OUTPUT_DIR, report_dir=None):
+    hitters, pitchers = filter_position_groups(fa_df)
+    crosswalk = load_crosswalk(output_dir)
+    unmatched = []
+    with stage("merge_hitters") as st:
+        merged_hitters = merge_data(hitters, bat_df, crosswalk, unmatched_report=unmatched)
+        st["rows"] = len(merged_hitters)
+    with stage("merge_pitchers") as st:
+        merged_pitchers = merge_data(pitchers, pit_df, crosswalk, unmatched_report=unmatched)
+        st["rows"] = len(merged_pitchers)
+    save_unmatched_report(unmatched, report_dir or output_dir)
+
+    if merged_hitters.empty and merged_pitchers.empty:
+        logger.error("Merged datasets are empty.")
+        return None
+
+    learned = learn_matches(crosswalk, merged_hitters) + learn_matches(crosswalk, merged_pitchers)
+    if learned:
+        save_crosswalk(crosswalk, output_dir)
+        logger.info(f"Crosswalk updated with {learned} player id matches ({len(crosswalk)} total).")
+
+    merged_all = pd.concat([merged_hitters, merged_pitchers], ignore_index=True)
+    with stage("rank_free_agents") as st:
+        ranked = rank_free_agents(merged_all)
+        st["rows"] = len(ranked)
+    return ranked
+
+# --- Orchestration ---
+def run_refresh(output_dir=OUTPUT_DIR, model=None, league_id=None, projections_max_age=None):
+    """
+    Run one full refresh in this process. With `league_id`, that league is refreshed into
+    output/leagues/<league_id>/ instead of the LEAGUE_ID league into output/. Projections cached
+    in this process are reused while younger than `projections_max_age` seconds (default
+    FANGRAPHS_CACHE_TTL); ESPN data is always refetched.
+
+    Returns a dict with `status` ("ok", "no_data" or "error"), `error`, `snapshot` (the primary
+    model's ranked frame exactly as written to CSV, or None), `csv_path`, `report_path` and
+    `models` ({model: {"snapshot", "csv_path"}} for every model that ranked). The status is
+    "ok" when the primary model ranked; other models that fail are logged and left out.
+    """
+    league_dir = league_output_dir(output_dir, league_id) if league_id else output_dir
+    os.makedirs(league_dir, exist_ok=True)
+    run_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    result = {"status": "ok", "error": None, "snapshot": None, "csv_path": None, "report_path": None, "models": {}}
+    report = RunReport(model=model or os.getenv("PROJECTION_MODEL", "steamer"))
+    with recording(report):
+        try:
+            config = load_config(model, league_id)
+            report.meta.update(league_id=config["league_id"], season=config["season"], models=config["models"])
+            with stage("fetch_data"):
+                fa_df, projections = fetch_data(config, league_dir, projections_max_age)
+            for name, (bat_df, pit_df) in (projections or {}).items():
+                model_dir = model_output_dir(league_dir, name)
+                os.makedirs(model_dir, exist_ok=True)
+                with stage(f"process_data_{name}") as st:
+                    ranked = process_data(fa_df, bat_df, pit_df, output_dir, report_dir=model_dir)
+                    st["rows"] = 0 if ranked is None else len(ranked)
+                if ranked is None:
+                    continue
+                with stage(f"save_dataframe_{name}"):
+                    csv_path, snapshot = save_dataframe(
+                        ranked, "free_agents_ranked", all_columns=True, timestamp=run_id, output_dir=model_dir)
+                    result["models"][name] = {"snapshot": snapshot, "csv_path": csv_path}
+                with stage(f"diff_{name}"):
+                    try:
+                        save_changes(snapshot, csv_path)
+                    except Exception as e:
+                        logger.warning(f"Could not diff {name} against the previous snapshot: {e}")
+                with stage(f"history_{name}") as st:
+                    try:
+                        st["rows"] = append_snapshot(snapshot, league_dir, name, run_id)
+                    except Exception as e:
+                        logger.warning(f"Could not append {name} history: {e}")
+                if name == config["model"]:
+                    result["csv_path"] = os.path.join(league_dir, os.path.basename(csv_path))
+                    result["snapshot"] = snapshot
+                    shutil.copyfile(csv_path, result["csv_path"])
+                    shutil.copyfile(os.path.join(model_dir, UNMATCHED_REPORT), os.path.join(league_dir, UNMATCHED_REPORT))
+            if result["snapshot"] is None:
+                result["status"] = "no_data"
+            else:
+                logger.info(f"Free agent rankings complete ({', '.join(result['models'])}).")
+        except Exception as e:
+            result["status"], result["error"] = "error", str(e)
+            logger.exception(f"Fatal error during execution: {e}")
+    report.status, report.error = result["status"], result["error"]
+    report.log_summary()
+    result["report_path"] = report.save(league_dir, run_id)
+    logger.info(f"Run report: {result['report_path']}")
+    return result
+
+def run_refresh_all(output_dir=OUTPUT_DIR, model=None):
+    """Refresh every league in LEAGUES (or the single LEAGUE_ID league); returns {league_id: result}."""
+    load_dotenv()
+    leagues = configured_leagues()
+    if not leagues:
+        return {None: run_refresh(output_dir, model)}
+    results = {}
+    for league_id, label in leagues.items():
+        logger.info(f"Refreshing {label} ({league_id})...")
+        results[league_id] = run_refresh(output_dir, model, league_id=league_id)
+    return results
@@ -0,0 +1,50 @@
+"""
+Player helpers shared by the Streamlit app and the FastAPI server.
+
+Kept free of Streamlit so the server can import them without loading it.
+"""
+
+import pandas as pd
+from config import PITCHER_ROLES, HITTER_ROLES, POSITION_VARIATIONS
+
+def expand_positions(pos_str):
+    """Convert position string to list of positions"""
+    if not isinstance(pos_str, str) or pos_str.strip() == "":
+        return []
+    
+    # Clean up the position string
+    pos_str = pos_str.upper().replace("\n", " ").replace("/", " ").replace(",", " ")
+    positions = [p.strip() for p in pos_str.split() if p.strip()]
+    
+    normalized = set()
+    
+    for pos in positions:
+        pos = pos.strip()
+        if pos in PITCHER_ROLES:
+            normalized.add("P")
+        elif pos in HITTER_ROLES:
+            normalized.add(pos)
+        elif pos in POSITION_VARIATIONS:
+            normalized.add(POSITION_VARIATIONS[pos])
+    
+    return list(normalized)
+
+def can_play_position(player_positions, target_position):
+    """Check if player can play target position"""
+    if not isinstance(player_positions, list):
+        return False
+    return target_position in player_positions
+
+def format_player_name(row):
+    """Format player name with injury status"""
+    name = row.get("Name", "Unknown")
+    injury = row.get("injury_status", "")
+    
+    # Handle NaN values and convert to string
+    if pd.isna(injury) or injury == "":
+        return name
+    
+    injury_str = str(injury).strip()
+    if injury_str and injury_str.upper() not in ["ACTIVE", "HEALTHY", ""]:
+        return f"{name} ({injury_str})"
+    return name
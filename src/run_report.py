@@ -0,0 +1,248 @@
+"""
+Per-stage timing and resource report for a data refresh.
+
+pipeline.run_refresh opens a RunReport for each refresh and wraps its stages in
+`stage(name)`; fetch helpers in espn_data and fangraphs_api add their own
+sub-stages the same way, and are no-ops when no report is recording. Each
+stage records wall time, bytes downloaded through `requests`, an optional
+row count, its peak resident memory, and the resident memory when it
+finished with how much that grew during the stage. On Linux the peak is the
+kernel's high-water mark (VmHWM), reset at every stage boundary; elsewhere a
+sampler thread polls RSS while a report is recording. The report is written as
+output/run_report_<timestamp>.json alongside the ranked CSV of the same run.
+
+Stages may run on worker threads: submit them through `in_context` so they
+nest under the stage that started them. Each stage counts only the downloads
+made in its own context (its own thread, and workers it started through
+`in_context`); RSS peaks and deltas of stages that overlap in time include
+each other's allocations.
+"""
+import contextvars
+import datetime
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+import tracing
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+REPORT_PREFIX = "run_report_"
+
+_active = None
+_lock = threading.Lock()
+_original_send = requests.Session.send
+_depth = contextvars.ContextVar("stage_depth", default=0)
+# Byte counters of the stages open in this context, outermost first; a download adds to each.
+_byte_counters = contextvars.ContextVar("stage_byte_counters", default=())
+# Peak RSS in MB of every open stage on any thread, keyed by id(stage info); guarded by _lock.
+_open_peaks = {}
+# Highest VmHWM read before a reset, since resetting it also lowers ru_maxrss.
+_lifetime_hwm_mb = 0.0
+_hwm_resettable = None
+SAMPLE_INTERVAL = 0.05
+
+
+def rss_mb() -> float | None:
+    """Current resident set size of this process in MB from /proc, or None where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size over the whole life of this process in MB, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere.
+    peak = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return round(max(peak, _lifetime_hwm_mb), 1)
+
+
+def _read_hwm_mb() -> float | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reset_hwm() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _hwm_supported() -> bool:
+    """Whether this process can read and reset its RSS high-water mark (Linux 4.0+)."""
+    global _hwm_resettable
+    if _hwm_resettable is None:
+        _hwm_resettable = _read_hwm_mb() is not None and os.access("/proc/self/clear_refs", os.W_OK)
+    return _hwm_resettable
+
+
+def _fold_peak() -> None:
+    """Fold the RSS peak since the previous call into every open stage. Call with _lock held."""
+    global _hwm_resettable, _lifetime_hwm_mb
+    peak = _read_hwm_mb() if _hwm_supported() else None
+    if peak is not None:
+        _lifetime_hwm_mb = max(_lifetime_hwm_mb, peak)
+        if not _reset_hwm():
+            _hwm_resettable = False
+    else:
+        peak = rss_mb()
+    if peak is not None:
+        for key, value in _open_peaks.items():
+            _open_peaks[key] = max(value, peak)
+
+
+def _sample_rss(stop: threading.Event) -> None:
+    while not stop.wait(SAMPLE_INTERVAL):
+        with _lock:
+            _fold_peak()
+
+
+def _count(n: int) -> None:
+    with _lock:
+        for counter in _byte_counters.get():
+            counter[0] += n
+
+
+def _counting_send(self, request, **kwargs):
+    resp = _original_send(self, request, **kwargs)
+    if kwargs.get("stream"):
+        iter_content = resp.iter_content
+
+        def counted(*args, **kw):
+            for chunk in iter_content(*args, **kw):
+                _count(len(chunk))
+                yield chunk
+
+        resp.iter_content = counted
+    else:
+        _count(len(resp.content or b""))
+    return resp
+
+
+class RunReport:
+    def __init__(self, **meta):
+        self.started = datetime.datetime.now()
+        self.meta = meta
+        self.stages = []
+        self.status = "ok"
+        self.error = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a stage; the yielded dict accepts extra fields such as `rows`."""
+        info = {"name": name, "depth": _depth.get()}
+        self.stages.append(info)
+        start, start_rss, downloaded = time.perf_counter(), rss_mb(), [0]
+        token = _depth.set(info["depth"] + 1)
+        counters_token = _byte_counters.set(_byte_counters.get() + (downloaded,))
+        with _lock:
+            _fold_peak()
+            _open_peaks[id(info)] = start_rss or 0.0
+        try:
+            yield info
+        finally:
+            _byte_counters.reset(counters_token)
+            _depth.reset(token)
+            info["seconds"] = round(time.perf_counter() - start, 3)
+            info["bytes_downloaded"] = downloaded[0]
+            with _lock:
+                _fold_peak()
+                peak = _open_peaks.pop(id(info))
+            info["peak_rss_mb"] = round(peak, 1) if peak else None
+            info["rss_mb"] = rss_mb()
+            info["rss_delta_mb"] = (round(info["rss_mb"] - start_rss, 1)
+                                    if info["rss_mb"] is not None and start_rss is not None else None)
+
+    def to_dict(self) -> dict:
+        total = round((datetime.datetime.now() - self.started).total_seconds(), 3)
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "seconds": total,
+            "status": self.status,
+            "error": self.error,
+            "rss_mb": rss_mb(),
+            "process_peak_rss_mb": peak_rss_mb(),
+            **self.meta,
+            "stages": self.stages,
+        }
+
+    def save(self, output_dir: str, run_id: str) -> str:
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"{REPORT_PREFIX}{run_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"run_id": run_id, **self.to_dict()}, f, indent=2)
+        return path
+
+    def log_summary(self) -> None:
+        for s in self.stages:
+            rows = f", {s['rows']} rows" if "rows" in s else ""
+            logger.info(
+                f"{'  ' * s['depth']}{s['name']}: {s['seconds']:.2f}s, "
+                f"{s['bytes_downloaded'] / 1e6:.1f} MB downloaded{rows}"
+            )
+
+
+@contextmanager
+def recording(report: RunReport):
+    """
+    Make `report` the target of module-level stage() calls and count HTTP bytes while active;
+    where the RSS high-water mark cannot be reset, sample RSS for stage peaks meanwhile.
+    """
+    global _active
+    previous = _active
+    _active = report
+    requests.Session.send = _counting_send
+    sampler = None
+    if previous is None and not _hwm_supported():
+        sampler = threading.Event()
+        threading.Thread(target=_sample_rss, args=(sampler,), name="rss-sampler", daemon=True).start()
+    try:
+        yield report
+    finally:
+        _active = previous
+        if sampler is not None:
+            sampler.set()
+        if previous is None:
+            requests.Session.send = _original_send
+
+
+def in_context(fn):
+    """Wrap `fn` to run in a copy of the caller's context, for executor.submit/map."""
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.copy().run(fn, *args, **kwargs)
+
+
+@contextmanager
+def stage(name: str):
+    """Record a stage on the active report (and as a trace span); a plain no-op outside a recorded run."""
+    if _active is None:
+        with tracing.span(name, "stage"):
+            yield {}
+        return
+    with tracing.span(name, "stage"), _active.stage(name) as info:
+        yield info
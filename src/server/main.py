@@ -1,43 +1,150 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI, Request, Form, Query
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
 import pandas as pd
 import numpy as np
 import os
-import re, subprocess, sys, tempfile
+import json
+import logging
+import re, sys, tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 sys.path.insert(0, str((Path(__file__).resolve().parent.parent)))
-from data_utils import expand_positions, format_player_name  # type: ignore
-from draft_strategy_generator import analyze_and_adjust_rankings  # type: ignore
-from fangraphs_api import PROJECTION_MODELS  # type: ignore
+from config import PROJECTION_MODELS, configured_leagues  # type: ignore
+from player_utils import expand_positions, format_player_name  # type: ignore
+from history import LATEST_FILENAME, history_dir, player_history, player_key, player_keys, score_trends  # type: ignore
+from snapshot_diff import load_changes  # type: ignore
+import tracing  # type: ignore
+from server import memory, metrics  # type: ignore
+from server.metrics import timed  # type: ignore
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent
 ROOT_DIR = BASE_DIR.parent.parent
 
 from dotenv import load_dotenv  # type: ignore
 load_dotenv(ROOT_DIR / ".env")
+if os.getenv("TRACE_FILE") and not tracing.enabled:
+    tracing.configure(os.getenv("TRACE_FILE"))
 TEMPLATES_DIR = ROOT_DIR / "templates"
 STATIC_DIR = ROOT_DIR / "static"
 
-app = FastAPI(title="Fantasy Baseball Hub")
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    scheduler = _start_scheduler()
+    memory_sampler = memory.start_sampler(float(os.getenv("MEMORY_SAMPLE_EVERY", "60")))
+    yield
+    memory_sampler.set()
+    if scheduler is not None:
+        scheduler.stop()
+
+
+app = FastAPI(title="Fantasy Baseball Hub", lifespan=_lifespan)
 
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
 _PROJ_MODEL_LIST = [(k, v["label"]) for k, v in PROJECTION_MODELS.items()]
 templates.env.globals["PROJECTION_MODELS"] = _PROJ_MODEL_LIST
-templates.env.globals["get_projection_model"] = lambda: os.getenv("PROJECTION_MODEL", "steamer").strip("'\"")
 
 
-def get_latest_csv() -> str | None:
-    out_dir = ROOT_DIR / "output"
+def _default_model() -> str:
+    return os.getenv("PROJECTION_MODEL", "steamer").strip("'\"")
+
+
+def _selected_model(qp) -> str:
+    """Projection model for a request: the `model` query param when valid, else PROJECTION_MODEL."""
+    model = qp.get("model", "")
+    return model if model in PROJECTION_MODELS else _default_model()
+
+
+def _selected_league(qp) -> str | None:
+    """
+    League for a request: the `league` query param when it is one of LEAGUES, else the first
+    configured league. None when LEAGUES is unset (single league stored directly in output/).
+    """
+    leagues = configured_leagues()
+    league = qp.get("league", "")
+    return league if league in leagues else next(iter(leagues), None)
+
+
+def _output_dir(league: str | None = None) -> Path:
+    """A league's output directory under OUTPUT_DIR (default <project root>/output)."""
+    out_dir = Path(os.getenv("OUTPUT_DIR") or ROOT_DIR / "output")
+    return out_dir / "leagues" / league if league else out_dir
+
+
+def _scoped_url(path: str, model: str, league: str | None) -> str:
+    return f"{path}?model={model}" + (f"&league={league}" if league else "")
+
+
+templates.env.globals["get_projection_model"] = lambda request=None: (
+    _selected_model(request.query_params) if request is not None else _default_model()
+)
+templates.env.globals["get_default_model"] = _default_model
+templates.env.globals["get_projection_models"] = lambda request=None: _available_models(
+    _selected_league(request.query_params if request else {})
+)
+templates.env.globals["get_league"] = lambda request=None: _selected_league(request.query_params if request else {})
+templates.env.globals["get_leagues"] = lambda: list(configured_leagues().items())
+
+_first_response_logged = False
+
+
+@app.middleware("http")
+async def _log_first_response(request: Request, call_next):
+    """Log time from module import to the first completed response (cold-start cost)."""
+    global _first_response_logged
+    response = await call_next(request)
+    if not _first_response_logged:
+        _first_response_logged = True
+        logger.info(f"First response ({request.url.path}) {time.perf_counter() - _IMPORT_STARTED:.3f}s after import")
+    return response
+
+
+@app.middleware("http")
+async def _record_request_metrics(request: Request, call_next):
+    """Count and time each request under its route template (not the raw path, to keep label sets small)."""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", None) or "unmatched"
+        if path != "/metrics":
+            metrics.requests_total.inc(path, request.method, str(status))
+            metrics.request_seconds.observe(time.perf_counter() - start, path, request.method)
+
+
+def get_latest_csv(model: str | None = None, league: str | None = None) -> str | None:
+    """
+    Newest ranked CSV for `model` (<league dir>/models/<model>/). The primary model (or no model)
+    falls back to the league dir itself, which only ever holds the primary model's rankings.
+    """
+    out_dir = _output_dir(league)
     if not out_dir.exists():
         return None
-    csvs = sorted(out_dir.glob("free_agents_ranked_*.csv"))
+    csvs = sorted((out_dir / "models" / model).glob("free_agents_ranked_*.csv")) if model else []
+    if not csvs and (not model or model == _default_model()):
+        csvs = sorted(out_dir.glob("free_agents_ranked_*.csv"))
     return str(csvs[-1]) if csvs else None
 
 
+def _available_models(league: str | None = None) -> list[tuple[str, str]]:
+    """(model, label) for each projection model with a ranked snapshot in the league."""
+    return [(key, label) for key, label in _PROJ_MODEL_LIST if get_latest_csv(key, league)]
+
+
 def _filters_from_qp(qp, teams: list[str]):
     default_team = os.getenv("DEFAULT_TEAM", "")
     fallback = next((t for t in teams if t == default_team), teams[0] if teams else "")
@@ -59,8 +166,92 @@ def _add_ci_mi(positions: list) -> list:
         extra.append("MI")
     return positions + [p for p in extra if p not in positions]
 
-def _prepare_dataframe(csv_path: str) -> pd.DataFrame:
-    df = pd.read_csv(csv_path, low_memory=False)
+# Dtype plan for the resident player table: low-cardinality labels become categoricals,
+# whole-number counts and ids become nullable ints, remaining stats become float32.
+_CATEGORY_COLS = ("fantasy_team", "Team", "position", "injury_status")
+_ID_COLS = ("player_id",)
+_COUNT_STATS = {
+    "AB", "PA", "G", "GS", "H", "1B", "2B", "3B", "HR", "R", "RBI", "BB", "SO", "HBP",
+    "SB", "CS", "W", "L", "SV", "HLD", "QS", "ER",
+}
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def _is_count_column(col: str) -> bool:
+    return col in _ID_COLS or col.rsplit("_", 1)[-1] in _COUNT_STATS
+
+
+def _compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    for col in _CATEGORY_COLS:
+        if col in df.columns:
+            cat = df[col].astype("category")
+            # "" lets callers keep using fillna("") on these columns.
+            if "" not in cat.cat.categories:
+                cat = cat.cat.add_categories([""])
+            df[col] = cat
+    for col in df.select_dtypes(include="number").columns:
+        values = df[col]
+        if values.dtype == bool:
+            continue
+        present = values.dropna()
+        whole = present.empty or bool((present % 1 == 0).all())
+        if _is_count_column(col) and whole:
+            too_big = not present.empty and present.abs().max() > _INT32_MAX
+            df[col] = values.astype("Int64" if too_big else "Int32")
+        else:
+            df[col] = values.astype("float32")
+    return df
+
+
+def _widen(frame: pd.DataFrame) -> pd.DataFrame:
+    """Undo the compact dtypes for output: float32 -> float64 at its printed precision, Int -> int64/float64."""
+    floats = [c for c, dt in frame.dtypes.items() if dt == np.float32]
+    ints = {
+        c: ("float64" if frame[c].hasnans else "int64")
+        for c, dt in frame.dtypes.items() if dt in ("Int32", "Int64")
+    }
+    if floats:
+        frame = frame.astype({c: str for c in floats}).astype({c: "float64" for c in floats})
+    return frame.astype(ints) if ints else frame
+
+
+@timed
+def _records(frame: pd.DataFrame) -> list[dict]:
+    return _widen(frame).to_dict(orient="records")
+
+
+def _native(value):
+    if value is pd.NA:
+        return np.nan
+    if isinstance(value, np.float32):
+        return float(str(value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _row_dict(row: pd.Series) -> dict:
+    return {k: _native(v) for k, v in row.items()}
+
+
+# Columns _prepare_frame adds to the snapshot CSV.
+_DERIVED_COLS = ("display_name", "norm_positions", "ScoreDelta", "has_valid_position")
+
+
+def _describe_snapshot(entry: tuple) -> dict:
+    (csv_path, _), df = entry
+    derived = [c for c in _DERIVED_COLS if c in df.columns]
+    return {"file": os.path.basename(csv_path), "rows": len(df), "columns": df.shape[1],
+            "derived_bytes": int(df[derived].memory_usage(deep=True, index=False).sum()) if derived else 0}
+
+
+# (league, model) -> ((csv_path, mtime), prepared frame); each entry is replaced in a single
+# assignment so readers never see a mix. Evicted under memory pressure after derived caches.
+_snapshots = memory.LRUCache("snapshots", priority=1, describe=_describe_snapshot)
+
+
+@timed
+def _prepare_frame(df: pd.DataFrame, label: str) -> pd.DataFrame:
     if "display_name" not in df.columns:
         df["display_name"] = df.apply(format_player_name, axis=1)
     if "norm_positions" not in df.columns:
@@ -69,9 +260,152 @@ def _prepare_dataframe(csv_path: str) -> pd.DataFrame:
     if "ScoreDelta" not in df.columns and {"curr_CompositeScore","proj_CompositeScore"}.issubset(df.columns):
         df["ScoreDelta"] = df["curr_CompositeScore"] - df["proj_CompositeScore"]
     df["has_valid_position"] = df["norm_positions"].apply(lambda x: isinstance(x, list) and len(x) > 0)
+    before_mb = df.memory_usage(deep=True).sum() / 1e6
+    df = _compact_dtypes(df)
+    logger.info(
+        f"Loaded {label}: {len(df)} players, "
+        f"{before_mb:.1f} MB -> {df.memory_usage(deep=True).sum() / 1e6:.1f} MB after dtype plan"
+    )
     return df
 
 
+def _swap_snapshot(csv_path: str, df: pd.DataFrame, model: str | None = None, league: str | None = None) -> None:
+    _snapshots[(league, model)] = ((csv_path, os.path.getmtime(csv_path)), df)
+
+
+@timed
+def _prepare_dataframe(csv_path: str, model: str | None = None, league: str | None = None) -> pd.DataFrame:
+    """
+    Load a ranked snapshot as the resident player table for `league`/`model`, reusing the
+    cached frame while the file is unchanged. Callers must treat the returned frame as read-only.
+    """
+    key, df = _snapshots.get((league, model), (None, None))
+    hit = key == (csv_path, os.path.getmtime(csv_path))
+    metrics.cache_lookup("snapshot", hit)
+    if hit:
+        return df
+    start = time.perf_counter()
+    with tracing.span("read_csv", "pandas", file=os.path.basename(csv_path)):
+        raw = pd.read_csv(csv_path, low_memory=False)
+    df = _prepare_frame(raw, os.path.basename(csv_path))
+    metrics.snapshot_load_seconds.observe(time.perf_counter() - start)
+    _swap_snapshot(csv_path, df, model, league)
+    return df
+
+
+@metrics.on_scrape
+def _snapshot_age_metrics():
+    now = time.time()
+    metrics.snapshot_age.replace({
+        (league or "", model or ""): now - mtime for (league, model), ((_, mtime), _) in list(_snapshots.items())
+    })
+
+
+def _history_records(key: str, model: str, league: str | None) -> list:
+    hist = player_history(str(_output_dir(league)), model, key)
+    if hist.empty:
+        return []
+    hist = hist.drop(columns=["key", "run_id"], errors="ignore")
+    hist["as_of"] = hist["as_of"].map(lambda t: t.isoformat())
+    return _json_records(hist)
+
+
+def _json_records(frame: pd.DataFrame) -> list[dict]:
+    """Records with NaN as None, for JSONResponse."""
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+
+# (snapshot dir, since, latest snapshot) -> (since id, snapshot id, change frame)
+_changes_cache = memory.LRUCache("changes", max_entries=32)
+
+
+def _snapshot_changes(model: str, league: str | None, since: str | None = None) -> tuple:
+    """
+    Changes since snapshot `since` (default the previous one) for the snapshots `model`/`league`
+    pages read. Returns (since_id, snapshot_id, frame); raises FileNotFoundError for unknown ids.
+    """
+    csv_path = get_latest_csv(model, league)
+    if not csv_path:
+        return None, None, pd.DataFrame()
+    key = (os.path.dirname(csv_path), since, os.path.basename(csv_path))
+    cached = _changes_cache.get(key)
+    metrics.cache_lookup("changes", cached is not None)
+    if cached is None:
+        cached = load_changes(os.path.dirname(csv_path), since)
+        _changes_cache[key] = cached
+    return cached
+
+
+def _dashboard_changes(model: str, league: str | None, team: str, limit: int = 5) -> dict | None:
+    """Since the previous refresh: players newly dropped to free agency and injury news on `team`."""
+    try:
+        since, _, changes = _snapshot_changes(model, league)
+    except FileNotFoundError:
+        return None
+    if changes.empty:
+        return None
+    kinds = changes["change"].fillna("")
+    dropped = changes[kinds.str.contains("dropped")].sort_values("curr_CompositeScore", ascending=False).head(limit)
+    injuries = changes[kinds.str.contains("injury") & changes["fantasy_team"].eq(team)]
+    clean = lambda name: re.sub(r"\s*\(.*?\)\s*$", "", str(name)).strip()
+    return {
+        "since": f"{since[4:6]}/{since[6:8]} {since[9:11]}:{since[11:13]}",
+        "dropped": [{"clean_name": clean(r["Name"]), "prev_team": r["prev_fantasy_team"]} for _, r in dropped.iterrows()],
+        "injuries": [
+            {"clean_name": clean(r["Name"]), "status": r["injury_status"] or "ACTIVE", "prev": r["prev_injury_status"] or "ACTIVE"}
+            for _, r in injuries.fillna("").iterrows()
+        ],
+    }
+
+
+def _sparkline(values: list, width: int = 240, height: int = 48) -> str:
+    """SVG polyline points for a series of scores ("" when there are fewer than two)."""
+    ys = [float(v) for v in values if v is not None and v == v]
+    if len(ys) < 2:
+        return ""
+    lo, hi = min(ys), max(ys)
+    span = (hi - lo) or 1.0
+    step = width / (len(ys) - 1)
+    return " ".join(f"{i * step:.1f},{height - (y - lo) / span * height:.1f}" for i, y in enumerate(ys))
+
+
+# (league, model) -> (latest.parquet mtime, score_trends frame)
+_trends_cache = memory.LRUCache("trends")
+
+
+@timed
+def _trending_free_agents(df: pd.DataFrame, model: str, league: str | None, limit: int = 5) -> list:
+    """Free agents whose current score rose most over the last three weeks of history."""
+    out_dir = str(_output_dir(league))
+    try:
+        mtime = os.path.getmtime(os.path.join(history_dir(out_dir, model), LATEST_FILENAME))
+    except OSError:
+        return []
+    cached = _trends_cache.get((league, model))
+    metrics.cache_lookup("trends", cached is not None and cached[0] == mtime)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, score_trends(out_dir, model, days=21))
+        _trends_cache[(league, model)] = cached
+    trends = cached[1]
+    if trends.empty:
+        return []
+    fa = df[df["fantasy_team"].isna() | df["fantasy_team"].isin(["Free Agent", "FA"])]
+    fa = fa.assign(key=player_keys(fa).to_numpy())
+    rising = fa.merge(trends[["key", "curr_CompositeScore_change"]], on="key")
+    rising = rising[rising["curr_CompositeScore_change"] > 0]
+    rising = rising.sort_values("curr_CompositeScore_change", ascending=False).head(limit)
+    return [
+        {
+            "clean_name": re.sub(r"\s*\(.*?\)\s*$", "", str(r["display_name"])).strip(),
+            "display_name": r["display_name"],
+            "Team": _native(r.get("Team")),
+            "change": float(r["curr_CompositeScore_change"]),
+        }
+        for _, r in rising.iterrows()
+    ]
+
+
+@timed
 def _compute_upgrades(df: pd.DataFrame, team: str, hide_injured: bool, min_score: float, filter_pos: str = ""):
     # Don't hide injured from FAs — an injured FA can still be worth picking up
     team_df = df[(df["fantasy_team"] == team) & (df["has_valid_position"])].copy()
@@ -96,8 +430,8 @@ def _compute_upgrades(df: pd.DataFrame, team: str, hide_injured: bool, min_score
                 continue
             key = (fa_pos, str(drop.get("display_name")))
             existing_idx = next((i for i, u in enumerate(upgrades) if (u["pos"], u["drop"]["display_name"]) == key), None)
-            add_d = fa.to_dict()
-            drop_d = drop.to_dict()
+            add_d = _row_dict(fa)
+            drop_d = _row_dict(drop)
             add_d["clean_name"] = re.sub(r"\s*\(.*?\)\s*$", "", str(add_d.get("display_name", add_d.get("Name", "")))).strip()
             drop_d["clean_name"] = re.sub(r"\s*\(.*?\)\s*$", "", str(drop_d.get("display_name", drop_d.get("Name", "")))).strip()
             item = {"pos": fa_pos, "add": add_d, "drop": drop_d, "gain": round(gain, 2)}
@@ -113,6 +447,7 @@ def _compute_upgrades(df: pd.DataFrame, team: str, hide_injured: bool, min_score
     return result
 
 
+@timed
 def _attach_pos_ranks(target_df: pd.DataFrame, all_df: pd.DataFrame) -> pd.DataFrame:
     """Add pos_ranks_str column: e.g. '#4 1B · #12 CI · #7 OF'"""
     # Build per-position rank lookup across all valid players
@@ -155,6 +490,7 @@ _FA_COLS = [
     "raw_curr_FIP", "raw_curr_WHIP", "raw_curr_IP", "raw_curr_K-BB%", "raw_curr_SV",
 ]
 
+@timed
 def _free_agents(df: pd.DataFrame, hide_injured: bool, min_score: float, pos: str = "", limit: int = 100):
     if hide_injured:
         df = df[~df["display_name"].str.contains(r"\(", na=False)]
@@ -166,7 +502,7 @@ def _free_agents(df: pd.DataFrame, hide_injured: bool, min_score: float, pos: st
         fa_df = fa_df[fa_df["norm_positions"].apply(lambda xs: isinstance(xs, list) and pos in xs)]
     cols = [c for c in _FA_COLS + ["pos_ranks_str", "best_pos_rank"] if c in fa_df.columns]
     fa_df = fa_df.sort_values("proj_CompositeScore", ascending=False)
-    result = fa_df[cols].head(limit).to_dict(orient="records")
+    result = _records(fa_df[cols].head(limit))
     for r in result:
         r["clean_name"] = re.sub(r"\s*\(.*?\)\s*$", "", str(r.get("display_name", ""))).strip()
     return result
@@ -183,6 +519,7 @@ _ROSTER_COLS = [
     "raw_curr_FIP", "raw_curr_WHIP", "raw_curr_IP", "raw_curr_K-BB%", "raw_curr_SV",
 ]
 
+@timed
 def _team_roster(df: pd.DataFrame, team: str, hide_injured: bool, pos: str = ""):
     if hide_injured:
         df = df[~df["display_name"].str.contains(r"\(", na=False)]
@@ -191,12 +528,13 @@ def _team_roster(df: pd.DataFrame, team: str, hide_injured: bool, pos: str = "")
         team_df = team_df[team_df["norm_positions"].apply(lambda xs: isinstance(xs, list) and pos in xs)]
     team_df = _attach_pos_ranks(team_df, df)
     cols = [c for c in _ROSTER_COLS + ["pos_ranks_str", "best_pos_rank"] if c in team_df.columns]
-    result = team_df[cols].sort_values("proj_CompositeScore", ascending=False).to_dict(orient="records")
+    result = _records(team_df[cols].sort_values("proj_CompositeScore", ascending=False))
     for r in result:
         r["clean_name"] = re.sub(r"\s*\(.*?\)\s*$", "", str(r.get("display_name", ""))).strip()
     return result
 
 
+@timed
 def _drop_candidates(df: pd.DataFrame, team: str, hide_injured: bool, pos: str = "", limit: int = 20):
     if hide_injured:
         df = df[~df["display_name"].str.contains(r"\(", na=False)]
@@ -217,9 +555,10 @@ def _drop_candidates(df: pd.DataFrame, team: str, hide_injured: bool, pos: str =
     elif "ScoreDelta" in team_df.columns:
         team_df = team_df.sort_values("ScoreDelta", ascending=True, na_position="last")
     cols = [c for c in ["display_name","Team","position","proj_CompositeScore","curr_CompositeScore","ScoreDelta"] if c in team_df.columns]
-    return team_df[cols].head(limit).to_dict(orient="records")
+    return _records(team_df[cols].head(limit))
 
 
+@timed
 def _dashboard_data(df: pd.DataFrame, team: str, hide_injured: bool) -> dict:
     working = df.copy()
     if hide_injured:
@@ -262,7 +601,7 @@ def _dashboard_data(df: pd.DataFrame, team: str, hide_injured: bool) -> dict:
         })
 
     # Team rank
-    team_means = rostered.groupby("fantasy_team")["proj_CompositeScore"].mean().sort_values(ascending=False)
+    team_means = rostered.groupby("fantasy_team", observed=True)["proj_CompositeScore"].mean().sort_values(ascending=False)
     team_rank = list(team_means.index).index(team) + 1 if team in team_means.index else 0
 
     # Injured players on this team
@@ -283,6 +622,7 @@ def _dashboard_data(df: pd.DataFrame, team: str, hide_injured: bool) -> dict:
     }
 
 
+@timed
 def _league_summary(df: pd.DataFrame, hide_injured: bool):
     if hide_injured:
         df = df[~df["display_name"].str.contains(r"\(", na=False)]
@@ -290,14 +630,18 @@ def _league_summary(df: pd.DataFrame, hide_injured: bool):
     playable = playable[~playable["fantasy_team"].fillna("").str.lower().isin(["", "free agent", "fa"])]
     if playable.empty:
         return []
-    group = playable.groupby("fantasy_team", dropna=True)
+    # Average the scores at their printed precision, as the uncompacted table did.
+    scores = [c for c in ("proj_CompositeScore", "curr_CompositeScore") if c in playable.columns]
+    playable = _widen(playable[["fantasy_team"] + scores])
+    group = playable.groupby("fantasy_team", dropna=True, observed=True)
     proj = group["proj_CompositeScore"].mean().rename("proj_mean") if "proj_CompositeScore" in playable.columns else None
     cur = group["curr_CompositeScore"].mean().rename("curr_mean") if "curr_CompositeScore" in playable.columns else None
     size = group.size().rename("players")
-    out = pd.concat([proj, cur, size], axis=1).reset_index().fillna(0)
+    out = pd.concat([proj, cur, size], axis=1).fillna(0).reset_index()
     return out.sort_values("proj_mean", ascending=False).to_dict(orient="records")
 
 
+@timed
 def _league_team_breakdown(df: pd.DataFrame, team: str, hide_injured: bool):
     if hide_injured:
         df = df[~df["display_name"].str.contains(r"\(", na=False)]
@@ -385,7 +729,7 @@ def _compare_data(df: pd.DataFrame, name1: str, name2: str):
         if m.empty:
             return None
         sub = _attach_pos_ranks(m.head(1), df)
-        return sub.to_dict(orient="records")[0]
+        return _records(sub)[0]
     return pick(name1), pick(name2)
 
 
@@ -399,6 +743,7 @@ def _positions_list(df: pd.DataFrame):
     return [p for p in _POS_ORDER if p in pos_set]
 
 
+@timed
 def _players_filtered(
     df: pd.DataFrame,
     search: str,
@@ -444,22 +789,26 @@ def _players_filtered(
         "proj_CompositeScore", "curr_CompositeScore",
         "proj_HR", "proj_R", "proj_RBI", "proj_SB", "proj_AVG",
         "proj_ERA", "proj_WHIP", "proj_SV", "proj_IP", "proj_K-BB%",
+        "raw_proj_WHIP", "raw_proj_SV", "raw_proj_IP", "raw_proj_K-BB%",
         "pos_ranks_str", "best_pos_rank",
     ]
     present = [c for c in cols if c in data.columns]
     page_df = data[present].iloc[start:end].copy()
-    return page_df.to_dict(orient="records"), total
+    return _records(page_df), total
 
 
 @app.get("/", response_class=HTMLResponse)
 def dashboard(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     teams = sorted([t for t in df["fantasy_team"].dropna().unique() if str(t).lower() not in ["fa", "free agent"]])
     selected_team, hide_inj, min_score = _filters_from_qp(request.query_params, teams)
     dash = _dashboard_data(df, selected_team, hide_inj)
+    dash["trending"] = _trending_free_agents(df, model, league)
+    dash["changes"] = _dashboard_changes(model, league, selected_team)
     return templates.TemplateResponse(
         "index.html",
         {
@@ -477,10 +826,11 @@ def dashboard(request: Request):
 
 @app.get("/add-drop", response_class=HTMLResponse)
 def add_drop_view(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     teams = sorted([t for t in df["fantasy_team"].dropna().unique() if str(t).lower() not in ["fa", "free agent"]])
     selected_team, hide_inj, min_score = _filters_from_qp(request.query_params, teams)
     pos = request.query_params.get("pos", "")
@@ -515,20 +865,90 @@ def add_drop_view(request: Request):
     )
 
 @app.get("/api/players/search")
-def player_search(q: str = ""):
+def player_search(q: str = "", model: str = "", league: str = ""):
     if not q or len(q) < 2:
         return JSONResponse([])
-    csv_path = get_latest_csv()
+    model, league = _selected_model({"model": model}), _selected_league({"league": league})
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return JSONResponse([])
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     matches = df[df["display_name"].str.contains(q, case=False, na=False)]
     names = matches.sort_values("proj_CompositeScore", ascending=False)["Name"].head(10).tolist()
     return JSONResponse(names)
 
 
+@app.get("/api/players/history")
+def player_history_api(name: str = "", model: str = "", league: str = ""):
+    """Every stored version of one player (see history.py), oldest first."""
+    model, league = _selected_model({"model": model}), _selected_league({"league": league})
+    csv_path = get_latest_csv(model, league)
+    if not csv_path:
+        return JSONResponse([])
+    details = _player_detail(_prepare_dataframe(csv_path, model, league), name)
+    return JSONResponse(_history_records(details["history_key"], model, league) if details else [])
+
+
+@app.get("/api/changes")
+def snapshot_changes(since: str = "", kind: str = "", limit: int = 500, model: str = "", league: str = ""):
+    """Players that changed between snapshot `since` (default the previous one) and the newest."""
+    model, league = _selected_model({"model": model}), _selected_league({"league": league})
+    try:
+        since_id, snapshot, changes = _snapshot_changes(model, league, since or None)
+    except FileNotFoundError as e:
+        return JSONResponse({"status": "error", "detail": str(e)}, status_code=404)
+    counts = changes["change"].str.split(",").explode().value_counts().to_dict() if not changes.empty else {}
+    if kind and not changes.empty:
+        changes = changes[changes["change"].str.split(",").map(lambda kinds: kind in kinds)]
+    return JSONResponse({
+        "since": since_id,
+        "snapshot": snapshot,
+        "counts": counts,
+        "changes": _json_records(changes.head(max(limit, 0))),
+    })
+
+
+@app.get("/api/runs")
+def run_reports(limit: int = 20, league: str = ""):
+    """Recent refresh run reports (newest first) for comparing stage timings across runs."""
+    out_dir = _output_dir(_selected_league({"league": league}))
+    paths = sorted(out_dir.glob("run_report_*.json"), reverse=True)[:max(limit, 0)] if out_dir.exists() else []
+    runs = []
+    for path in paths:
+        try:
+            runs.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return JSONResponse(runs)
+
+
+# One refresh at a time; requests that arrive mid-refresh queue behind it.
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="refresh")
+
+
+def _refresh_snapshot(model: str | None, league: str | None = None, projections_max_age: float | None = None) -> dict:
+    """Run the refresh pipeline in-process and swap each model's ranked frame in as its resident table."""
+    from pipeline import run_refresh  # type: ignore
+
+    start = time.perf_counter()
+    try:
+        result = run_refresh(output_dir=str(_output_dir()), model=model, league_id=league,
+                             projections_max_age=projections_max_age)
+    except Exception:
+        metrics.refresh_total.inc("exception")
+        metrics.refresh_seconds.observe(time.perf_counter() - start, "exception")
+        raise
+    metrics.refresh_total.inc(result["status"])
+    metrics.refresh_seconds.observe(time.perf_counter() - start, result["status"])
+    for name, ranked in result["models"].items():
+        label = f"{league + '/' if league else ''}{name}/{os.path.basename(ranked['csv_path'])}"
+        frame = _prepare_frame(ranked["snapshot"].infer_objects(), label)
+        _swap_snapshot(ranked["csv_path"], frame, name, league)
+    return result
+
+
 @app.post("/update")
-def update_data(model: str = Query(default=None)):
+def update_data(model: str = Query(default=None), league: str = Query(default="")):
     if model and model in PROJECTION_MODELS:
         try:
             from dotenv import set_key
@@ -536,19 +956,118 @@ def update_data(model: str = Query(default=None)):
         except Exception:
             pass
         os.environ["PROJECTION_MODEL"] = model
+    league = _selected_league({"league": league})
     try:
-        subprocess.run([sys.executable, str(ROOT_DIR / "src" / "main.py")], check=True)
-        return JSONResponse({"status": "ok"})
-    except subprocess.CalledProcessError as e:
+        result = _refresh_executor.submit(_refresh_snapshot, os.getenv("PROJECTION_MODEL"), league).result()
+    except Exception as e:
+        logger.exception(f"Refresh failed: {e}")
         return JSONResponse({"status": "error", "detail": str(e)}, status_code=500)
+    if result["status"] != "ok":
+        return JSONResponse({"status": "error", "detail": result["error"] or result["status"]}, status_code=500)
+    return JSONResponse({"status": "ok"})
+
+
+_scheduler = None
+
+
+def _scheduled_refresh(projections_max_age: float, keep_projections: bool):
+    """
+    Scheduler job: drop cached FanGraphs data (all of it, or just current stats), then refresh
+    every configured league on the refresh worker. True when every league refreshed.
+    """
+    def run() -> bool:
+        from fangraphs_api import clear_cache  # type: ignore
+
+        clear_cache(keep_projections=keep_projections)
+        ok = True
+        for league in list(configured_leagues()) or [None]:
+            if _scheduler is None or _scheduler.stopped:
+                return False
+            future = _refresh_executor.submit(_refresh_snapshot, os.getenv("PROJECTION_MODEL"), league, projections_max_age)
+            try:
+                ok = future.result()["status"] == "ok" and ok
+            except Exception as e:
+                logger.exception(f"Scheduled refresh of league {league or 'default'} raised: {e}")
+                ok = False
+        return ok
+    return run
+
+
+def _start_scheduler():
+    """
+    Start the background refresh scheduler when REFRESH_SCHEDULE is on: projections (a full
+    refresh) every REFRESH_PROJECTIONS_EVERY seconds, and during the season current stats and
+    rosters every REFRESH_STATS_EVERY seconds, reusing the cached projections.
+    """
+    global _scheduler
+    if os.getenv("REFRESH_SCHEDULE", "false").lower() not in ("1", "true", "yes", "on"):
+        return None
+    from server.scheduler import Job, Scheduler, in_season  # type: ignore
+
+    projections_every = float(os.getenv("REFRESH_PROJECTIONS_EVERY", "86400"))
+    stats_every = float(os.getenv("REFRESH_STATS_EVERY", "3600"))
+    season = os.getenv("SEASON", str(pd.Timestamp.now().year))
+    _scheduler = Scheduler(
+        [
+            Job("projections", _scheduled_refresh(projections_every, keep_projections=False), projections_every),
+            Job("stats", _scheduled_refresh(projections_every, keep_projections=True), stats_every,
+                active=lambda: in_season(season)),
+        ],
+        jitter=float(os.getenv("REFRESH_JITTER", "0.1")),
+        max_backoff=float(os.getenv("REFRESH_MAX_BACKOFF", "21600")),
+        max_concurrent=int(os.getenv("REFRESH_MAX_CONCURRENT", "1")),
+    )
+    latest = get_latest_csv(_default_model(), _selected_league({}))
+    if latest is None or time.time() - os.path.getmtime(latest) > projections_every:
+        _scheduler.trigger("projections")
+    _scheduler.start()
+    return _scheduler
+
+
+@app.get("/api/scheduler")
+def scheduler_status():
+    """Scheduled refresh jobs with their last outcome and next due time."""
+    return JSONResponse({"enabled": _scheduler is not None, "jobs": _scheduler.status() if _scheduler else []})
+
+
+@metrics.on_scrape
+def _scheduler_metrics():
+    if _scheduler is not None:
+        metrics.scheduler_failures.replace({(job["name"],): job["failures"] for job in _scheduler.status()})
+
+
+def _fangraphs_cache_size() -> tuple[int, int]:
+    """The refresh pipeline's FanGraphs download cache, once a refresh has imported it."""
+    fangraphs_api = sys.modules.get("fangraphs_api")
+    if fangraphs_api is None:
+        return 0, 0
+    with fangraphs_api._cache_lock:
+        entries = list(fangraphs_api._cache.values())
+    return len(entries), sum(memory.deep_bytes(frames) for _, frames in entries)
+
+
+memory.register_source("fangraphs", _fangraphs_cache_size)
+
+
+@app.get("/api/memory")
+def memory_usage(top: int = 20):
+    """Resident caches (entries, bytes), the largest cached objects, and process RSS now and over time."""
+    return JSONResponse(memory.report(top=max(1, min(top, 200))))
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of request, helper, cache, snapshot, refresh and memory metrics."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 @app.get("/free-agents", response_class=HTMLResponse)
 def free_agents(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     teams = sorted([t for t in df["fantasy_team"].dropna().unique() if str(t).lower() not in ["fa", "free agent"]])
     selected_team, hide_inj, min_score = _filters_from_qp(request.query_params, teams)
     fa = _free_agents(df, hide_inj, min_score)
@@ -569,10 +1088,11 @@ def free_agents(request: Request):
 
 @app.get("/drop-candidates", response_class=HTMLResponse)
 def drop_candidates(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     teams = sorted([t for t in df["fantasy_team"].dropna().unique() if str(t).lower() not in ["fa", "free agent"]])
     selected_team, hide_inj, min_score = _filters_from_qp(request.query_params, teams)
     pos = request.query_params.get("pos", "")
@@ -591,10 +1111,11 @@ def drop_candidates(request: Request):
 
 @app.get("/league", response_class=HTMLResponse)
 def league(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     teams = sorted([t for t in df["fantasy_team"].dropna().unique() if str(t).lower() not in ["fa", "free agent"]])
     selected_team, hide_inj, min_score = _filters_from_qp(request.query_params, teams)
     league_rows = _league_summary(df, hide_inj)
@@ -608,10 +1129,11 @@ def league(request: Request):
 
 @app.get("/league/team", response_class=HTMLResponse)
 def league_team(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     teams = sorted([t for t in df["fantasy_team"].dropna().unique() if str(t).lower() not in ["fa", "free agent"]])
     selected_team, hide_inj, min_score = _filters_from_qp(request.query_params, teams)
     breakdown = _league_team_breakdown(df, selected_team, hide_inj)
@@ -625,10 +1147,11 @@ def league_team(request: Request):
 
 @app.get("/compare", response_class=HTMLResponse)
 def compare(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     teams = sorted([t for t in df["fantasy_team"].dropna().unique() if str(t).lower() not in ["fa", "free agent"]])
     selected_team, hide_inj, min_score = _filters_from_qp(request.query_params, teams)
     def _clean_name(s: str) -> str:
@@ -646,10 +1169,11 @@ def compare(request: Request):
 
 @app.get("/players", response_class=HTMLResponse)
 def players(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     teams = sorted([t for t in df["fantasy_team"].dropna().unique() if str(t).lower() not in ["fa", "free agent"]])
     selected_team, hide_inj, min_score = _filters_from_qp(request.query_params, teams)
     search = request.query_params.get("q", "")
@@ -692,16 +1216,17 @@ def players(request: Request):
 
 ## ── Draft Strategy ──────────────────────────────────────────────────
 
-def _get_draft_excel() -> str | None:
-    out_dir = ROOT_DIR / "output"
+def _get_draft_excel(league: str | None = None) -> str | None:
+    out_dir = _output_dir(league)
     if not out_dir.exists():
         return None
     files = sorted(out_dir.glob("draft_strategy_*.xlsx"))
     return str(files[-1]) if files else None
 
 
-def _load_draft_df() -> pd.DataFrame | None:
-    path = _get_draft_excel()
+@timed
+def _load_draft_df(league: str | None = None) -> pd.DataFrame | None:
+    path = _get_draft_excel(league)
     if not path:
         return None
     try:
@@ -723,19 +1248,20 @@ def _load_draft_df() -> pd.DataFrame | None:
         return None
 
 
-def _save_draft_df(df: pd.DataFrame, path: str | None = None) -> str:
+def _save_draft_df(df: pd.DataFrame, path: str | None = None, league: str | None = None) -> str:
     import datetime as _dt
     if path and os.path.exists(path):
         target = path
     else:
-        os.makedirs(str(ROOT_DIR / "output"), exist_ok=True)
+        os.makedirs(str(_output_dir(league)), exist_ok=True)
         ts = _dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-        target = str(ROOT_DIR / "output" / f"draft_strategy_{ts}.xlsx")
+        target = str(_output_dir(league) / f"draft_strategy_{ts}.xlsx")
     with pd.ExcelWriter(target, engine="openpyxl") as w:
         df.to_excel(w, sheet_name="All players", index=False)
     return target
 
 
+@timed
 def _draft_board(draft_df: pd.DataFrame) -> list[dict]:
     drafted_count = len(draft_df[draft_df["Drafted"].fillna("") != ""])
     filtered = draft_df.copy()
@@ -803,7 +1329,9 @@ def _draft_board(draft_df: pd.DataFrame) -> list[dict]:
     return rows
 
 
-def _draft_summary(draft_df: pd.DataFrame) -> dict:
+@timed
+def _draft_summary(draft_df: pd.DataFrame, league: str | None = None) -> dict:
+    roster_slots = _roster_slots(league)
     total = len(draft_df)
     drafted = len(draft_df[draft_df["Drafted"].fillna("") != ""])
     available = total - drafted
@@ -838,12 +1366,12 @@ def _draft_summary(draft_df: pd.DataFrame) -> dict:
     available_df = working[working["Drafted"].fillna("").str.strip() == ""].copy()
 
     preferred_order = ["C", "1B", "2B", "3B", "SS", "OF", "MI", "CI", "UTIL", "SP", "RP", "P"]
-    ordered_slots = [s for s in preferred_order if s in ROSTER_SLOTS]
-    ordered_slots += [s for s in sorted(ROSTER_SLOTS.keys()) if s not in ordered_slots]
+    ordered_slots = [s for s in preferred_order if s in roster_slots]
+    ordered_slots += [s for s in sorted(roster_slots.keys()) if s not in ordered_slots]
 
     position_supply: list[dict] = []
     for slot in ordered_slots:
-        slots_per_team = int(ROSTER_SLOTS.get(slot, 0) or 0)
+        slots_per_team = int(roster_slots.get(slot, 0) or 0)
         if slots_per_team <= 0:
             continue
         demand = slots_per_team * total_teams
@@ -918,7 +1446,8 @@ def _draft_log(draft_df: pd.DataFrame) -> list[dict]:
     return log
 
 
-def _draft_positions(draft_df: pd.DataFrame) -> list[str]:
+def _draft_positions(draft_df: pd.DataFrame, league: str | None = None) -> list[str]:
+    roster_slots = _roster_slots(league)
     pos_set: set[str] = set()
     if "Eligible_Positions" in draft_df.columns:
         for p in draft_df["Eligible_Positions"]:
@@ -926,7 +1455,7 @@ def _draft_positions(draft_df: pd.DataFrame) -> list[str]:
 
     # Always include configured roster slots so chips don't disappear if
     # no current rows parse cleanly for a specific slot.
-    pos_set.update(ROSTER_SLOTS.keys())
+    pos_set.update(roster_slots.keys())
 
     preferred_order = ["C", "1B", "2B", "3B", "SS", "OF", "MI", "CI", "UTIL", "SP", "RP", "P"]
     ordered = [p for p in preferred_order if p in pos_set]
@@ -1030,14 +1559,15 @@ def _merge_draft_state(previous_df: pd.DataFrame | None, refreshed_df: pd.DataFr
 
 @app.get("/draft", response_class=HTMLResponse)
 def draft_view(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     teams = sorted([t for t in df["fantasy_team"].dropna().unique() if str(t).lower() not in ["fa", "free agent"]])
     selected_team, hide_inj, min_score = _filters_from_qp(request.query_params, teams)
 
-    draft_df = _load_draft_df()
+    draft_df = _load_draft_df(league)
     has_draft = draft_df is not None
 
     board = []
@@ -1048,10 +1578,10 @@ def draft_view(request: Request):
     log = []
     if has_draft:
         board = _draft_board(draft_df)
-        summary = _draft_summary(draft_df)
-        positions = _draft_positions(draft_df)
+        summary = _draft_summary(draft_df, league)
+        positions = _draft_positions(draft_df, league)
         tier_list = _draft_tiers(draft_df)
-        draft_file = os.path.basename(_get_draft_excel() or "")
+        draft_file = os.path.basename(_get_draft_excel(league) or "")
         log = _draft_log(draft_df)
 
     return templates.TemplateResponse(
@@ -1077,10 +1607,11 @@ def draft_view(request: Request):
 
 @app.post("/draft/generate", response_class=HTMLResponse)
 def draft_generate(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
-        return RedirectResponse("/draft", status_code=303)
-    df = _prepare_dataframe(csv_path)
+        return RedirectResponse(_scoped_url("/draft", model, league), status_code=303)
+    df = _prepare_dataframe(csv_path, model, league)
     # Prepare data for the generator.
     # Do not pre-filter Unknown positions here: the generator has name-based/FG fallbacks
     # (critical for two-way players like Shohei) and will handle eligibility itself.
@@ -1121,23 +1652,27 @@ def draft_generate(request: Request):
     with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as tmp:
         prep.to_csv(tmp.name, index=False)
         tmp_path = tmp.name
-    previous_df = _load_draft_df()
+    previous_df = _load_draft_df(league)
+    from draft_strategy_generator import analyze_and_adjust_rankings  # type: ignore
+    out_dir = _output_dir(league)
+    os.makedirs(out_dir, exist_ok=True)
     try:
-        analyze_and_adjust_rankings(tmp_path)
+        analyze_and_adjust_rankings(tmp_path, output_directory=str(out_dir))
     finally:
         os.unlink(tmp_path)
 
-    refreshed_df = _load_draft_df()
+    refreshed_df = _load_draft_df(league)
     if refreshed_df is not None:
         merged = _merge_draft_state(previous_df, refreshed_df)
-        _save_draft_df(merged, _get_draft_excel())
+        _save_draft_df(merged, _get_draft_excel(league), league)
 
-    return RedirectResponse("/draft", status_code=303)
+    return RedirectResponse(_scoped_url("/draft", model, league), status_code=303)
 
 
 @app.post("/draft/pick")
-def draft_pick(name: str = Form(...), drafted_by: str = Form(""), total_teams: int = Form(10)):
-    draft_df = _load_draft_df()
+def draft_pick(name: str = Form(...), drafted_by: str = Form(""), total_teams: int = Form(10), league: str = Query(default="")):
+    league = _selected_league({"league": league})
+    draft_df = _load_draft_df(league)
     if draft_df is None:
         return JSONResponse({"error": "No draft data"}, status_code=400)
     if "Draft_Pick" not in draft_df.columns:
@@ -1155,7 +1690,7 @@ def draft_pick(name: str = Form(...), drafted_by: str = Form(""), total_teams: i
         draft_df.loc[mask, "Draft_Pick"] = pick_num
         draft_df.loc[mask, "Draft_Round"] = round_num
         draft_df.loc[mask, "Draft_Team_Slot"] = team_slot
-    _save_draft_df(draft_df, _get_draft_excel())
+    _save_draft_df(draft_df, _get_draft_excel(league), league)
     pick_num = int(draft_df.loc[mask, "Draft_Pick"].iloc[0]) if mask.any() else 0
     round_num = int(draft_df.loc[mask, "Draft_Round"].iloc[0]) if mask.any() and "Draft_Round" in draft_df.columns else 0
     team_slot = int(draft_df.loc[mask, "Draft_Team_Slot"].iloc[0]) if mask.any() and "Draft_Team_Slot" in draft_df.columns else 0
@@ -1163,9 +1698,10 @@ def draft_pick(name: str = Form(...), drafted_by: str = Form(""), total_teams: i
 
 
 @app.post("/draft/skip")
-def draft_skip():
+def draft_skip(league: str = Query(default="")):
     """Skip a pick — increments the draft counter without marking any player."""
-    draft_df = _load_draft_df()
+    league = _selected_league({"league": league})
+    draft_df = _load_draft_df(league)
     if draft_df is None:
         return JSONResponse({"error": "No draft data"}, status_code=400)
     if "Draft_Pick" not in draft_df.columns:
@@ -1185,13 +1721,14 @@ def draft_skip():
     skip_row["Draft_Round"] = round_num
     skip_row["Draft_Team_Slot"] = team_slot
     draft_df = pd.concat([draft_df, pd.DataFrame([skip_row])], ignore_index=True)
-    _save_draft_df(draft_df, _get_draft_excel())
+    _save_draft_df(draft_df, _get_draft_excel(league), league)
     return JSONResponse({"ok": True, "pick": pick_num, "round": round_num, "team_slot": team_slot})
 
 
 @app.post("/draft/unpick")
-def draft_unpick(name: str = Form(...)):
-    draft_df = _load_draft_df()
+def draft_unpick(name: str = Form(...), league: str = Query(default="")):
+    league = _selected_league({"league": league})
+    draft_df = _load_draft_df(league)
     if draft_df is None:
         return JSONResponse({"error": "No draft data"}, status_code=400)
     mask = draft_df["Name"] == name
@@ -1203,16 +1740,16 @@ def draft_unpick(name: str = Form(...)):
             draft_df.loc[mask, "Draft_Round"] = 0
         if "Draft_Team_Slot" in draft_df.columns:
             draft_df.loc[mask, "Draft_Team_Slot"] = 0
-    _save_draft_df(draft_df, _get_draft_excel())
+    _save_draft_df(draft_df, _get_draft_excel(league), league)
     return JSONResponse({"ok": True})
 
 
 # ── Draft Advisor ──────────────────────────────────────────────
 
-def _load_roster_slots() -> dict[str, int]:
+def _load_roster_slots(league: str | None = None) -> dict[str, int]:
     """Load roster slot settings from ESPN config, with sensible defaults."""
     import json
-    settings_path = ROOT_DIR / "output" / "roster_settings.json"
+    settings_path = _output_dir(league) / "roster_settings.json"
     defaults = {"C": 1, "1B": 1, "2B": 1, "3B": 1, "SS": 1,
                 "OF": 3, "MI": 1, "CI": 1, "UTIL": 1, "P": 6, "RP": 3}
     # ESPN uses different slot names than our internal format
@@ -1235,7 +1772,22 @@ def _load_roster_slots() -> dict[str, int]:
     return defaults
 
 
-ROSTER_SLOTS = _load_roster_slots()
+# league -> (mtime, slots)
+_roster_slots_cache = memory.LRUCache("roster_slots")
+
+
+def _roster_slots(league: str | None = None) -> dict[str, int]:
+    """A league's roster slots, loaded on first use and reloaded when roster_settings.json changes."""
+    try:
+        mtime = (_output_dir(league) / "roster_settings.json").stat().st_mtime
+    except OSError:
+        mtime = None
+    key, slots = _roster_slots_cache.get(league, (None, None))
+    metrics.cache_lookup("roster_slots", slots is not None and key == mtime)
+    if slots is None or key != mtime:
+        slots = _load_roster_slots(league)
+        _roster_slots_cache[league] = (mtime, slots)
+    return slots
 
 def _parse_eligible(val):
     """Parse Eligible_Positions from various formats."""
@@ -1253,7 +1805,8 @@ def _parse_eligible(val):
         return set()
 
 
-def _draft_advisor(draft_df: pd.DataFrame, position_filter: str = "") -> dict:
+@timed
+def _draft_advisor(draft_df: pd.DataFrame, position_filter: str = "", league: str | None = None) -> dict:
     """
     Draft strategy advisor focused on value timing — when to grab vs wait.
 
@@ -1262,6 +1815,7 @@ def _draft_advisor(draft_df: pd.DataFrame, position_filter: str = "") -> dict:
     - Value Targets: players whose ADP is later but score like earlier picks — mid-round winners
     - Wait: high-score players whose ADP says they'll still be there in later rounds
     """
+    roster_slots = _roster_slots(league)
     df = draft_df.copy()
     df["Eligible_Positions"] = df["Eligible_Positions"].apply(_parse_eligible)
     df["_is_drafted"] = df["Drafted"].fillna("").str.strip() != ""
@@ -1273,10 +1827,10 @@ def _draft_advisor(draft_df: pd.DataFrame, position_filter: str = "") -> dict:
 
     # ── Positional scarcity ──
     scarcity: dict[str, dict] = {}
-    for pos in ROSTER_SLOTS:
+    for pos in roster_slots:
         pos_avail = available[available["Eligible_Positions"].apply(lambda ep: pos in ep)]
         total_avail = len(pos_avail)
-        league_demand = ROSTER_SLOTS[pos] * total_teams
+        league_demand = roster_slots[pos] * total_teams
         replacement_idx = min(league_demand, max(0, len(pos_avail) - 1))
         sorted_avail = pos_avail.nlargest(max(1, replacement_idx + 1), "Adjusted_CompositeScore")
         replacement_level = float(sorted_avail["Adjusted_CompositeScore"].iloc[-1]) if not sorted_avail.empty else 0
@@ -1406,15 +1960,18 @@ def _draft_advisor(draft_df: pd.DataFrame, position_filter: str = "") -> dict:
 
 
 @app.get("/api/draft/advisor")
-def draft_advisor_api(position: str = ""):
-    draft_df = _load_draft_df()
+def draft_advisor_api(position: str = "", league: str = ""):
+    league = _selected_league({"league": league})
+    draft_df = _load_draft_df(league)
     if draft_df is None:
         return JSONResponse({"error": "No draft data"}, status_code=400)
-    result = _draft_advisor(draft_df, position_filter=position)
+    result = _draft_advisor(draft_df, position_filter=position, league=league)
     return JSONResponse(result)
 
 
-def _ideal_draft(draft_df: pd.DataFrame, pick_position: int, total_teams: int = 10, total_rounds: int = 21) -> dict:
+@timed
+def _ideal_draft(draft_df: pd.DataFrame, pick_position: int, total_teams: int = 10, total_rounds: int = 21,
+                 league: str | None = None) -> dict:
     """
     Simulate a snake draft and plan an ideal roster.
 
@@ -1423,6 +1980,7 @@ def _ideal_draft(draft_df: pd.DataFrame, pick_position: int, total_teams: int =
     - your already-made picks are inferred from snake slot + Draft_Pick
     - future picks optimize slot-aware value (PAR by slot when PAR is available)
     """
+    roster_slots = _roster_slots(league)
     df = draft_df.copy()
     if "Eligible_Positions" in df.columns:
         df["Eligible_Positions"] = df["Eligible_Positions"].apply(_parse_eligible)
@@ -1448,7 +2006,7 @@ def _ideal_draft(draft_df: pd.DataFrame, pick_position: int, total_teams: int =
     slot_par_weight = 0.35
 
     pitcher_tags = {"P", "SP", "RP"}
-    slot_needs = {k: int(v) for k, v in ROSTER_SLOTS.items()}
+    slot_needs = {k: int(v) for k, v in roster_slots.items()}
 
     hitter_priority = [p for p in ["C", "1B", "2B", "3B", "SS", "OF", "MI", "CI"] if p in slot_needs]
     hitter_priority += [p for p in slot_needs if p not in hitter_priority and p not in {"UTIL", "P", "SP", "RP"}]
@@ -1538,7 +2096,7 @@ def _ideal_draft(draft_df: pd.DataFrame, pick_position: int, total_teams: int =
             return {}
 
         levels: dict[str, float] = {}
-        for slot, slots_per_team in ROSTER_SLOTS.items():
+        for slot, slots_per_team in roster_slots.items():
             demand = max(1, int(slots_per_team)) * max(1, int(total_teams))
             slot_mask = source_df["Eligible_Positions"].apply(
                 lambda ep: _slot_accepts_player(
@@ -1561,7 +2119,7 @@ def _ideal_draft(draft_df: pd.DataFrame, pick_position: int, total_teams: int =
         stats: dict[str, tuple[float, float]] = {}
         if "League_FPTS" not in source_df.columns:
             return stats
-        for slot in ROSTER_SLOTS:
+        for slot in roster_slots:
             repl = replacements.get(slot)
             if repl is None:
                 continue
@@ -1860,8 +2418,10 @@ def _ideal_draft(draft_df: pd.DataFrame, pick_position: int, total_teams: int =
 
 
 @app.get("/api/draft/ideal")
-def ideal_draft_api(pick: int = 1, teams: int = 10):
-    draft_df = _load_draft_df()
+def ideal_draft_api(pick: int = 1, teams: int = 10, league: str = ""):
+    league = _selected_league({"league": league})
+    roster_slots = _roster_slots(league)
+    draft_df = _load_draft_df(league)
     if draft_df is None:
         return JSONResponse({"error": "No draft data"}, status_code=400)
     pick = max(1, min(pick, teams))
@@ -1869,11 +2429,12 @@ def ideal_draft_api(pick: int = 1, teams: int = 10):
     if "Draft_Pick" in draft_df.columns:
         max_pick_logged = int(pd.to_numeric(draft_df["Draft_Pick"], errors="coerce").fillna(0).max())
     rounds_from_log = (max_pick_logged // teams) + 1 if max_pick_logged > 0 else 0
-    total_rounds = max(sum(ROSTER_SLOTS.values()), rounds_from_log)
-    result = _ideal_draft(draft_df, pick, total_teams=teams, total_rounds=total_rounds)
+    total_rounds = max(sum(roster_slots.values()), rounds_from_log)
+    result = _ideal_draft(draft_df, pick, total_teams=teams, total_rounds=total_rounds, league=league)
     return JSONResponse(result)
 
 
+@timed
 def _player_detail(df: pd.DataFrame, name: str):
     if not name:
         return None
@@ -1883,7 +2444,7 @@ def _player_detail(df: pd.DataFrame, name: str):
         m = df[clean_col.str.contains(name, case=False, na=False)]
     if m.empty:
         return None
-    row = m.iloc[0].to_dict()
+    row = _row_dict(m.iloc[0])
     row["display_name"] = re.sub(r"\s*\(.*?\)\s*$", "", str(row.get("display_name", ""))).strip()
     # Build organized sections
     identity = {
@@ -2003,29 +2564,40 @@ def _player_detail(df: pd.DataFrame, name: str):
         ),
         "proj_pcts": proj_pcts,
         "curr_pcts": curr_pcts,
+        "history_key": player_key(row),
     }
 
 
 @app.get("/player", response_class=HTMLResponse)
 def player(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     name = request.query_params.get("name", "")
     details = _player_detail(df, name)
+    history = _history_records(details["history_key"], model, league) if details else []
     return templates.TemplateResponse(
         "player.html",
-        {"request": request, "data_file": os.path.basename(csv_path), "player": details, "name": name},
+        {
+            "request": request,
+            "data_file": os.path.basename(csv_path),
+            "player": details,
+            "name": name,
+            "history": history,
+            "sparkline": _sparkline([h.get("curr_CompositeScore") for h in history]),
+        },
     )
 
 
 @app.get("/team", response_class=HTMLResponse)
 def team_view(request: Request):
-    csv_path = get_latest_csv()
+    model, league = _selected_model(request.query_params), _selected_league(request.query_params)
+    csv_path = get_latest_csv(model, league)
     if not csv_path:
         return templates.TemplateResponse("no_data.html", {"request": request})
-    df = _prepare_dataframe(csv_path)
+    df = _prepare_dataframe(csv_path, model, league)
     teams = sorted([t for t in df["fantasy_team"].dropna().unique() if str(t).lower() not in ["fa", "free agent"]])
     selected_team, hide_inj, min_score = _filters_from_qp(request.query_params, teams)
     pos = request.query_params.get("pos", "")
@@ -2046,3 +2618,36 @@ def team_view(request: Request):
             "pos": pos,
         },
     )
+
+
+# Off unless TRACE_FILE is set: a span per request (event loop thread), per handler (worker
+# thread) and per template render, alongside the helper spans from @timed.
+if tracing.enabled:
+    import inspect
+    from fastapi.routing import APIRoute
+
+    for _route in app.routes:
+        if isinstance(_route, APIRoute) and not inspect.iscoroutinefunction(_route.dependant.call):
+            _route.dependant.call = tracing.traced(f"{_route.name} {_route.path}", "handler")(_route.dependant.call)
+
+    _template_response = templates.TemplateResponse
+
+    def _traced_template_response(name, context, *args, **kwargs):
+        with tracing.span(f"render {name}", "template"):
+            return _template_response(name, context, *args, **kwargs)
+
+    templates.TemplateResponse = _traced_template_response
+
+    @app.middleware("http")
+    async def _trace_request(request: Request, call_next):
+        with tracing.async_span(f"{request.method} {request.url.path}", query=request.url.query) as args:
+            response = await call_next(request)
+            args["status"] = response.status_code
+        tracing.flush()
+        return response
+
+
+# Off unless PROFILE_TOKEN is set; installed last so it wraps every route above.
+if os.getenv("PROFILE_TOKEN"):
+    from server import profiling  # type: ignore
+    profiling.install(app, _output_dir())
@@ -0,0 +1,235 @@
+"""
+Memory accounting for what the FastAPI server keeps resident, and a budget that evicts it.
+
+Server caches are `LRUCache`s: ordered, locked dicts that remember each entry's deep size
+(measured once, on insert) and when it was last used. Every cache registers itself, so
+`report()` can list entry counts, bytes and the largest objects. Other modules' caches that are
+not ours to evict (the FanGraphs download cache) can be registered as read-only sources.
+
+With MEMORY_BUDGET_MB set, each insert checks process RSS. If RSS is over budget, entries are
+evicted in LRU order until the accounted bytes freed cover the overage. Derived caches
+(priority 0) go before resident snapshots (priority 1). The entry just inserted and the most
+recently used entry of each cache are kept, so a tight budget cannot evict the working set. A daemon thread records RSS every MEMORY_SAMPLE_EVERY seconds for
+`report()["rss_history"]`.
+"""
+import collections
+import datetime
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from server import metrics  # type: ignore
+from server.metrics import rss_bytes  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+_caches: list["LRUCache"] = []
+_sources: dict = {}
+_rss_history: collections.deque = collections.deque(maxlen=1440)
+_budget_lock = threading.Lock()
+
+cache_entries = metrics.gauge("fbh_cache_entries", "Entries held by each server cache.", ("cache",))
+cache_bytes = metrics.gauge("fbh_cache_bytes", "Deep size of each server cache, measured on insert.", ("cache",))
+cache_evictions = metrics.counter("fbh_cache_evictions_total", "Cache entries evicted, by cache and reason.",
+                                  ("cache", "reason"))
+
+
+def deep_bytes(value, _depth: int = 0) -> int:
+    """Approximate deep size: pandas/numpy buffers plus containers, recursing a few levels."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        return size + sum(deep_bytes(k, _depth + 1) + deep_bytes(v, _depth + 1) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(deep_bytes(v, _depth + 1) for v in value)
+    return size
+
+
+def budget_bytes() -> int | None:
+    try:
+        mb = float(os.getenv("MEMORY_BUDGET_MB", "0"))
+    except ValueError:
+        return None
+    return int(mb * 1024 * 1024) if mb > 0 else None
+
+
+class LRUCache:
+    """
+    Dict-like cache that tracks use order and per-entry deep size. `max_entries` bounds it by
+    count; `describe(value)` adds details to the memory report (e.g. a frame's derived columns).
+    """
+
+    def __init__(self, name, priority=0, max_entries=None, describe=None):
+        self.name = name
+        self.priority = priority
+        self.max_entries = max_entries
+        self.describe = describe
+        self._data = collections.OrderedDict()
+        self._meta = {}
+        self._lock = threading.RLock()
+        _caches.append(self)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            self._meta[key]["used"] = time.time()
+            return self._data[key]
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._data[key]
+            self._data.move_to_end(key)
+            self._meta[key]["used"] = time.time()
+            return value
+
+    def __setitem__(self, key, value):
+        meta = {"bytes": deep_bytes(value), "used": time.time(), "stored": time.time()}
+        if self.describe is not None:
+            meta["detail"] = self.describe(value)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._meta[key] = meta
+            while self.max_entries is not None and len(self._data) > self.max_entries:
+                self._evict(next(iter(self._data)), "max_entries")
+        enforce_budget(protect=(self, key))
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+            del self._meta[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._meta.clear()
+
+    def _evict(self, key, reason) -> int:
+        with self._lock:
+            if key not in self._data:
+                return 0
+            freed = self._meta[key]["bytes"]
+            del self[key]
+        cache_evictions.inc(self.name, reason)
+        return freed
+
+    def entries(self):
+        """(key, meta) pairs, least recently used first."""
+        with self._lock:
+            return [(key, dict(self._meta[key])) for key in self._data]
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(m["bytes"] for m in self._meta.values())
+
+
+def register_source(name, measure):
+    """A read-only cache owned elsewhere; `measure()` returns (entries, bytes)."""
+    _sources[name] = measure
+
+
+def enforce_budget(protect=None) -> int:
+    """Evict LRU entries while RSS is over MEMORY_BUDGET_MB. Returns the accounted bytes freed."""
+    budget = budget_bytes()
+    if budget is None:
+        return 0
+    with _budget_lock:
+        rss = rss_bytes()
+        if rss <= budget:
+            return 0
+        candidates = sorted(
+            ((cache.priority, meta["used"], cache, key) for cache in _caches for key, meta in cache.entries()[:-1]
+             if (cache, key) != protect),
+            key=lambda c: (c[0], c[1]),
+        )
+        freed, evicted = 0, 0
+        for _, _, cache, key in candidates:
+            if rss - freed <= budget:
+                break
+            freed += cache._evict(key, "budget")
+            evicted += 1
+        if evicted:
+            gc.collect()
+            logger.warning(f"RSS {rss / 1e6:.0f} MB over the {budget / 1e6:.0f} MB budget: evicted {evicted} "
+                           f"cache entries ({freed / 1e6:.1f} MB); RSS now {rss_bytes() / 1e6:.0f} MB")
+        return freed
+
+
+def _key_label(key) -> str:
+    """Readable cache key; paths are shortened to their last component."""
+    parts = key if isinstance(key, tuple) else (key,)
+    return "/".join(os.path.basename(str(k)) if os.sep in str(k) else str(k) for k in parts if k is not None)
+
+
+def report(top: int = 20) -> dict:
+    """Per-cache counts and bytes, the largest entries, process RSS now and over time."""
+    now = time.time()
+    caches, objects = [], []
+    for cache in _caches:
+        entries = cache.entries()
+        caches.append({"name": cache.name, "entries": len(entries), "bytes": sum(m["bytes"] for _, m in entries),
+                       "evictable": True, "priority": cache.priority})
+        for key, meta in entries:
+            objects.append({"cache": cache.name, "key": _key_label(key), "bytes": meta["bytes"],
+                            "age_seconds": round(now - meta["stored"], 1),
+                            "idle_seconds": round(now - meta["used"], 1), **meta.get("detail", {})})
+    for name, measure in _sources.items():
+        entries, nbytes = measure()
+        caches.append({"name": name, "entries": entries, "bytes": nbytes, "evictable": False, "priority": None})
+    return {
+        "rss_bytes": rss_bytes(),
+        "budget_bytes": budget_bytes(),
+        "cached_bytes": sum(c["bytes"] for c in caches),
+        "caches": caches,
+        "objects": sorted(objects, key=lambda o: -o["bytes"])[:top],
+        "rss_history": [{"at": at, "rss_bytes": rss} for at, rss in _rss_history],
+    }
+
+
+@metrics.on_scrape
+def _cache_metrics():
+    cache_entries.replace({(c.name,): len(c) for c in _caches})
+    cache_bytes.replace({(c.name,): c.nbytes() for c in _caches})
+
+
+def _record_rss():
+    _rss_history.append((datetime.datetime.now().isoformat(timespec="seconds"), rss_bytes()))
+
+
+def start_sampler(interval: float) -> threading.Event:
+    """Record RSS every `interval` seconds on a daemon thread (and check the budget); set the event to stop."""
+    stop = threading.Event()
+
+    def run():
+        while True:
+            _record_rss()
+            enforce_budget()
+            if stop.wait(interval):
+                break
+    threading.Thread(target=run, name="memory-sampler", daemon=True).start()
+    return stop
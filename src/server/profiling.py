@@ -0,0 +1,219 @@
+"""
+Opt-in per-request profiling for the FastAPI server.
+
+Nothing here is installed unless PROFILE_TOKEN is set. With it set, a request that carries the
+token, either as header `X-Profile: <token>` or as query param `profile=<token>`, runs its
+handler under a profiler:
+
+    sample   (default) a thread samples the handler's stack every PROFILE_INTERVAL seconds
+    cprofile the handler also runs under cProfile (exact call counts; slower)
+
+Mode is chosen with `X-Profile-Mode` or `profile_mode`. Each profiled request writes to
+PROFILE_DIR (default output/profiles/):
+
+    <id>.collapsed  sampled stacks, one "frame;frame;frame count" line per stack, which
+                    flamegraph.pl, speedscope and inferno read directly
+    <id>.txt        call tree, plus the top pandas/numpy and repo helper hotspots
+    <id>.prof       pstats dump (cprofile mode only; snakeviz, gprof2dot)
+
+The id is returned in the `X-Profile-Id` response header.
+"""
+import cProfile
+import contextvars
+import datetime
+import functools
+import hmac
+import inspect
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = str(Path(__file__).resolve().parent.parent)
+_LIBRARIES = ("pandas", "numpy")
+# Decorator frames that add nothing to a stack.
+_TRANSPARENT = {"server/metrics:wrapper", "tracing:wrapper", "cProfile:runcall"}
+_active: contextvars.ContextVar = contextvars.ContextVar("request_profile", default=None)
+
+
+@functools.lru_cache(maxsize=4096)
+def _frame_label(code) -> tuple[str, bool]:
+    """(module:function, whether it is repo code), with the module relative to src/ or site-packages."""
+    path = code.co_filename
+    in_repo = path.startswith(SRC_DIR)
+    if in_repo:
+        module = os.path.relpath(path, SRC_DIR)
+    else:
+        parts = Path(path).parts
+        anchor = next((i for i in range(len(parts) - 2, -1, -1) if parts[i] in ("site-packages", "dist-packages")), None)
+        if anchor is None:
+            anchor = next((i for i in range(len(parts) - 2, -1, -1) if re.fullmatch(r"python3\.\d+", parts[i])), None)
+        module = os.path.join(*parts[anchor + 1:]) if anchor is not None else Path(path).name
+    return f"{module.replace(os.sep, '/').removesuffix('.py')}:{code.co_name}", in_repo
+
+
+class RequestProfile:
+    """Profiles one handler call on the thread that runs it."""
+
+    def __init__(self, label: str, mode: str = "sample", interval: float = 0.005):
+        self.label = label
+        self.mode = mode
+        self.interval = interval
+        self.stacks = Counter()
+        self.repo_frames = set()
+        self.stats = None
+        self.seconds = 0.0
+
+    def _sample(self, thread_id: int, root, stop: threading.Event):
+        while not stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None and frame.f_code is not root:
+                label, in_repo = _frame_label(frame.f_code)
+                frame = frame.f_back
+                if label in _TRANSPARENT:
+                    continue
+                if in_repo:
+                    self.repo_frames.add(label)
+                stack.append(label)
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def run(self, func, *args, **kwargs):
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(threading.get_ident(), self._call.__code__, stop),
+                                   name="request-profiler", daemon=True)
+        profiler = cProfile.Profile() if self.mode == "cprofile" else None
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            return self._call(func, profiler, args, kwargs)
+        finally:
+            stop.set()
+            sampler.join()
+            self.seconds = time.perf_counter() - start
+            if profiler is not None:
+                self.stats = pstats.Stats(profiler)
+
+    @staticmethod
+    def _call(func, profiler, args, kwargs):
+        if profiler is None:
+            return func(*args, **kwargs)
+        return profiler.runcall(func, *args, **kwargs)
+
+    def hotspots(self, limit: int = 10) -> dict:
+        """Top library frames by self samples and top repo functions by inclusive samples."""
+        library, repo = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            leaf_lib = next((f for f in reversed(frames) if f.split("/", 1)[0] in _LIBRARIES), None)
+            if leaf_lib:
+                library[leaf_lib] += count
+            for frame in set(frames) & self.repo_frames:
+                repo[frame] += count
+        return {"library": library.most_common(limit), "repo": repo.most_common(limit)}
+
+    def call_tree(self, min_share: float = 0.01) -> list[str]:
+        """Indented inclusive-sample tree, pruned below `min_share` of all samples."""
+        total = sum(self.stacks.values())
+        tree: dict = {}
+        for stack, count in self.stacks.items():
+            node = tree
+            for frame in stack.split(";"):
+                entry = node.setdefault(frame, [0, {}])
+                entry[0] += count
+                node = entry[1]
+        lines = []
+
+        def walk(node, depth):
+            for frame, (count, children) in sorted(node.items(), key=lambda kv: -kv[1][0]):
+                if count < total * min_share:
+                    continue
+                lines.append(f"{'  ' * depth}{100 * count / total:5.1f}%  {frame}")
+                walk(children, depth + 1)
+        walk(tree, 0)
+        return lines
+
+    def report(self) -> str:
+        samples = sum(self.stacks.values())
+        spots = self.hotspots()
+        out = [f"{self.label}  {self.seconds * 1000:.1f} ms  {samples} samples every {self.interval * 1000:g} ms"
+               f"  mode={self.mode}", "", "Top pandas/numpy frames (self samples):"]
+        out += [f"  {count:6d}  {frame}" for frame, count in spots["library"]]
+        out += ["", "Top repo functions (inclusive samples):"]
+        out += [f"  {count:6d}  {frame}" for frame, count in spots["repo"]]
+        out += ["", "Call tree:"] + self.call_tree()
+        if self.stats is not None:
+            buf = io.StringIO()
+            self.stats.stream = buf
+            self.stats.sort_stats("tottime").print_stats(25)
+            out += ["", "cProfile, top 25 by own time:", buf.getvalue()]
+        return "\n".join(out) + "\n"
+
+    def save(self, directory: Path) -> str:
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", self.label).strip("-")[:60]
+        profile_id = f"{datetime.datetime.now():%Y%m%d_%H%M%S_%f}_{slug}"
+        with open(directory / f"{profile_id}.collapsed", "w", encoding="utf-8") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in self.stacks.items())
+        (directory / f"{profile_id}.txt").write_text(self.report(), encoding="utf-8")
+        if self.stats is not None:
+            self.stats.dump_stats(str(directory / f"{profile_id}.prof"))
+        return profile_id
+
+
+def _profiled(call):
+    """Endpoint wrapper: run under the request's profile when the middleware set one."""
+    @functools.wraps(call)
+    def wrapper(*args, **kwargs):
+        profile = _active.get()
+        if profile is None:
+            return call(*args, **kwargs)
+        return profile.run(call, *args, **kwargs)
+    return wrapper
+
+
+def install(app, output_dir: Path) -> None:
+    """
+    Wrap every sync route endpoint (they run on worker threads, which is where the profiler
+    attaches) and add the token-checking middleware. Call after all routes exist.
+    """
+    from fastapi.routing import APIRoute
+
+    token = os.getenv("PROFILE_TOKEN", "")
+    interval = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+    directory = Path(os.getenv("PROFILE_DIR") or output_dir / "profiles")
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not inspect.iscoroutinefunction(route.dependant.call):
+            route.dependant.call = _profiled(route.dependant.call)
+
+    @app.middleware("http")
+    async def _profile_request(request, call_next):
+        supplied = request.headers.get("x-profile") or request.query_params.get("profile") or ""
+        # Bytes, since compare_digest rejects non-ASCII str and the value comes from the client.
+        if not supplied or not hmac.compare_digest(supplied.encode(), token.encode()):
+            return await call_next(request)
+        mode = request.headers.get("x-profile-mode") or request.query_params.get("profile_mode") or "sample"
+        label = f"{request.method} {request.url.path}" + (f"?{request.url.query}" if request.url.query else "")
+        profile = RequestProfile(re.sub(r"profile=[^&]*&?", "", label).rstrip("?&"), mode, interval)
+        reset = _active.set(profile)
+        try:
+            response = await call_next(request)
+        finally:
+            _active.reset(reset)
+        profile_id = profile.save(directory)
+        spots = profile.hotspots(limit=3)
+        logger.info(f"Profiled {profile.label} in {profile.seconds * 1000:.0f} ms -> {directory / profile_id}.txt; "
+                    f"top: {', '.join(f for f, _ in spots['repo'][:3])}")
+        response.headers["X-Profile-Id"] = profile_id
+        return response
+
+    logger.info(f"Request profiling enabled (mode via X-Profile-Mode); reports in {directory}")
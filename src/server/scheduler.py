@@ -0,0 +1,154 @@
+"""
+Background refresh scheduler for the FastAPI server.
+
+A single daemon thread runs named jobs on fixed cadences. Each due time gets
+random jitter (a fraction of the interval) so several servers or leagues do not
+hit ESPN and FanGraphs at the same moment. A job that fails is retried with
+exponential backoff (`retry`, doubled per consecutive failure, capped at
+`max_backoff`) and returns to its normal cadence after its next success.
+At most `max_concurrent` jobs run at once; a job that comes due while the
+limit is reached waits for the next free slot instead of queueing a duplicate.
+
+Jobs are plain callables that return True on success; the server wraps
+`_refresh_snapshot` so a scheduled refresh swaps the live snapshot exactly like
+POST /update.
+"""
+import datetime
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def in_season(season, today=None):
+    """Whether stats change daily: from late March through the first days of October."""
+    today = today or datetime.date.today()
+    try:
+        return datetime.date(int(season), 3, 20) <= today <= datetime.date(int(season), 10, 5)
+    except (TypeError, ValueError):
+        return False
+
+
+class Job:
+    def __init__(self, name, run, interval, active=None, retry=60.0):
+        self.name = name
+        self.run = run
+        self.interval = interval
+        self.active = active or (lambda: True)
+        self.retry = retry
+        self.failures = 0
+        self.running = False
+        self.next_run = None
+        self.last_run = None
+        self.last_status = None
+        self.last_seconds = None
+
+
+class Scheduler:
+    def __init__(self, jobs, jitter=0.1, max_backoff=6 * 3600.0, max_concurrent=1):
+        self.jobs = {job.name: job for job in jobs}
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        now = time.monotonic()
+        for job in self.jobs.values():
+            job.next_run = now + self._jittered(job.interval)
+
+    def _jittered(self, seconds):
+        return max(0.0, seconds * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def _delay_after(self, job, ok):
+        if ok:
+            return self._jittered(job.interval)
+        return self._jittered(min(self.max_backoff, job.retry * 2 ** (job.failures - 1)))
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="refresh-scheduler", daemon=True)
+            self._thread.start()
+            logger.info(f"Refresh scheduler started: {', '.join(f'{j.name} every {j.interval:.0f}s' for j in self.jobs.values())}")
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def trigger(self, name):
+        """Make a job due now (it still respects the concurrency limit)."""
+        with self._lock:
+            self.jobs[name].next_run = time.monotonic()
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            now = time.monotonic()
+            with self._lock:
+                due = [j for j in self.jobs.values() if not j.running and j.next_run <= now]
+            for job in sorted(due, key=lambda j: j.next_run):
+                if not job.active():
+                    with self._lock:
+                        job.next_run = now + self._jittered(job.interval)
+                    continue
+                if not self._slots.acquire(blocking=False):
+                    break
+                with self._lock:
+                    job.running = True
+                threading.Thread(target=self._run, args=(job,), name=f"job-{job.name}", daemon=True).start()
+            # Due jobs still waiting for a slot are woken by _run when one frees, so only jobs
+            # that are not yet due set the timeout.
+            with self._lock:
+                pending = [j.next_run for j in self.jobs.values() if not j.running and j.next_run > now]
+            wait = min((t - time.monotonic() for t in pending), default=60.0)
+            self._wake.wait(max(0.5, min(wait, 60.0)))
+
+    def _run(self, job):
+        started = time.monotonic()
+        try:
+            ok = bool(job.run())
+        except Exception as e:
+            logger.exception(f"Scheduled {job.name} refresh raised: {e}")
+            ok = False
+        finally:
+            self._slots.release()
+        with self._lock:
+            job.failures = 0 if ok else job.failures + 1
+            job.last_run = datetime.datetime.now()
+            job.last_status = "ok" if ok else "error"
+            job.last_seconds = round(time.monotonic() - started, 1)
+            job.next_run = time.monotonic() + self._delay_after(job, ok)
+            job.running = False
+        if not ok:
+            logger.warning(f"Scheduled {job.name} refresh failed ({job.failures} in a row); "
+                           f"retrying in {job.next_run - time.monotonic():.0f}s")
+        self._wake.set()
+
+    def status(self):
+        now_mono, now = time.monotonic(), datetime.datetime.now()
+        with self._lock:
+            return [
+                {
+                    "name": job.name,
+                    "interval_seconds": job.interval,
+                    "active": job.active(),
+                    "running": job.running,
+                    "failures": job.failures,
+                    "last_run": job.last_run.isoformat(timespec="seconds") if job.last_run else None,
+                    "last_status": job.last_status,
+                    "last_seconds": job.last_seconds,
+                    "next_run": (now + datetime.timedelta(seconds=max(0.0, job.next_run - now_mono))).isoformat(timespec="seconds"),
+                }
+                for job in self.jobs.values()
+            ]
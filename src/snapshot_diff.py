@@ -0,0 +1,158 @@
+"""
+What changed between two ranked snapshots.
+
+`diff_snapshots(prev, curr)` joins two free_agents_ranked frames on the
+history player key (ESPN `player_id`, else name) in one vectorized outer merge
+and keeps only the players that moved:
+
+    added    - in the new snapshot only
+    removed  - in the old snapshot only
+    rank     - current-score rank moved by at least `min_rank_move` places,
+               for players inside the top `RANK_DEPTH` before or after
+    injury   - injury_status changed
+    roster   - fantasy_team changed (`dropped` when they became a free agent)
+
+Each refresh saves the change set against the previous snapshot next to the
+new CSV as changes_<run_id>_since_<prev_run_id>.csv; `load_changes` serves
+those and diffs older pairs on demand.
+"""
+import glob
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from history import player_keys
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATTERN = "free_agents_ranked_*.csv"
+CHANGES_PREFIX = "changes_"
+RANK_COLUMN = "curr_CompositeScore"
+DIFF_COLUMNS = ("Name", "player_id", "Team", "position", "fantasy_team", "injury_status",
+                "proj_CompositeScore", "curr_CompositeScore")
+MIN_RANK_MOVE = 5
+# Rank churn deeper than this in the pool is noise for a fantasy roster.
+RANK_DEPTH = 300
+
+FREE_AGENT = "Free Agent"
+_RUN_ID = re.compile(r"(\d{8}_\d{6})")
+
+
+def snapshot_id(path: str) -> str:
+    """Run id (YYYYMMDD_HHMMSS) of a snapshot or change-set file, or the bare name if it has none."""
+    name = os.path.basename(str(path))
+    m = _RUN_ID.search(name)
+    return m.group(1) if m else name
+
+
+def list_snapshots(directory: str) -> list[str]:
+    """Ranked snapshot CSVs in `directory`, oldest first."""
+    return sorted(glob.glob(os.path.join(directory, SNAPSHOT_PATTERN)))
+
+
+def read_snapshot(path: str) -> pd.DataFrame:
+    """Just the columns a diff needs."""
+    return pd.read_csv(path, usecols=lambda c: c in DIFF_COLUMNS, low_memory=False)
+
+
+def _keyed(snapshot: pd.DataFrame) -> pd.DataFrame:
+    cols = [c for c in DIFF_COLUMNS if c in snapshot.columns and c != "player_id"]
+    frame = snapshot[cols].assign(key=player_keys(snapshot).to_numpy())
+    if "fantasy_team" in frame:
+        frame["fantasy_team"] = frame["fantasy_team"].fillna(FREE_AGENT).astype(str)
+    if "injury_status" in frame:
+        frame["injury_status"] = frame["injury_status"].fillna("").astype(str)
+    if RANK_COLUMN in frame:
+        frame["rank"] = pd.to_numeric(frame[RANK_COLUMN], errors="coerce").rank(method="min", ascending=False)
+    return frame.drop_duplicates("key", keep="first")
+
+
+def diff_snapshots(prev: pd.DataFrame, curr: pd.DataFrame, min_rank_move: int = MIN_RANK_MOVE) -> pd.DataFrame:
+    """
+    Players that changed from `prev` to `curr`, one row each. `change` lists the kinds
+    (comma separated); old values carry a `prev_` prefix. Sorted by rank movement.
+    """
+    merged = _keyed(prev).merge(_keyed(curr), on="key", how="outer", suffixes=("_prev", ""), indicator=True)
+    added, removed = merged["_merge"].eq("right_only"), merged["_merge"].eq("left_only")
+    both = merged["_merge"].eq("both")
+
+    def column(name):
+        return merged[name] if name in merged else pd.Series(np.nan, index=merged.index)
+
+    def moved(col):
+        return both & column(f"{col}_prev").ne(column(col)) & column(col).notna()
+
+    rank_change = column("rank_prev") - column("rank")
+    kinds = {
+        "added": added,
+        "removed": removed,
+        "rank": both & (rank_change.abs() >= min_rank_move)
+                & (column("rank_prev").le(RANK_DEPTH) | column("rank").le(RANK_DEPTH)),
+        "injury": moved("injury_status"),
+        "roster": moved("fantasy_team"),
+        "dropped": moved("fantasy_team") & column("fantasy_team").eq(FREE_AGENT),
+    }
+    changed = np.logical_or.reduce(list(kinds.values()))
+    change = pd.Series("", index=merged.index)
+    for kind, mask in kinds.items():
+        change = change.mask(mask, change + "," + kind)
+
+    out = merged.assign(change=change.str.lstrip(","), rank_change=rank_change)[changed]
+    for col in ("Name", "Team", "position"):
+        if f"{col}_prev" in out and col in out:
+            out[col] = out[col].fillna(out[f"{col}_prev"])
+    for col in ("proj_CompositeScore", "curr_CompositeScore"):
+        if f"{col}_prev" in out and col in out:
+            out[f"{col}_change"] = out[col] - out[f"{col}_prev"]
+    keep = ["key", "Name", "Team", "position", "change", "rank_prev", "rank", "rank_change",
+            "fantasy_team_prev", "fantasy_team", "injury_status_prev", "injury_status",
+            "proj_CompositeScore", "proj_CompositeScore_change", "curr_CompositeScore", "curr_CompositeScore_change"]
+    out = out[[c for c in keep if c in out.columns]]
+    out = out.rename(columns={c: f"prev_{c[:-5]}" for c in out.columns if c.endswith("_prev")})
+    return out.sort_values("rank_change", ascending=False, key=lambda s: s.abs(), na_position="last",
+                           ignore_index=True)
+
+
+def changes_path(directory: str, run_id: str, since: str) -> str:
+    return os.path.join(directory, f"{CHANGES_PREFIX}{run_id}_since_{since}.csv")
+
+
+def save_changes(snapshot: pd.DataFrame, csv_path: str) -> str | None:
+    """
+    Diff a just-written snapshot against the previous one in its directory and save the change
+    set beside it. Returns the change-set path, or None for the first snapshot.
+    """
+    directory, run_id = os.path.dirname(csv_path), snapshot_id(csv_path)
+    older = [p for p in list_snapshots(directory) if snapshot_id(p) < run_id]
+    if not older:
+        return None
+    changes = diff_snapshots(read_snapshot(older[-1]), snapshot)
+    path = changes_path(directory, run_id, snapshot_id(older[-1]))
+    changes.to_csv(path, index=False)
+    logger.info(f"{len(changes)} players changed since {snapshot_id(older[-1])}: {path}")
+    return path
+
+
+def load_changes(directory: str, since: str | None = None) -> tuple[str | None, str | None, pd.DataFrame]:
+    """
+    Changes from snapshot `since` (run id or file name; default the previous snapshot) to the
+    newest one in `directory`. Returns (since_id, snapshot_id, changes); the ids are None when
+    there is nothing to compare.
+    """
+    snapshots = list_snapshots(directory)
+    if not snapshots:
+        return None, None, pd.DataFrame()
+    latest = snapshot_id(snapshots[-1])
+    since = snapshot_id(since) if since else (snapshot_id(snapshots[-2]) if len(snapshots) > 1 else None)
+    if since is None or since == latest:
+        return since, latest, pd.DataFrame()
+    saved = changes_path(directory, latest, since)
+    if os.path.exists(saved):
+        return since, latest, pd.read_csv(saved, low_memory=False)
+    base = next((p for p in snapshots if snapshot_id(p) == since), None)
+    if base is None:
+        raise FileNotFoundError(f"No snapshot {since}")
+    return since, latest, diff_snapshots(read_snapshot(base), read_snapshot(snapshots[-1]))
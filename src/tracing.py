@@ -0,0 +1,147 @@
+"""
+Minimal tracing spans, exported as Chrome trace events.
+
+Set TRACE_FILE to a path to turn tracing on for the process. Each finished span is appended
+as one JSON line, a complete ("ph": "X") event with microsecond timestamps. The file starts
+with "[" and every line ends with ",", the unterminated JSON-array form that chrome://tracing,
+Perfetto (ui.perfetto.dev) and speedscope load as is. Spans on the same thread nest by time,
+so request -> handler -> helper -> template render shows up as a flame chart per thread.
+
+    with span("to_dict", rows=len(df)):
+        ...
+
+    @traced()
+    def helper(...):
+        ...
+
+With TRACE_FILE unset, `traced` returns the function unchanged and `span` returns a shared
+no-op context manager, so instrumented code pays one global check.
+"""
+import atexit
+import contextlib
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+_file = None
+_lock = threading.Lock()
+_named_threads: set = set()
+_pid = os.getpid()
+_async_ids = itertools.count(1)
+enabled = False
+
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000
+
+
+def configure(path: str | None) -> None:
+    """Start writing spans to `path` (appending), or stop tracing with None."""
+    global _file, enabled
+    with _lock:
+        if _file is not None:
+            _file.close()
+            _file = None
+        enabled = bool(path)
+        if enabled:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            new = not os.path.exists(path) or os.path.getsize(path) == 0
+            _file = open(path, "a", encoding="utf-8")
+            if new:
+                _file.write("[\n")
+            _named_threads.clear()
+
+
+def _write(event: dict) -> None:
+    tid = threading.get_ident()
+    event.update(pid=_pid, tid=tid)
+    line = json.dumps(event, default=str) + ",\n"
+    with _lock:
+        if _file is None:
+            return
+        if tid not in _named_threads:
+            _named_threads.add(tid)
+            _file.write(json.dumps({"name": "thread_name", "ph": "M", "pid": _pid, "tid": tid,
+                                    "args": {"name": threading.current_thread().name}}) + ",\n")
+        _file.write(line)
+
+
+def record(name: str, start_us: float, end_us: float, cat: str = "function", args: dict | None = None) -> None:
+    """Write a finished span given its start and end (from the same clock as `span`)."""
+    event = {"name": name, "cat": cat, "ph": "X", "ts": round(start_us, 1), "dur": round(end_us - start_us, 1)}
+    if args:
+        event["args"] = args
+    _write(event)
+
+
+def flush() -> None:
+    with _lock:
+        if _file is not None:
+            _file.flush()
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start", "async_id")
+
+    def __init__(self, name, cat, args, async_id=None):
+        self.name, self.cat, self.args, self.async_id = name, cat, args, async_id
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self.args
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        if self.async_id is None:
+            record(self.name, self.start, _now_us(), self.cat, self.args)
+        else:
+            common = {"name": self.name, "cat": self.cat, "id": self.async_id}
+            _write({**common, "ph": "b", "ts": round(self.start, 1), "args": self.args})
+            _write({**common, "ph": "e", "ts": round(_now_us(), 1)})
+        return False
+
+
+_NULL_SPAN = contextlib.nullcontext({})
+
+
+def span(name: str, cat: str = "function", **args):
+    """Context manager timing a block; yields the span's args dict so callers can add fields."""
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+def async_span(name: str, cat: str = "request", **args):
+    """
+    Like `span`, but for work that interleaves with other spans on one thread (coroutines on
+    the event loop): written as an async begin/end pair that viewers draw on its own track.
+    """
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args, next(_async_ids))
+
+
+def traced(name: str | None = None, cat: str = "function"):
+    """Decorator form of `span`, named after the function; no wrapper at all when tracing is off."""
+    def decorate(func):
+        if not enabled:
+            return func
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = _now_us()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, start, _now_us(), cat)
+        return wrapper
+    return decorate
+
+
+atexit.register(flush)
+configure(os.getenv("TRACE_FILE"))
@@ -0,0 +1,160 @@
+"""
+Database backends for the stats warehouse that db_loader fills: the DimPlayer/DimTeam/DimSeason
+and Fact* star schema.
+
+    sqlite     an embedded SQLite file, created on first use from sql/CREATE_Baseball_sqlite.sql
+    sqlserver  SQL Server through pyodbc and ODBC Driver 17 (schema: sql/CREATE_Baseball.sql)
+
+Both take qmark (`?`) parameters, so the loader's SQL is shared; a backend only supplies the
+pieces that differ (connection setup, fast executemany, reading back an inserted identity, and
+its driver's exception classes). `query()` returns a DataFrame for analytical reads.
+"""
+import abc
+import sqlite3
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SQLITE_SCHEMA = ROOT_DIR / "sql" / "CREATE_Baseball_sqlite.sql"
+DEFAULT_SQLITE_PATH = ROOT_DIR / "output" / "baseball.db"
+# SQL Server connection string.
+SQLSERVER_CONNECTION_STRING = (
+    "DRIVER={ODBC Driver 17 for SQL Server};"
+    "SERVER=localhost;"
+    "DATABASE=Baseball;"
+    "UID=FangraphsApp;"
+    "PWD=FangraphsApp;"
+    "Trusted_Connection=yes;"
+)
+
+
+# Fact tables that db_loader upserts: one row per (PlayerID, TeamID, SeasonID), with a RowHash.
+UPSERT_TABLES = ("FactSeasonStatsBatting", "FactSeasonStatsPitching")
+
+
+def _migrate_sqlite(conn):
+    """
+    Bring a warehouse file from before RowHash up to date: add the column and keep only the newest
+    row of each (PlayerID, TeamID, SeasonID), so the schema's unique key can be created.
+    """
+    for table in UPSERT_TABLES:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not columns or "RowHash" in columns:
+            continue
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN RowHash TEXT")
+        removed = conn.execute(
+            f"DELETE FROM {table} WHERE rowid NOT IN (SELECT MAX(rowid) FROM {table} GROUP BY PlayerID, TeamID, SeasonID)"
+        ).rowcount
+        conn.commit()
+        if removed:
+            print(f"Removed {removed} duplicate rows from {table} while adding its (PlayerID, TeamID, SeasonID) key.")
+
+
+class _Backend(abc.ABC):
+    name = ""
+    Error = Exception
+    IntegrityError = Exception
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def executemany(self, query, rows):
+        self.cursor.executemany(query, rows)
+
+    @abc.abstractmethod
+    def insert_returning_id(self, table, columns, id_column, params):
+        """Insert one row and return its identity column value."""
+
+    def query(self, sql, *params):
+        """Run a SELECT and return the result as a DataFrame."""
+        import pandas as pd
+
+        if params:
+            self.cursor.execute(sql, params)
+        else:
+            self.cursor.execute(sql)
+        columns = [d[0] for d in self.cursor.description]
+        return pd.DataFrame.from_records([tuple(row) for row in self.cursor.fetchall()], columns=columns)
+
+    def close(self):
+        self.cursor.close()
+        self.conn.close()
+
+
+class SqliteBackend(_Backend):
+    """Embedded SQLite warehouse; creates the file and schema if they do not exist."""
+    name = "sqlite"
+    Error = sqlite3.Error
+    IntegrityError = sqlite3.IntegrityError
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path))
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        _migrate_sqlite(conn)
+        conn.executescript(SQLITE_SCHEMA.read_text(encoding="utf-8"))
+        super().__init__(conn)
+        self.path = path
+
+    def insert_returning_id(self, table, columns, id_column, params):
+        self.cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            params
+        )
+        return self.cursor.lastrowid
+
+    def close(self):
+        # Refresh the query planner's statistics for tables that changed a lot.
+        self.conn.execute("PRAGMA optimize")
+        super().close()
+
+
+class SqlServerBackend(_Backend):
+    """SQL Server over pyodbc; the database is created with sql/CREATE_Baseball.sql."""
+    name = "sqlserver"
+
+    def __init__(self, connection_string=SQLSERVER_CONNECTION_STRING):
+        import pyodbc
+
+        self.Error = pyodbc.Error
+        self.IntegrityError = pyodbc.IntegrityError
+        super().__init__(pyodbc.connect(connection_string))
+        self.cursor.execute("SET NOCOUNT ON;")
+
+    def executemany(self, query, rows):
+        self.cursor.fast_executemany = True
+        try:
+            self.cursor.executemany(query, rows)
+        finally:
+            self.cursor.fast_executemany = False
+
+    def insert_returning_id(self, table, columns, id_column, params):
+        self.cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) OUTPUT INSERTED.{id_column} "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            *params
+        )
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+
+BACKENDS = {"sqlite": SqliteBackend, "sqlserver": SqlServerBackend}
+
+
+def connect(backend="sqlite", target=None):
+    """
+    Open a warehouse. `target` is the SQLite file path or the SQL Server connection string;
+    None uses the backend's default (output/baseball.db, or the local Baseball database).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown warehouse backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[backend](target) if target else BACKENDS[backend]()